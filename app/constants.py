@@ -11,3 +11,12 @@ QUIZ_DESCRIPTION_MAXLENGTH = 500
 
 ANSWER_TEXT_MAXLENGTH = 1000
 QUESTION_TEXT_MAXLENGTH = 1000
+
+SEARCH_QUERY_MAXLENGTH = 100
+
+BULK_INVITATIONS_MAXITEMS = 1000
+BULK_RESPONSES_MAXITEMS = 10000
+
+QUIZ_ATTEMPT_ANSWERS_MAXITEMS = 1000
+IDEMPOTENCY_KEY_MAXLENGTH = 100
+QUIZ_PASS_SCORE = 0.5
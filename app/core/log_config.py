@@ -1,16 +1,111 @@
+import atexit
+import copy
+import json
 import logging
+import queue
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Optional
+
+from utils.service_config import settings
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamps records with the id of the request being served.
+
+    Runs on the QueueHandler, i.e. in the thread and context that emitted the record;
+    the listener thread has no access to the request context.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+        if record.stack_info:
+            entry["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+
+class StructuredQueueHandler(QueueHandler):
+    """Enqueues records with the traceback kept apart from the message.
+
+    QueueHandler.prepare merges the formatted traceback into `msg` and drops exc_info.
+    Here the message is merged with its args and the traceback is rendered into
+    exc_text while the frames are still alive, so the JSON writer gets it as a field.
+    """
+    traceback_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = self.traceback_formatter.formatException(record.exc_info)
+        record.exc_info = None
+        return record
 
 
 class LoggingConfig:
-    LOG_FILE_PATH = "myapp.log"
-    LOG_LEVEL = "INFO"
-    LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+    """Logging for the whole process, configured once from Settings.
+
+    Records go through a QueueHandler, so emitting code (the event loop) only enqueues;
+    a QueueListener thread formats them as JSON lines and writes to a size-rotated file.
+    """
+    listener: Optional[QueueListener] = None
+    queue_handler: Optional[QueueHandler] = None
 
     @staticmethod
-    def configure_logging():
+    def parse_levels(levels: str) -> Dict[str, str]:
+        pairs = (item.split("=", 1) for item in levels.split(",") if "=" in item)
+        return {name.strip(): level.strip().upper() for name, level in pairs}
+
+    @classmethod
+    def configure_logging(cls):
+        if cls.listener is not None:
+            return
+
+        file_handler = RotatingFileHandler(settings.LOG_FILE_PATH, maxBytes=settings.LOG_MAX_BYTES,
+                                           backupCount=settings.LOG_BACKUP_COUNT, encoding="utf-8")
+        file_handler.setFormatter(JsonFormatter())
+
+        cls.queue_handler = StructuredQueueHandler(queue.SimpleQueue())
+        cls.queue_handler.addFilter(RequestIdFilter())
+
+        root = logging.getLogger()
+        root.setLevel(settings.LOG_LEVEL)
+        root.addHandler(cls.queue_handler)
+        for name, level in cls.parse_levels(settings.LOG_LEVELS).items():
+            logging.getLogger(name).setLevel(level)
+
+        cls.listener = QueueListener(cls.queue_handler.queue, file_handler, respect_handler_level=True)
+        cls.listener.start()
+        atexit.register(cls.shutdown)
 
-        logging.basicConfig(
-            filename=LoggingConfig.LOG_FILE_PATH,
-            level=LoggingConfig.LOG_LEVEL,
-            format=LoggingConfig.LOG_FORMAT,
-        )
+    @classmethod
+    def shutdown(cls):
+        """Flush queued records and stop the writer thread."""
+        if cls.listener is None:
+            return
+        logging.getLogger().removeHandler(cls.queue_handler)
+        cls.listener.stop()
+        for handler in cls.listener.handlers:
+            handler.close()
+        cls.listener = cls.queue_handler = None
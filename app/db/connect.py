@@ -3,23 +3,52 @@ import redis.asyncio as redis
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine
 
-from core.log_config import LoggingConfig
+from db.fake_redis import FakeRedis
+from db.pool import InstrumentedQueuePool
+from libs.metrics import instrument_engine
 from utils.service_config import settings
 
 SQLALCHEMY_POSTGRES_URL = settings.POSTGRES_URL
 
-engine = create_async_engine(SQLALCHEMY_POSTGRES_URL, echo=True, future=True)
+
+def build_engine(**overrides) -> AsyncEngine:
+    options = dict(
+        echo=settings.DEBUG,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    options.update(overrides)
+    return create_async_engine(SQLALCHEMY_POSTGRES_URL, **options)
+
+
+engine = build_engine()
+instrument_engine(engine)
+
+async_session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 Base = declarative_base()
 
-LoggingConfig.configure_logging()
+
+def create_redis_client():
+    if settings.REDIS_FAKE:
+        return FakeRedis()
+    return redis.Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT, password=None)
+
+
+redis_client = create_redis_client()
 
 
 async def init_postgres_db():
     try:
-        await engine.connect()
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
         logging.info("Ping successful to Postgres: True")
 
     except Exception as e:
@@ -28,16 +57,19 @@ async def init_postgres_db():
 
 async def init_redis_db():
     try:
-        connection = redis.Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT, password=None)
-        logging.info(f"Ping successful to Redis: {await connection.ping()}")
-        await connection.close()
+        logging.info(f"Ping successful to Redis: {await redis_client.ping()}")
     except Exception as e:
         logging.error(f"Exception during conn to Redis: {e}")
 
 
+async def close_postgres_db():
+    await engine.dispose()
+
+
 async def get_session() -> AsyncSession:
-    async_session = sessionmaker(
-        engine, class_=AsyncSession, expire_on_commit=False
-    )
-    async with async_session() as session:
+    async with async_session_factory() as session:
         yield session
+
+
+async def get_redis():
+    return redis_client
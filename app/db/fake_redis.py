@@ -0,0 +1,292 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from redis.exceptions import ResponseError
+
+
+class FakeRedis:
+    """In-process stand-in for redis.asyncio.Redis, covering the commands the app uses."""
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[Any, Optional[float]]] = {}
+
+    @staticmethod
+    def _encode(value: Union[str, bytes, int, float]) -> bytes:
+        if isinstance(value, bytes):
+            return value
+        return str(value).encode()
+
+    def _alive(self, key: str) -> bool:
+        item = self._data.get(key)
+        if item is None:
+            return False
+        expire_at = item[1]
+        if expire_at is not None and expire_at <= time.monotonic():
+            del self._data[key]
+            return False
+        return True
+
+    async def ping(self) -> bool:
+        return True
+
+    async def close(self) -> None:
+        pass
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._data[key][0] if self._alive(key) else None
+
+    async def mget(self, keys: List[str]) -> List[Optional[bytes]]:
+        return [await self.get(key) for key in keys]
+
+    async def set(self, key: str, value, ex: Optional[int] = None) -> bool:
+        expire_at = time.monotonic() + ex if ex else None
+        self._data[key] = (self._encode(value), expire_at)
+        return True
+
+    async def incr(self, key: str, amount: int = 1) -> int:
+        current = int(await self.get(key) or 0) + amount
+        expire_at = self._data[key][1] if self._alive(key) else None
+        self._data[key] = (self._encode(current), expire_at)
+        return current
+
+    async def delete(self, *keys: str) -> int:
+        return sum(self._data.pop(key, None) is not None for key in keys)
+
+    async def ttl(self, key: str) -> int:
+        if not self._alive(key):
+            return -2
+        expire_at = self._data[key][1]
+        return -1 if expire_at is None else int(expire_at - time.monotonic())
+
+    async def expire(self, key: str, seconds: int) -> bool:
+        if not self._alive(key):
+            return False
+        self._data[key] = (self._data[key][0], time.monotonic() + seconds)
+        return True
+
+    async def hget(self, key: str, field) -> Optional[bytes]:
+        return self._data[key][0].get(self._encode(field)) if self._alive(key) else None
+
+    async def hset(self, key: str, field=None, value=None, mapping: Optional[dict] = None) -> int:
+        if not self._alive(key):
+            self._data[key] = ({}, None)
+        items = dict(mapping or {})
+        if field is not None:
+            items[field] = value
+        hash_value = self._data[key][0]
+        added = sum(self._encode(name) not in hash_value for name in items)
+        hash_value.update({self._encode(name): self._encode(item) for name, item in items.items()})
+        return added
+
+    async def hgetall(self, key: str) -> Dict[bytes, bytes]:
+        return dict(self._data[key][0]) if self._alive(key) else {}
+
+    def _zset(self, name: str, create: bool = False) -> Optional[Dict[bytes, float]]:
+        if not self._alive(name):
+            if not create:
+                return None
+            self._data[name] = ({}, None)
+        return self._data[name][0]
+
+    def _zrevsorted(self, name: str) -> List[Tuple[bytes, float]]:
+        return sorted((self._zset(name) or {}).items(), key=lambda item: (item[1], item[0]), reverse=True)
+
+    async def zadd(self, name: str, mapping: dict, gt: bool = False) -> int:
+        zset = self._zset(name, create=True)
+        added = 0
+        for member, score in mapping.items():
+            member = self._encode(member)
+            if member not in zset:
+                added += 1
+            elif gt and zset[member] >= score:
+                continue
+            zset[member] = float(score)
+        return added
+
+    async def zincrby(self, name: str, amount: float, value) -> float:
+        zset = self._zset(name, create=True)
+        member = self._encode(value)
+        zset[member] = zset.get(member, 0.0) + amount
+        return zset[member]
+
+    async def zscore(self, name: str, value) -> Optional[float]:
+        return (self._zset(name) or {}).get(self._encode(value))
+
+    async def zcard(self, name: str) -> int:
+        return len(self._zset(name) or {})
+
+    async def zrevrank(self, name: str, value) -> Optional[int]:
+        member = self._encode(value)
+        for rank, (candidate, _) in enumerate(self._zrevsorted(name)):
+            if candidate == member:
+                return rank
+        return None
+
+    async def zrevrange(self, name: str, start: int, end: int, withscores: bool = False) -> list:
+        items = self._zrevsorted(name)
+        items = items[start:len(items) if end == -1 else end + 1]
+        return items if withscores else [member for member, _ in items]
+
+    async def rename(self, src: str, dst: str) -> bool:
+        if not self._alive(src):
+            raise ResponseError("ERR no such key")
+        self._data[dst] = self._data.pop(src)
+        return True
+
+    def _stream(self, name: str, create: bool = False) -> Optional["FakeStream"]:
+        if not self._alive(name):
+            if not create:
+                return None
+            self._data[name] = (FakeStream(), None)
+        return self._data[name][0]
+
+    async def xadd(self, name: str, fields: dict, id="*") -> bytes:
+        return self._stream(name, create=True).add(
+            {self._encode(field): self._encode(value) for field, value in fields.items()})
+
+    async def xlen(self, name: str) -> int:
+        stream = self._stream(name)
+        return len(stream.entries) if stream else 0
+
+    async def xrange(self, name: str, min="-", max="+", count: Optional[int] = None) -> List[Tuple[bytes, dict]]:
+        stream = self._stream(name)
+        entries = list(stream.entries.items()) if stream else []
+        return entries[:count] if count else entries
+
+    async def xdel(self, name: str, *ids) -> int:
+        stream = self._stream(name)
+        return sum(stream.entries.pop(self._encode(entry_id), None) is not None for entry_id in ids) if stream else 0
+
+    async def xgroup_create(self, name: str, groupname: str, id="$", mkstream: bool = False) -> bool:
+        stream = self._stream(name, create=mkstream)
+        if stream is None:
+            raise ResponseError("ERR The XGROUP subcommand requires the key to exist")
+        if groupname in stream.groups:
+            raise ResponseError("BUSYGROUP Consumer Group name already exists")
+        last_id = stream.last_id if id == "$" else FakeStream.parse_id(self._encode(id))
+        stream.groups[groupname] = {"last_delivered": last_id, "pending": {}}
+        return True
+
+    async def xreadgroup(self, groupname: str, consumername: str, streams: dict, count: Optional[int] = None,
+                         block: Optional[int] = None, noack: bool = False) -> list:
+        response = []
+        for name, _ in streams.items():
+            stream = self._stream(name)
+            if stream is None or groupname not in stream.groups:
+                raise ResponseError("NOGROUP No such key or consumer group")
+            entries = stream.deliver(stream.groups[groupname], consumername, count)
+            if entries:
+                response.append([self._encode(name), entries])
+        if not response and block:
+            await asyncio.sleep(block / 1000)
+        return response
+
+    async def xack(self, name: str, groupname: str, *ids) -> int:
+        stream = self._stream(name)
+        if stream is None or groupname not in stream.groups:
+            return 0
+        pending = stream.groups[groupname]["pending"]
+        return sum(pending.pop(self._encode(entry_id), None) is not None for entry_id in ids)
+
+    async def xautoclaim(self, name: str, groupname: str, consumername: str, min_idle_time: int,
+                         start_id="0-0", count: Optional[int] = None) -> list:
+        stream = self._stream(name)
+        if stream is None or groupname not in stream.groups:
+            raise ResponseError("NOGROUP No such key or consumer group")
+        return stream.claim(stream.groups[groupname], consumername, min_idle_time, count or 100)
+
+    def pipeline(self, transaction: bool = True) -> "FakePipeline":
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    """Buffers commands until execute(), like redis.asyncio.client.Pipeline.
+
+    Between watch() and multi() commands run immediately, as in redis-py; watched keys
+    are not tracked, so execute() never raises WatchError.
+    """
+
+    def __init__(self, redis: FakeRedis):
+        self.redis = redis
+        self.commands: List[Tuple[str, tuple, dict]] = []
+        self.watching = False
+
+    async def watch(self, *keys: str) -> bool:
+        self.watching = True
+        return True
+
+    def multi(self) -> None:
+        self.watching = False
+
+    def __getattr__(self, name: str):
+        command = getattr(self.redis, name)
+        if self.watching:
+            return command
+
+        def buffer(*args, **kwargs) -> "FakePipeline":
+            self.commands.append((name, args, kwargs))
+            return self
+        return buffer
+
+    async def execute(self) -> List[Any]:
+        commands, self.commands = self.commands, []
+        return [await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in commands]
+
+    async def __aenter__(self) -> "FakePipeline":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.commands = []
+        self.watching = False
+
+
+class FakeStream:
+    """Entries and consumer groups of one stream, with Redis delivery and claiming semantics."""
+
+    def __init__(self):
+        self.entries: Dict[bytes, dict] = {}
+        self.last_id: Tuple[int, int] = (0, 0)
+        self.groups: Dict[str, dict] = {}
+
+    @staticmethod
+    def parse_id(entry_id: bytes) -> Tuple[int, int]:
+        milliseconds, _, sequence = entry_id.partition(b"-")
+        return int(milliseconds), int(sequence or 0)
+
+    def add(self, fields: dict) -> bytes:
+        milliseconds = int(time.time() * 1000)
+        last_milliseconds, last_sequence = self.last_id
+        self.last_id = (last_milliseconds, last_sequence + 1) if milliseconds <= last_milliseconds \
+            else (milliseconds, 0)
+        entry_id = f"{self.last_id[0]}-{self.last_id[1]}".encode()
+        self.entries[entry_id] = fields
+        return entry_id
+
+    def deliver(self, group: dict, consumer: str, count: Optional[int]) -> List[Tuple[bytes, dict]]:
+        delivered = []
+        for entry_id, fields in self.entries.items():
+            if self.parse_id(entry_id) <= group["last_delivered"]:
+                continue
+            if count and len(delivered) >= count:
+                break
+            group["pending"][entry_id] = (consumer, time.monotonic())
+            group["last_delivered"] = self.parse_id(entry_id)
+            delivered.append((entry_id, fields))
+        return delivered
+
+    def claim(self, group: dict, consumer: str, min_idle_time: int, count: int) -> list:
+        claimed, deleted = [], []
+        now = time.monotonic()
+        for entry_id, (_, delivered_at) in sorted(group["pending"].items(), key=lambda item: self.parse_id(item[0])):
+            if len(claimed) >= count:
+                break
+            if (now - delivered_at) * 1000 < min_idle_time:
+                continue
+            if entry_id not in self.entries:
+                del group["pending"][entry_id]
+                deleted.append(entry_id)
+                continue
+            group["pending"][entry_id] = (consumer, now)
+            claimed.append((entry_id, self.entries[entry_id]))
+        return [b"0-0", claimed, deleted]
@@ -1,4 +1,6 @@
-from sqlalchemy import Column, Integer, String, Boolean, func, ARRAY, ForeignKey, Table, Enum
+from sqlalchemy import Column, Integer, String, Boolean, Float, func, ARRAY, ForeignKey, Table, Enum, Index, text, \
+    Computed, UniqueConstraint
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql.sqltypes import DateTime
 from enum import Enum as PyEnum
@@ -11,12 +13,36 @@ from constants import USERNAME_MAXLENGTH, EMAIl_MAXLENGTH, USERSTATUS_MAXLENGTH,
 member_company_association = Table(
     "user_company", Base.metadata,
     Column("user_id", Integer, ForeignKey("users.id")),
-    Column("company_id", Integer, ForeignKey("company.id")))
+    Column("company_id", Integer, ForeignKey("company.id", ondelete="CASCADE")),
+    UniqueConstraint("user_id", "company_id", name="uq_user_company_user_id_company_id"),
+    Index("ix_user_company_company_id_user_id", "company_id", "user_id"))
 
 admin_company_association = Table(
     "admin_company", Base.metadata,
     Column("user_id", Integer, ForeignKey("users.id")),
-    Column("company_id", Integer, ForeignKey("company.id")))
+    Column("company_id", Integer, ForeignKey("company.id", ondelete="CASCADE")),
+    UniqueConstraint("user_id", "company_id", name="uq_admin_company_user_id_company_id"),
+    Index("ix_admin_company_company_id_user_id", "company_id", "user_id"))
+
+
+def search_vector_column(primary: str, secondary: str) -> Column:
+    """Generated tsvector over two text columns, the first one ranked higher.
+
+    The column is excluded from the mappers (see SEARCH_MAPPER_ARGS): it is only used
+    in search queries and must never be loaded, refreshed or written by the ORM.
+    """
+    return Column(TSVECTOR, Computed(
+        f"setweight(to_tsvector('simple', coalesce({primary}, '')), 'A') || "
+        f"setweight(to_tsvector('simple', coalesce({secondary}, '')), 'B')",
+        persisted=True
+    ))
+
+
+def trigram_index(name: str, column: str) -> Index:
+    return Index(name, column, postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"})
+
+
+SEARCH_MAPPER_ARGS = {"exclude_properties": ["search_vector"]}
 
 
 class StatusActionForResponse(str, PyEnum):
@@ -37,10 +63,18 @@ class TypeAction(str, PyEnum):
 
 class Action(Base):
     __tablename__ = 'actions'
+    __table_args__ = (
+        Index("ix_actions_created_id", "created", "id"),
+        # received invitations and sent join requests of a user, in keyset order
+        Index("ix_actions_recipient_id_type_action_created_id", "recipient_id", "type_action", "created", "id"),
+        Index("ix_actions_sender_id_type_action_created_id", "sender_id", "type_action", "created", "id"),
+        # invited users and pending actions of a company
+        Index("ix_actions_company_id_type_action_recipient_id", "company_id", "type_action", "recipient_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     type_action = Column(Enum(TypeAction))
-    company_id = Column(Integer, ForeignKey('company.id'))
+    company_id = Column(Integer, ForeignKey('company.id', ondelete="CASCADE"))
     sender_id = Column(Integer, ForeignKey('users.id'))
     recipient_id = Column(Integer, ForeignKey('users.id'))
     status_action = Column(Enum(StatusActionWithSent), default=StatusActionWithSent.SENT)
@@ -53,6 +87,13 @@ class Action(Base):
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_created_id", "created", "id"),
+        Index("ix_users_search_vector", "search_vector", postgresql_using="gin"),
+        trigram_index("ix_users_username_trgm", "username"),
+        trigram_index("ix_users_email_trgm", "email"),
+    )
+    __mapper_args__ = SEARCH_MAPPER_ARGS
     id = Column(Integer, primary_key=True)
     username = Column(String(USERNAME_MAXLENGTH), nullable=False)
     email = Column(String(EMAIl_MAXLENGTH), nullable=False, unique=True)
@@ -71,10 +112,17 @@ class User(Base):
                                     back_populates="recipient")
     created = Column(DateTime, default=func.now())
     updated = Column(DateTime, default=func.now(), onupdate=func.now())
+    search_vector = search_vector_column("username", "email")
 
 
 class Company(Base):
     __tablename__ = "company"
+    __table_args__ = (
+        Index("ix_company_visible_created_id", "created", "id", postgresql_where=text("visible")),
+        Index("ix_company_search_vector", "search_vector", postgresql_using="gin"),
+        trigram_index("ix_company_company_name_trgm", "company_name"),
+    )
+    __mapper_args__ = SEARCH_MAPPER_ARGS
     id = Column(Integer, primary_key=True)
     company_name = Column(String(COMPANY_NAME_MAXLENGTH), nullable=False, unique=True)
     description = Column(String(DESCRIPTION_MAXLENGTH), nullable=False)
@@ -84,43 +132,107 @@ class Company(Base):
                            cascade="save-update, merge")
     admins = relationship("User", secondary=admin_company_association, back_populates="admin_of_companies",
                           cascade="save-update, merge")
-    actions = relationship("Action", back_populates="company", cascade="all, delete-orphan")
+    actions = relationship("Action", back_populates="company", cascade="all, delete-orphan", passive_deletes=True)
     visible = Column(Boolean, default=True)
-    quizzes = relationship("Quiz", back_populates="company", cascade="all, delete-orphan")
+    quizzes = relationship("Quiz", back_populates="company", cascade="all, delete-orphan", passive_deletes=True)
     created = Column(DateTime, default=func.now())
     updated = Column(DateTime, default=func.now(), onupdate=func.now())
+    search_vector = search_vector_column("company_name", "description")
 
 
 class Quiz(Base):
     __tablename__ = 'quizzes'
+    __table_args__ = (
+        Index("ix_quizzes_created_id", "created", "id"),
+        Index("ix_quizzes_search_vector", "search_vector", postgresql_using="gin"),
+        trigram_index("ix_quizzes_name_trgm", "name"),
+        Index("ix_quizzes_company_id", "company_id"),
+    )
+    __mapper_args__ = SEARCH_MAPPER_ARGS
     id = Column(Integer, primary_key=True)
     name = Column(String(QUIZ_NAME_MAXLENGTH), nullable=False)
     description = Column(String(QUIZ_DESCRIPTION_MAXLENGTH))
     frequency = Column(Integer, default=0)
-    company_id = Column(Integer, ForeignKey('company.id'))
+    company_id = Column(Integer, ForeignKey('company.id', ondelete="CASCADE"))
     company = relationship('Company', back_populates='quizzes')
-    questions = relationship('Question', back_populates='quiz', cascade="all, delete-orphan")
+    questions = relationship('Question', back_populates='quiz', cascade="all, delete-orphan", passive_deletes=True)
     created = Column(DateTime, default=func.now())
     updated = Column(DateTime, default=func.now(), onupdate=func.now())
+    search_vector = search_vector_column("name", "description")
 
 
 class Question(Base):
     __tablename__ = 'questions'
+    __table_args__ = (
+        Index("ix_questions_quiz_id", "quiz_id"),
+    )
     id = Column(Integer, primary_key=True)
     text = Column(String(QUESTION_TEXT_MAXLENGTH))
-    quiz_id = Column(Integer, ForeignKey('quizzes.id'))
+    quiz_id = Column(Integer, ForeignKey('quizzes.id', ondelete="CASCADE"))
     quiz = relationship('Quiz', back_populates='questions')
-    answers = relationship('Answer', back_populates='question', cascade="all, delete-orphan")
+    answers = relationship('Answer', back_populates='question', cascade="all, delete-orphan", passive_deletes=True)
     created = Column(DateTime, default=func.now())
     updated = Column(DateTime, default=func.now(), onupdate=func.now())
 
 
 class Answer(Base):
     __tablename__ = 'answers'
+    __table_args__ = (
+        Index("ix_answers_question_id", "question_id"),
+    )
     id = Column(Integer, primary_key=True)
     text = Column(String(ANSWER_TEXT_MAXLENGTH))
     is_correct = Column(Boolean, default=False)
-    question_id = Column(Integer, ForeignKey('questions.id'))
+    question_id = Column(Integer, ForeignKey('questions.id', ondelete="CASCADE"))
     question = relationship('Question', back_populates='answers')
     created = Column(DateTime, default=func.now())
     updated = Column(DateTime, default=func.now(), onupdate=func.now())
+
+
+class QuizAttempt(Base):
+    """A graded submission of a quiz.
+
+    `question_ids`, `results` and `answer_ids` keep what was answered: the questions in
+    submission order, whether each one was answered correctly, and every selected answer.
+    `attempt_key` is assigned at submission and makes writing the attempt idempotent.
+    """
+    __tablename__ = 'quiz_attempts'
+    __table_args__ = (
+        Index("ix_quiz_attempts_quiz_id_created_id", "quiz_id", "created", "id"),
+        Index("ix_quiz_attempts_user_id_company_id", "user_id", "company_id"),
+    )
+    id = Column(Integer, primary_key=True)
+    attempt_key = Column(UUID(as_uuid=True), nullable=False, unique=True)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete="CASCADE"), nullable=False)
+    company_id = Column(Integer, ForeignKey('company.id', ondelete="CASCADE"), nullable=False)
+    quiz_id = Column(Integer, ForeignKey('quizzes.id', ondelete="CASCADE"), nullable=False)
+    correct = Column(Integer, nullable=False)
+    total = Column(Integer, nullable=False)
+    question_ids = Column(ARRAY(Integer), nullable=False)
+    results = Column(ARRAY(Boolean), nullable=False)
+    answer_ids = Column(ARRAY(Integer), nullable=False)
+    created = Column(DateTime, default=func.now())
+
+
+class QuizAttemptStats(Base):
+    """Running aggregates of quiz attempts per (user_id, company_id, quiz_id).
+
+    0 in a key column stands for "all": (user, 0, 0) covers a user's attempts everywhere,
+    (user, company, 0) a member's in one company, (0, company, quiz) a quiz's and
+    (0, company, 0) a company's, so every average is read from one row. The table is
+    derived from quiz_attempts and has no foreign keys: deleting a user, company or quiz
+    subtracts its attempts in the same transaction. It can be recomputed at any time
+    with `python -m repository.attempt_stats` (run from app/).
+    """
+    __tablename__ = 'quiz_attempt_stats'
+    __table_args__ = (
+        Index("ix_quiz_attempt_stats_company_id_quiz_id_user_id", "company_id", "quiz_id", "user_id"),
+    )
+    user_id = Column(Integer, primary_key=True)
+    company_id = Column(Integer, primary_key=True)
+    quiz_id = Column(Integer, primary_key=True)
+    attempts = Column(Integer, nullable=False)
+    score_sum = Column(Float, nullable=False)
+    score_sumsq = Column(Float, nullable=False)
+    passed = Column(Integer, nullable=False)
+    last_attempt = Column(DateTime)
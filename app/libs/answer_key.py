@@ -0,0 +1,181 @@
+import json
+import logging
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from fastapi import Depends
+
+from db.connect import get_redis
+from db.models import Quiz as QuizFromModels
+from libs.cache import VersionedCache, cache_stats, get_quiz_cache
+from utils.service_config import settings
+
+
+class InvalidAttemptError(ValueError):
+    pass
+
+
+class GradedAttempt(NamedTuple):
+    correct: int
+    total: int
+    question_ids: List[int]
+    results: List[bool]
+    answer_ids: List[int]
+
+    @property
+    def score(self) -> float:
+        return self.correct / self.total if self.total else 0.0
+
+
+class CompiledAnswerKey:
+    """The correct answers of a quiz as one bitmask per question.
+
+    Every answer of a question owns one bit, assigned in answer id order; a question is
+    answered correctly when the selected bits equal its mask of correct answers.
+    """
+    __slots__ = ("quiz_id", "company_id", "questions")
+
+    def __init__(self, quiz_id: int, company_id: int, questions: Dict[int, Tuple[Dict[int, int], int]]):
+        self.quiz_id = quiz_id
+        self.company_id = company_id
+        self.questions = questions
+
+    @classmethod
+    def build(cls, quiz_id: int, company_id: int, questions: Iterable[Tuple[int, List[int], int]]):
+        return cls(quiz_id, company_id, {
+            question_id: ({answer_id: 1 << bit for bit, answer_id in enumerate(answer_ids)}, correct_mask)
+            for question_id, answer_ids, correct_mask in questions
+        })
+
+    @classmethod
+    def compile(cls, quiz: QuizFromModels) -> "CompiledAnswerKey":
+        questions = []
+        for question in quiz.questions:
+            answers = sorted(question.answers, key=lambda answer: answer.id)
+            correct_mask = sum(1 << bit for bit, answer in enumerate(answers) if answer.is_correct)
+            questions.append((question.id, [answer.id for answer in answers], correct_mask))
+        return cls.build(quiz.id, quiz.company_id, questions)
+
+    def dumps(self) -> bytes:
+        questions = [[question_id, list(answer_bits), correct_mask]
+                     for question_id, (answer_bits, correct_mask) in self.questions.items()]
+        return json.dumps({"quiz_id": self.quiz_id, "company_id": self.company_id, "questions": questions},
+                          separators=(",", ":")).encode()
+
+    @classmethod
+    def loads(cls, payload: bytes) -> "CompiledAnswerKey":
+        content = json.loads(payload)
+        return cls.build(content["quiz_id"], content["company_id"], content["questions"])
+
+    def grade(self, selections: Iterable[Tuple[int, Iterable[int]]]) -> GradedAttempt:
+        """Grade `(question_id, selected answer ids)` pairs; unanswered questions count as wrong."""
+        question_ids, results, answer_ids = [], [], []
+        correct = 0
+        for question_id, selected in selections:
+            entry = self.questions.get(question_id)
+            if entry is None:
+                raise InvalidAttemptError(f"Question {question_id} is not part of quiz {self.quiz_id}")
+            answer_bits, correct_mask = entry
+
+            mask = 0
+            for answer_id in selected:
+                bit = answer_bits.get(answer_id)
+                if bit is None:
+                    raise InvalidAttemptError(f"Answer {answer_id} is not part of question {question_id}")
+                mask |= bit
+                answer_ids.append(answer_id)
+
+            is_correct = mask == correct_mask
+            correct += is_correct
+            question_ids.append(question_id)
+            results.append(is_correct)
+
+        if len(set(question_ids)) != len(question_ids):
+            raise InvalidAttemptError("Every question can be answered only once")
+        return GradedAttempt(correct, len(self.questions), question_ids, results, answer_ids)
+
+
+class LocalAnswerKeys:
+    """In-process LRU of compiled answer keys, one version per quiz."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.stats = cache_stats["answer_key"]
+        self._entries: OrderedDict[int, Tuple[int, CompiledAnswerKey]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, quiz_id: int, version: int) -> Optional[CompiledAnswerKey]:
+        entry = self._entries.get(quiz_id)
+        if entry is None or entry[0] != version:
+            return None
+        self._entries.move_to_end(quiz_id)
+        return entry[1]
+
+    def set(self, quiz_id: int, version: int, answer_key: CompiledAnswerKey) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries[quiz_id] = (version, answer_key)
+        self._entries.move_to_end(quiz_id)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+local_answer_keys = LocalAnswerKeys(maxsize=settings.ANSWER_KEY_CACHE_SIZE)
+
+
+class AnswerKeyCache:
+    """Compiled answer keys, kept in process and in Redis under the quiz cache version.
+
+    Every quiz, question and answer write bumps that version (see get_quiz_cache), so a
+    key compiled before a change is never served after it. A warm lookup costs one Redis
+    GET for the version; the key itself is only fetched or compiled when it changed.
+    """
+
+    def __init__(self, redis_client, quiz_cache: VersionedCache, local_keys: LocalAnswerKeys, ttl: int):
+        self.redis = redis_client
+        self.quiz_cache = quiz_cache
+        self.local_keys = local_keys
+        self.ttl = ttl
+        self.stats = local_keys.stats
+
+    @staticmethod
+    def payload_key(quiz_id: int, version: int) -> str:
+        return f"answer_key:{quiz_id}:v{version}"
+
+    async def get(self, quiz_id: int, load: Callable[[], Awaitable[QuizFromModels]]) -> CompiledAnswerKey:
+        try:
+            version = await self.quiz_cache.version(quiz_id)
+            answer_key = self.local_keys.get(quiz_id, version)
+            if answer_key is None:
+                payload = await self.redis.get(self.payload_key(quiz_id, version))
+                if payload is not None:
+                    answer_key = CompiledAnswerKey.loads(payload)
+                    self.local_keys.set(quiz_id, version, answer_key)
+        except Exception as e:
+            logging.error(f"Exception during reading answer key cache: {e}")
+            version, answer_key = -1, None
+
+        if answer_key is not None:
+            self.stats.hits += 1
+            return answer_key
+
+        self.stats.misses += 1
+        answer_key = CompiledAnswerKey.compile(await load())
+        if version >= 0:
+            self.local_keys.set(quiz_id, version, answer_key)
+            try:
+                await self.redis.set(self.payload_key(quiz_id, version), answer_key.dumps(), ex=self.ttl)
+            except Exception as e:
+                logging.error(f"Exception during writing answer key cache: {e}")
+        return answer_key
+
+
+def get_answer_key_cache(redis_client=Depends(get_redis),
+                         quiz_cache: VersionedCache = Depends(get_quiz_cache)) -> AnswerKeyCache:
+    return AnswerKeyCache(redis_client, quiz_cache, local_answer_keys, ttl=settings.ANSWER_KEY_CACHE_TTL)
@@ -0,0 +1,231 @@
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from redis.exceptions import ResponseError
+from sqlalchemy.exc import IntegrityError
+
+from db.connect import async_session_factory, redis_client
+from db.models import QuizAttempt as QuizAttemptFromModels
+from libs.leaderboard import Leaderboards
+from repository.attempts import AttemptRepository
+from utils.service_config import settings
+
+ATTEMPT_STREAM = "quiz_attempts:stream"
+ATTEMPT_GROUP = "quiz_attempt_writers"
+ATTEMPT_KEY_NAMESPACE = uuid.UUID("6f1d3c2a-8b4e-4f7a-9c5d-2e8b1a7f4c3d")
+
+
+def make_attempt_key(user_id: int, quiz_id: int, idempotency_key: Optional[str] = None) -> uuid.UUID:
+    """A fresh key, or a stable one when the client retries with the same Idempotency-Key."""
+    if idempotency_key is None:
+        return uuid.uuid4()
+    return uuid.uuid5(ATTEMPT_KEY_NAMESPACE, f"{user_id}:{quiz_id}:{idempotency_key}")
+
+
+def encode_attempt(row: dict) -> Dict[str, bytes]:
+    content = {**row, "attempt_key": str(row["attempt_key"]), "created": row["created"].isoformat()}
+    return {"attempt": json.dumps(content, separators=(",", ":")).encode()}
+
+
+def decode_attempt(fields: Dict[bytes, bytes]) -> dict:
+    row = json.loads(fields[b"attempt"])
+    row["attempt_key"] = uuid.UUID(row["attempt_key"])
+    row["created"] = datetime.fromisoformat(row["created"])
+    return row
+
+
+class AttemptWriter:
+    """Write-behind of graded attempts through a Redis Stream.
+
+    Submissions are appended to the stream and acknowledged to the client right away.
+    The writer reads them through a consumer group and inserts each batch with one
+    multi-row INSERT; entries are XACKed and deleted only after the commit, so a crash
+    redelivers them (entries idle longer than `claim_idle_ms` are claimed by another
+    writer) and ON CONFLICT on attempt_key drops the duplicates. The stream therefore
+    only holds attempts not yet in Postgres, which is what the lag gauges report.
+    Leaderboards are updated before the XACK and skip attempts they already applied,
+    so a failed update is redelivered and retried, and a redelivered entry is counted
+    once.
+    """
+
+    def __init__(self, redis_client, session_factory, batch_size: int, flush_interval_ms: int,
+                 claim_idle_ms: int, max_lag: int, stream: str = ATTEMPT_STREAM, group: str = ATTEMPT_GROUP,
+                 consumer: Optional[str] = None):
+        self.redis = redis_client
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval_ms = flush_interval_ms
+        self.claim_idle_ms = claim_idle_ms
+        self.max_lag = max_lag
+        self.stream = stream
+        self.group = group
+        self.consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+        self.leaderboards = Leaderboards(redis_client)
+        self.lag_entries = 0
+        self.lag_seconds = 0.0
+        self.flushed = 0
+        self.duplicates = 0
+        self._group_ready = False
+        self._stopping = False
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def lagging(self) -> bool:
+        return self.lag_entries >= self.max_lag
+
+    async def append(self, row: dict) -> bytes:
+        return await self.redis.xadd(self.stream, encode_attempt(row))
+
+    async def ensure_group(self) -> None:
+        if self._group_ready:
+            return
+        try:
+            await self.redis.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._group_ready = True
+
+    async def read_batch(self, block_ms: Optional[int]) -> List[Tuple[bytes, Dict[bytes, bytes]]]:
+        # Redis 6.2 replies [next_id, entries], Redis 7 adds the ids of deleted entries
+        reply = await self.redis.xautoclaim(self.stream, self.group, self.consumer,
+                                            min_idle_time=self.claim_idle_ms, count=self.batch_size)
+        entries = [(entry_id, fields) for entry_id, fields in reply[1] if fields is not None]
+        if len(entries) < self.batch_size:
+            response = await self.redis.xreadgroup(self.group, self.consumer, {self.stream: ">"},
+                                                   count=self.batch_size - len(entries),
+                                                   block=None if entries else block_ms)
+            for _, stream_entries in response or []:
+                entries += stream_entries
+        return entries
+
+    async def write(self, rows: List[dict]) -> Tuple[List[uuid.UUID], List[uuid.UUID]]:
+        """Insert attempts and return the attempt_keys newly stored and those dropped."""
+        async with self.session_factory() as session:
+            repo = AttemptRepository(session, QuizAttemptFromModels)
+            try:
+                return await repo.create_many(rows), []
+            except IntegrityError:
+                await session.rollback()
+
+            # a quiz, company or user deleted after submission fails the whole batch
+            attempt_keys, dropped = [], []
+            for row in rows:
+                try:
+                    attempt_keys += await repo.create_many([row])
+                except IntegrityError as e:
+                    await session.rollback()
+                    dropped.append(row["attempt_key"])
+                    logging.error(f"Dropped quiz attempt with key: {row['attempt_key']}: {e.orig}")
+            return attempt_keys, dropped
+
+    async def store(self, rows: List[dict]) -> int:
+        """Insert attempts and record every one now in Postgres on the leaderboards.
+
+        Attempts stored by an earlier delivery whose leaderboard update failed are
+        recorded too; the leaderboards skip the ones already applied.
+        """
+        stored, dropped = await self.write(rows)
+        dropped = set(dropped)
+        await self.leaderboards.record(row for row in rows if row["attempt_key"] not in dropped)
+        return len(stored)
+
+    async def flush_once(self, block_ms: Optional[int] = None) -> int:
+        """Write one batch of pending attempts to Postgres and return how many entries it held."""
+        await self.ensure_group()
+        entries = await self.read_batch(block_ms)
+        if entries:
+            rows = []
+            for entry_id, fields in entries:
+                try:
+                    rows.append(decode_attempt(fields))
+                except (KeyError, ValueError) as e:
+                    logging.error(f"Dropped malformed quiz attempt entry: {entry_id}: {e}")
+
+            unique_rows = list({row["attempt_key"]: row for row in rows}.values())
+            inserted = await self.store(unique_rows) if unique_rows else 0
+            self.flushed += inserted
+            self.duplicates += len(rows) - inserted
+
+            entry_ids = [entry_id for entry_id, _ in entries]
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.xack(self.stream, self.group, *entry_ids)
+                pipe.xdel(self.stream, *entry_ids)
+                await pipe.execute()
+
+        await self.update_lag()
+        return len(entries)
+
+    async def update_lag(self) -> None:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.xlen(self.stream)
+            pipe.xrange(self.stream, count=1)
+            length, oldest = await pipe.execute()
+        self.lag_entries = length
+        if oldest:
+            milliseconds = int(oldest[0][0].split(b"-")[0])
+            self.lag_seconds = max(0.0, time.time() - milliseconds / 1000)
+        else:
+            self.lag_seconds = 0.0
+
+    async def run(self) -> None:
+        while not self._stopping:
+            try:
+                await self.flush_once(block_ms=self.flush_interval_ms)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if "NOGROUP" in str(e):
+                    self._group_ready = False
+                logging.error(f"Exception during flushing quiz attempts: {e}")
+                # submissions switch to synchronous writes on the lag, so keep it current while flushes fail
+                try:
+                    await self.update_lag()
+                except Exception as e:
+                    logging.error(f"Exception during reading quiz attempt stream lag: {e}")
+                await asyncio.sleep(self.flush_interval_ms / 1000)
+
+    def start(self) -> None:
+        self._stopping = False
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        self._stopping = True
+        if self._task is not None:
+            try:
+                await asyncio.wait_for(self._task, timeout=self.flush_interval_ms / 1000 + 5)
+            except asyncio.TimeoutError:
+                logging.error("Quiz attempt writer did not stop in time, pending attempts will be redelivered")
+            self._task = None
+
+    def render(self) -> str:
+        lines = []
+        for name, kind, help_text, value in (
+                ("quiz_attempt_stream_lag_entries", "gauge",
+                 "Submitted attempts not yet written to Postgres.", self.lag_entries),
+                ("quiz_attempt_stream_lag_seconds", "gauge",
+                 "Age of the oldest attempt not yet written to Postgres.", self.lag_seconds),
+                ("quiz_attempts_flushed_total", "counter",
+                 "Attempts written to Postgres by this process.", self.flushed),
+                ("quiz_attempts_duplicates_total", "counter",
+                 "Redelivered attempts that were already written.", self.duplicates)):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {value:g}"]
+        return "\n".join(lines) + "\n"
+
+
+attempt_writer = AttemptWriter(redis_client, async_session_factory,
+                               batch_size=settings.ATTEMPT_FLUSH_BATCH_SIZE,
+                               flush_interval_ms=settings.ATTEMPT_FLUSH_INTERVAL_MS,
+                               claim_idle_ms=settings.ATTEMPT_CLAIM_IDLE_MS,
+                               max_lag=settings.ATTEMPT_STREAM_MAX_LAG)
+
+
+def get_attempt_writer() -> AttemptWriter:
+    return attempt_writer
@@ -7,10 +7,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from db.connect import get_session
 from db.models import User as UserFromModels
+from libs.principal import PrincipalCache, get_principal_cache
+from schemas.auth import Principal
 from schemas.users import SignUpRequestModel
 from utils.service_config import settings
 from repository.users import UserRepository as UserFromRepository
-from .tokens import VerifyCustomToken, VerifyAuth0Token
+from .token_cache import verified_tokens
+from .tokens import select_verifier
 
 token_auth_scheme = HTTPBearer()
 
@@ -39,36 +42,65 @@ def get_login(payload: Dict[str, str], token_mark: str, credentials_exception: H
     return login
 
 
+def to_principal(user: UserFromModels) -> Principal:
+    return Principal(
+        id=user.id,
+        username=user.username,
+        email=user.email,
+        phones=user.phones or [],
+        status=user.status,
+        is_active=user.is_active,
+        is_superuser=user.is_superuser,
+        created=user.created,
+        updated=user.updated
+    )
+
+
 async def get_current_user(
         token: Annotated[str, Depends(token_auth_scheme)],
-        async_session: AsyncSession = Depends(get_session)
-) -> UserFromModels:
+        async_session: AsyncSession = Depends(get_session),
+        principal_cache: PrincipalCache = Depends(get_principal_cache)
+) -> Principal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    payload_with_mark = VerifyCustomToken(token).verify()
-    if payload_with_mark.get("status"):
-        payload_with_mark = VerifyAuth0Token(token).verify()
+    cached = verified_tokens.get(token.credentials)
+    if cached is not None:
+        payload, token_mark = cached
+    else:
+        verifier = select_verifier(token)
+        if verifier is None:
+            raise credentials_exception
 
+        payload_with_mark = await verifier(token).verify()
         if payload_with_mark.get("status"):
             raise credentials_exception
 
-    payload = payload_with_mark.get("payload")
-    token_mark = payload_with_mark.get("mark")
+        payload = payload_with_mark.get("payload")
+        token_mark = payload_with_mark.get("mark")
+        verified_tokens.set(token.credentials, payload, token_mark)
 
     login = get_login(payload=payload, token_mark=token_mark, credentials_exception=credentials_exception)
 
-    current_user: UserFromModels = await UserFromRepository(async_session, UserFromModels).get_user_by_login(login=login)
+    version, principal = await principal_cache.get(login)
+    if principal is not None:
+        return principal
+
+    user_repo = UserFromRepository(async_session, UserFromModels)
+    current_user: UserFromModels = await user_repo.get_user_by_login(login=login)
     if current_user is None and token_mark == "auth0_mark":
         user_model = SignUpRequestModel(username=login, email=login, password=login)
-        current_user: UserFromModels = await UserFromRepository(async_session).create(body=user_model)
+        current_user: UserFromModels = await user_repo.create(body=user_model)
     elif current_user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    return current_user
+
+    principal = to_principal(user=current_user)
+    await principal_cache.set(principal, version)
+    return principal
@@ -0,0 +1,89 @@
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, Optional, Tuple
+
+from fastapi import Depends
+
+from db.connect import get_redis
+from utils.service_config import settings
+
+
+class CacheStats:
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+cache_stats: Dict[str, CacheStats] = defaultdict(CacheStats)
+
+
+class VersionedCache:
+    """Read-through cache of serialized payloads stored under `<namespace>:<id>:v<version>`.
+
+    Writers bump the version instead of deleting payloads, so a reader that loaded
+    data before a mutation can only store it under an already outdated key.
+    """
+
+    def __init__(self, redis_client, namespace: str, ttl: int):
+        self.redis = redis_client
+        self.namespace = namespace
+        self.ttl = ttl
+        self.stats = cache_stats[namespace]
+
+    def version_key(self, entity_id: int) -> str:
+        return f"{self.namespace}:{entity_id}:version"
+
+    def payload_key(self, entity_id: int, version: int) -> str:
+        return f"{self.namespace}:{entity_id}:v{version}"
+
+    async def version(self, entity_id: int) -> int:
+        return int(await self.redis.get(self.version_key(entity_id)) or 0)
+
+    async def get(self, entity_id: int) -> Tuple[int, Optional[bytes]]:
+        try:
+            version = await self.version(entity_id)
+            payload = await self.redis.get(self.payload_key(entity_id, version))
+        except Exception as e:
+            logging.error(f"Exception during reading {self.namespace} cache: {e}")
+            version, payload = -1, None
+
+        if payload is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return version, payload
+
+    async def set(self, entity_id: int, version: int, payload: bytes) -> None:
+        if version < 0:
+            return
+        try:
+            await self.redis.set(self.payload_key(entity_id, version), payload, ex=self.ttl)
+        except Exception as e:
+            logging.error(f"Exception during writing {self.namespace} cache: {e}")
+
+    async def invalidate(self, entity_id: int) -> None:
+        try:
+            await self.redis.incr(self.version_key(entity_id))
+        except Exception as e:
+            logging.error(f"Exception during invalidating {self.namespace} cache: {e}")
+
+    async def invalidate_many(self, entity_ids: Iterable[int]) -> None:
+        """Bump several versions in one round trip."""
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for entity_id in entity_ids:
+                    pipe.incr(self.version_key(entity_id))
+                await pipe.execute()
+        except Exception as e:
+            logging.error(f"Exception during invalidating {self.namespace} cache: {e}")
+
+
+def get_quiz_cache(redis_client=Depends(get_redis)) -> VersionedCache:
+    return VersionedCache(redis_client, namespace="quiz", ttl=settings.QUIZ_CACHE_TTL)
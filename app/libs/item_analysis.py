@@ -0,0 +1,128 @@
+import json
+import logging
+from itertools import chain
+from typing import Awaitable, Callable, List, Sequence
+
+import numpy as np
+from fastapi import Depends
+
+from db.connect import get_redis
+from libs.answer_key import CompiledAnswerKey
+from libs.cache import VersionedCache, cache_stats, get_quiz_cache
+from utils.service_config import settings
+
+
+def flatten(arrays: Sequence[Sequence], dtype, count: int = -1) -> np.ndarray:
+    return np.fromiter(chain.from_iterable(arrays), dtype=dtype, count=count)
+
+
+def columns_of(ids: np.ndarray, known_ids: np.ndarray) -> np.ndarray:
+    """Column of every id in the sorted `known_ids`, -1 for ids that are no longer part of the quiz."""
+    if not len(known_ids):
+        return np.full(len(ids), -1)
+    columns = np.searchsorted(known_ids, ids)
+    columns[columns == len(known_ids)] = 0
+    return np.where(known_ids[columns] == ids, columns, -1)
+
+
+def analyze(answer_key: CompiledAnswerKey, question_ids: Sequence[List[int]], results: Sequence[List[bool]],
+            answer_ids: Sequence[List[int]]) -> dict:
+    """Classical test theory statistics of a quiz from the question_ids/results/answer_ids of its attempts.
+
+    The attempt matrix is kept in coordinate form (attempt row, question column, result),
+    so every statistic is a bincount over the answered cells. Questions an attempt left
+    out count as wrong, as they do when grading; questions and answers deleted since are
+    ignored. Discrimination is the point-biserial correlation of a question with the
+    score on the other questions, so the question does not correlate with itself.
+    """
+    quiz_questions = np.array(sorted(answer_key.questions), dtype=np.int64)
+    quiz_answers = np.array(sorted(chain.from_iterable(answer_bits for answer_bits, _ in
+                                                       answer_key.questions.values())), dtype=np.int64)
+    attempts, items = len(question_ids), len(quiz_questions)
+
+    lengths = np.fromiter(map(len, question_ids), dtype=np.int64, count=attempts)
+    cells = int(lengths.sum())
+    rows = np.repeat(np.arange(attempts), lengths)
+    columns = columns_of(flatten(question_ids, np.int64, cells), quiz_questions)
+    correct = flatten(results, bool, cells) & (columns >= 0)
+    rows, columns = rows[correct], columns[correct]
+
+    # means over all attempts; `scale` only keeps a quiz without attempts from dividing by zero
+    scale = max(attempts, 1)
+    totals = np.bincount(rows, minlength=attempts).astype(np.float64)
+    total_mean = totals.sum() / scale
+    total_variance = (totals * totals).sum() / scale - total_mean * total_mean
+    difficulty = np.bincount(columns, minlength=items) / scale
+    item_variance = difficulty * (1 - difficulty)
+    total_covariance = np.bincount(columns, weights=totals[rows], minlength=items) / scale - difficulty * total_mean
+
+    rest_covariance = total_covariance - item_variance
+    rest_variance = total_variance - 2 * total_covariance + item_variance
+    with np.errstate(divide="ignore", invalid="ignore"):
+        discrimination = rest_covariance / np.sqrt(item_variance * rest_variance)
+    alpha = None
+    if items > 1 and total_variance > 0:
+        alpha = float(items / (items - 1) * (1 - item_variance.sum() / total_variance))
+
+    answer_columns = columns_of(flatten(answer_ids, np.int64), quiz_answers)
+    selection_rates = np.bincount(answer_columns[answer_columns >= 0], minlength=len(quiz_answers)) / scale
+    answer_rates = dict(zip(quiz_answers.tolist(), selection_rates.tolist()))
+
+    questions = []
+    for column, question_id in enumerate(quiz_questions.tolist()):
+        answer_bits, correct_mask = answer_key.questions[question_id]
+        questions.append({
+            "question_id": question_id,
+            "difficulty": float(difficulty[column]),
+            "discrimination": float(discrimination[column]) if np.isfinite(discrimination[column]) else None,
+            "answers": [{"answer_id": answer_id, "is_correct": bool(bit & correct_mask),
+                         "selection_rate": answer_rates[answer_id]}
+                        for answer_id, bit in sorted(answer_bits.items())],
+        })
+    return {"quiz_id": answer_key.quiz_id, "attempts": attempts, "cronbach_alpha": alpha, "questions": questions}
+
+
+class ItemAnalysisCache:
+    """Quiz item analyses in Redis, keyed by the quiz cache version and the number of attempts.
+
+    Question and answer writes bump the quiz version and every stored attempt bumps the
+    count kept in quiz_attempt_stats, so an analysis is recomputed exactly when one of
+    them changed.
+    """
+
+    def __init__(self, redis_client, quiz_cache: VersionedCache, ttl: int):
+        self.redis = redis_client
+        self.quiz_cache = quiz_cache
+        self.ttl = ttl
+        self.stats = cache_stats["item_analysis"]
+
+    @staticmethod
+    def payload_key(quiz_id: int, version: int, attempts: int) -> str:
+        return f"item_analysis:{quiz_id}:v{version}:a{attempts}"
+
+    async def get(self, quiz_id: int, attempts: int, compute: Callable[[], Awaitable[dict]]) -> dict:
+        try:
+            version = await self.quiz_cache.version(quiz_id)
+            payload = await self.redis.get(self.payload_key(quiz_id, version, attempts))
+        except Exception as e:
+            logging.error(f"Exception during reading item analysis cache: {e}")
+            version, payload = -1, None
+
+        if payload is not None:
+            self.stats.hits += 1
+            return json.loads(payload)
+
+        self.stats.misses += 1
+        analysis = await compute()
+        if version >= 0:
+            try:
+                await self.redis.set(self.payload_key(quiz_id, version, attempts),
+                                     json.dumps(analysis, separators=(",", ":")), ex=self.ttl)
+            except Exception as e:
+                logging.error(f"Exception during writing item analysis cache: {e}")
+        return analysis
+
+
+def get_item_analysis_cache(redis_client=Depends(get_redis),
+                            quiz_cache: VersionedCache = Depends(get_quiz_cache)) -> ItemAnalysisCache:
+    return ItemAnalysisCache(redis_client, quiz_cache, ttl=settings.ITEM_ANALYSIS_CACHE_TTL)
@@ -0,0 +1,107 @@
+import asyncio
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import httpx
+import jwt as pyjwt
+
+from utils.service_config import settings
+
+
+class JWKSError(Exception):
+    pass
+
+
+class JWKSKeyStore:
+    """Process-wide cache of the identity provider's signing keys.
+
+    Keys are fetched asynchronously and kept for `ttl` seconds; if a refresh fails the
+    previous keys keep being served. A token signed with an unknown `kid` triggers a
+    refetch (key rotation), but fetches happen at most once per `miss_ttl` seconds and a
+    kid that is still unknown is remembered as missing for `miss_ttl`, so garbage
+    tokens cannot turn into a stream of JWKS requests. `jwks_url` may be a
+    file:// URL, which keeps tests and local runs offline.
+    """
+
+    max_unknown_kids = 1024
+
+    def __init__(self, jwks_url: str, ttl: int, miss_ttl: int, timeout: float = 5.0):
+        self.jwks_url = jwks_url
+        self.ttl = ttl
+        self.miss_ttl = miss_ttl
+        self.timeout = timeout
+        self.keys: Dict[str, pyjwt.PyJWK] = {}
+        self.fetched_at: Optional[float] = None
+        self.attempted_at: Optional[float] = None
+        self.fetches = 0
+        self.unknown_kids: Dict[str, float] = {}
+        self._lock = asyncio.Lock()
+
+    async def _fetch(self) -> dict:
+        self.fetches += 1
+        if self.jwks_url.startswith("file://"):
+            content = await asyncio.to_thread(Path(self.jwks_url[len("file://"):]).read_text)
+            return json.loads(content)
+
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            response = await client.get(self.jwks_url)
+            response.raise_for_status()
+            return response.json()
+
+    @staticmethod
+    def _parse(jwks: dict) -> Dict[str, pyjwt.PyJWK]:
+        keys = {}
+        for jwk in jwks.get("keys", []):
+            if not jwk.get("kid") or jwk.get("use", "sig") != "sig":
+                continue
+            try:
+                keys[jwk["kid"]] = pyjwt.PyJWK(jwk)
+            except pyjwt.exceptions.PyJWTError as e:
+                logging.error(f"Skipping unusable JWKS key {jwk.get('kid')}: {e}")
+        return keys
+
+    @staticmethod
+    def _since(moment: Optional[float]) -> float:
+        return float("inf") if moment is None else time.monotonic() - moment
+
+    async def refresh(self) -> None:
+        async with self._lock:
+            # at most one fetch per miss_ttl, also covers requests that waited for the lock
+            if self._since(self.attempted_at) < self.miss_ttl:
+                return
+            self.attempted_at = time.monotonic()
+            try:
+                keys = self._parse(await self._fetch())
+            except Exception as e:
+                logging.error(f"Exception during JWKS refresh, keeping {len(self.keys)} cached keys: {e}")
+                return
+
+            self.keys = keys
+            self.fetched_at = time.monotonic()
+            self.unknown_kids = {kid: retry_at for kid, retry_at in self.unknown_kids.items() if kid not in keys}
+
+    async def get_signing_key(self, kid: str):
+        if self._since(self.fetched_at) >= self.ttl:
+            await self.refresh()
+
+        jwk = self.keys.get(kid)
+        if jwk is not None:
+            return jwk.key
+
+        if self.unknown_kids.get(kid, 0) > time.monotonic():
+            raise JWKSError(f"Unknown signing key: {kid}")
+
+        await self.refresh()
+        jwk = self.keys.get(kid)
+        if jwk is None:
+            if len(self.unknown_kids) >= self.max_unknown_kids:
+                self.unknown_kids.clear()
+            self.unknown_kids[kid] = time.monotonic() + self.miss_ttl
+            raise JWKSError(f"Unknown signing key: {kid}")
+        return jwk.key
+
+
+jwks_store = JWKSKeyStore(settings.JWKS_URL, ttl=settings.JWKS_TTL, miss_ttl=settings.JWKS_MISS_TTL)
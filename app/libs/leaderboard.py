@@ -0,0 +1,143 @@
+import argparse
+import asyncio
+import logging
+import uuid
+from typing import Iterable, List, Optional, Tuple
+
+from fastapi import Depends
+from sqlalchemy import Float, cast, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.connect import async_session_factory, get_redis, redis_client
+from db.models import QuizAttempt as QuizAttemptFromModels
+
+REBUILD_CHUNK_SIZE = 10000
+# outlives any redelivery of an attempt from the stream
+APPLIED_MARKER_TTL = 7 * 24 * 3600
+
+LeaderboardRow = Tuple[int, int, float]
+
+
+class Leaderboards:
+    """Per company and per quiz rankings in Redis sorted sets, member = user id.
+
+    A company ranks its users by correct answers over all attempts (ZINCRBY), a quiz by
+    each user's best score (ZADD GT), so both are updated with one command per attempt
+    and answer ranks in O(log n). ZINCRBY is not idempotent, so every applied attempt
+    leaves a marker keyed by its attempt_key. Sorted sets can be rebuilt from
+    quiz_attempts at any time with `python -m libs.leaderboard` (run from app/).
+    """
+
+    def __init__(self, redis_client):
+        self.redis = redis_client
+
+    @staticmethod
+    def company_key(company_id: int) -> str:
+        return f"leaderboard:company:{company_id}"
+
+    @staticmethod
+    def quiz_key(company_id: int, quiz_id: int) -> str:
+        return f"leaderboard:company:{company_id}:quiz:{quiz_id}"
+
+    @staticmethod
+    def applied_key(attempt_key) -> str:
+        return f"leaderboard:applied:{attempt_key}"
+
+    async def record(self, rows: Iterable[dict]) -> None:
+        """Apply stored attempts, each once however often it is passed.
+
+        The markers are read under WATCH and set in the MULTI/EXEC that applies the
+        scores, so an attempt is counted at most once even when two writers race on it.
+        Errors, WatchError included, propagate for the caller to retry.
+        """
+        rows = list(rows)
+        if not rows:
+            return
+        markers = [self.applied_key(row["attempt_key"]) for row in rows]
+        async with self.redis.pipeline(transaction=True) as pipe:
+            await pipe.watch(*markers)
+            applied = await pipe.mget(markers)
+            pipe.multi()
+            for row, marker, done in zip(rows, markers, applied):
+                if done is not None:
+                    continue
+                score = row["correct"] / row["total"] if row["total"] else 0.0
+                pipe.zincrby(self.company_key(row["company_id"]), row["correct"], row["user_id"])
+                pipe.zadd(self.quiz_key(row["company_id"], row["quiz_id"]), {row["user_id"]: score}, gt=True)
+                pipe.set(marker, 1, ex=APPLIED_MARKER_TTL)
+            await pipe.execute()
+
+    async def top(self, key: str, offset: int, limit: int) -> List[LeaderboardRow]:
+        entries = await self.redis.zrevrange(key, offset, offset + limit - 1, withscores=True)
+        return [(int(member), offset + n + 1, score) for n, (member, score) in enumerate(entries)]
+
+    async def around(self, key: str, user_id: int, radius: int) -> Optional[List[LeaderboardRow]]:
+        rank = await self.redis.zrevrank(key, user_id)
+        if rank is None:
+            return None
+        return await self.top(key, max(rank - radius, 0), radius + min(rank, radius) + 1)
+
+    async def replace(self, key: str, scores: Iterable[Tuple[int, float]]) -> int:
+        """Fill a temporary key in chunks and swap it in with RENAME."""
+        temporary_key = f"{key}:rebuild:{uuid.uuid4().hex}"
+        written, chunk = 0, {}
+        for user_id, score in scores:
+            chunk[user_id] = score
+            if len(chunk) >= REBUILD_CHUNK_SIZE:
+                written += len(chunk)
+                await self.redis.zadd(temporary_key, chunk)
+                chunk = {}
+        if chunk:
+            written += len(chunk)
+            await self.redis.zadd(temporary_key, chunk)
+
+        if written:
+            await self.redis.rename(temporary_key, key)
+        else:
+            await self.redis.delete(key)
+        return written
+
+    async def rebuild(self, async_session: AsyncSession, company_id: int) -> int:
+        """Recompute a company's leaderboards from quiz_attempts.
+
+        Attempts written while the rebuild runs may be missing from the result; run it
+        again once writes settle if that matters.
+        """
+        attempts = QuizAttemptFromModels
+        stmt = select(attempts.user_id, func.sum(attempts.correct)).where(attempts.company_id == company_id). \
+            group_by(attempts.user_id)
+        res = await async_session.execute(stmt)
+        members = await self.replace(self.company_key(company_id), res.all())
+
+        best_score = func.max(cast(attempts.correct, Float) / cast(func.nullif(attempts.total, 0), Float))
+        stmt = select(attempts.quiz_id, attempts.user_id, func.coalesce(best_score, 0.0)). \
+            where(attempts.company_id == company_id).group_by(attempts.quiz_id, attempts.user_id). \
+            order_by(attempts.quiz_id)
+        res = await async_session.execute(stmt)
+        quiz_scores = {}
+        for quiz_id, user_id, score in res:
+            quiz_scores.setdefault(quiz_id, []).append((user_id, score))
+        for quiz_id, scores in quiz_scores.items():
+            await self.replace(self.quiz_key(company_id, quiz_id), scores)
+        return members
+
+
+def get_leaderboards(redis_client=Depends(get_redis)) -> Leaderboards:
+    return Leaderboards(redis_client)
+
+
+async def rebuild_leaderboards(company_ids: List[int]) -> None:
+    leaderboards = Leaderboards(redis_client)
+    async with async_session_factory() as session:
+        if not company_ids:
+            res = await session.execute(select(QuizAttemptFromModels.company_id).distinct())
+            company_ids = res.scalars().all()
+        for company_id in company_ids:
+            members = await leaderboards.rebuild(session, company_id)
+            print(f"Rebuilt leaderboards of company {company_id}: {members} members")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild company and quiz leaderboards from quiz_attempts.")
+    parser.add_argument("company_ids", nargs="*", type=int, help="companies to rebuild, all by default")
+    asyncio.run(rebuild_leaderboards(parser.parse_args().company_ids))
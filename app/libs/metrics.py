@@ -0,0 +1,123 @@
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class RequestStats:
+    """SQL statements and DB time of the request being served (see request_stats_var)."""
+    __slots__ = ("queries", "db_time")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+
+    def server_timing(self, latency: float) -> str:
+        return f'app;dur={latency * 1000:.1f}, db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries"'
+
+
+request_stats_var: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    request_stats = request_stats_var.get()
+    if request_stats is not None:
+        request_stats.queries += 1
+        request_stats.db_time += time.perf_counter() - context._metrics_started
+
+
+def instrument_engine(engine) -> None:
+    """Attribute every statement executed on `engine` to the current request."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class Histogram:
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> Iterable[Tuple[str, int]]:
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            yield f"{bound:g}", total
+        yield "+Inf", self.count
+
+
+class RouteMetrics:
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.db_time = 0.0
+
+
+def _labels(**labels: str) -> str:
+    def escape(value: str) -> str:
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    return ",".join(f'{name}="{escape(value)}"' for name, value in labels.items())
+
+
+class MetricsRegistry:
+    """Per route template request metrics, rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], RouteMetrics] = {}
+        self._lock = Lock()
+
+    def observe(self, method: str, route: str, latency: float, request_stats: RequestStats) -> None:
+        with self._lock:
+            metrics = self.routes.get((method, route))
+            if metrics is None:
+                metrics = self.routes[(method, route)] = RouteMetrics()
+            metrics.latency.observe(latency)
+            metrics.queries.observe(request_stats.queries)
+            metrics.db_time += request_stats.db_time
+
+    def render(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            routes = sorted(self.routes.items())
+
+            for name, help_text, attr in (
+                    ("http_request_duration_seconds", "Request latency by route template.", "latency"),
+                    ("http_request_db_queries", "SQL statements per request by route template.", "queries")):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+                for (method, route), metrics in routes:
+                    histogram = getattr(metrics, attr)
+                    for bound, count in histogram.cumulative():
+                        lines.append(f"{name}_bucket{{{_labels(method=method, route=route, le=bound)}}} {count}")
+                    lines.append(f"{name}_sum{{{_labels(method=method, route=route)}}} {histogram.sum:g}")
+                    lines.append(f"{name}_count{{{_labels(method=method, route=route)}}} {histogram.count}")
+
+            name = "http_request_db_seconds_total"
+            lines += [f"# HELP {name} Time spent executing SQL by route template.", f"# TYPE {name} counter"]
+            for (method, route), metrics in routes:
+                lines.append(f"{name}{{{_labels(method=method, route=route)}}} {metrics.db_time:g}")
+        return "\n".join(lines) + "\n"
+
+
+metrics_registry = MetricsRegistry()
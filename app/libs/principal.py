@@ -0,0 +1,66 @@
+import logging
+from typing import Iterable, Optional, Tuple
+
+from fastapi import Depends
+
+from db.connect import get_redis
+from libs.cache import VersionedCache
+from schemas.auth import Principal
+from utils.service_config import settings
+
+
+class PrincipalCache:
+    """Short-TTL shared cache of authenticated principals.
+
+    Principals are stored per user id (versioned, see VersionedCache) and found by
+    login through a separate index key, so writers only need the user id to invalidate.
+    """
+
+    def __init__(self, redis_client, ttl: int):
+        self.redis = redis_client
+        self.ttl = ttl
+        self.cache = VersionedCache(redis_client, namespace="principal", ttl=ttl)
+
+    @staticmethod
+    def login_key(login: str) -> str:
+        return f"principal:login:{login}"
+
+    async def get(self, login: str) -> Tuple[int, Optional[Principal]]:
+        """The cached principal and the version read before it; -1 while the login is not indexed."""
+        try:
+            user_id = await self.redis.get(self.login_key(login))
+        except Exception as e:
+            logging.error(f"Exception during reading principal cache: {e}")
+            user_id = None
+
+        if user_id is None:
+            self.cache.stats.misses += 1
+            return -1, None
+
+        version, payload = await self.cache.get(int(user_id))
+        return version, Principal.parse_raw(payload) if payload is not None else None
+
+    async def set(self, principal: Principal, version: int) -> None:
+        """Index the login and store the principal under the `version` get returned before it was loaded.
+
+        A principal loaded before its login was indexed is not stored; the next request
+        reads its version first.
+        """
+        principal.version = version
+        try:
+            await self.redis.set(self.login_key(principal.email), principal.id, ex=self.ttl)
+        except Exception as e:
+            logging.error(f"Exception during writing principal cache: {e}")
+            principal.version = -1
+            return
+        await self.cache.set(principal.id, principal.version, principal.json().encode())
+
+    async def invalidate(self, user_id: int) -> None:
+        await self.cache.invalidate(user_id)
+
+    async def invalidate_many(self, user_ids: Iterable[int]) -> None:
+        await self.cache.invalidate_many(user_ids)
+
+
+def get_principal_cache(redis_client=Depends(get_redis)) -> PrincipalCache:
+    return PrincipalCache(redis_client, ttl=settings.PRINCIPAL_CACHE_TTL)
@@ -0,0 +1,73 @@
+import logging
+from enum import IntFlag
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.connect import get_redis, get_session
+from db.models import User as UserFromModels
+from repository.users import UserRepository
+from schemas.auth import Principal
+from utils.service_config import settings
+
+
+class CompanyRole(IntFlag):
+    NONE = 0
+    OWNER = 1
+    ADMIN = 2
+    MEMBER = 4
+
+
+class CompanyRoleIndex:
+    """Answers "which roles does a user have in a company" with one existence query per pair.
+
+    Results are cached as role bitmasks in a Redis hash per user and principal version,
+    so invalidating the principal (PrincipalCache.invalidate) also drops its roles.
+    """
+
+    def __init__(self, redis_client, user_repo: UserRepository, ttl: int):
+        self.redis = redis_client
+        self.user_repo = user_repo
+        self.ttl = ttl
+
+    @staticmethod
+    def roles_key(principal: Principal) -> str:
+        return f"roles:{principal.id}:v{principal.version}"
+
+    async def get_role(self, principal: Principal, company_id: int) -> CompanyRole:
+        cacheable = principal.version >= 0
+        if cacheable:
+            try:
+                cached_role = await self.redis.hget(self.roles_key(principal), company_id)
+                if cached_role is not None:
+                    return CompanyRole(int(cached_role))
+            except Exception as e:
+                logging.error(f"Exception during reading company roles cache: {e}")
+                cacheable = False
+
+        is_owner, is_admin, is_member = await self.user_repo.get_company_role(user_id=principal.id,
+                                                                            company_id=company_id)
+        role = CompanyRole.NONE
+        if is_owner:
+            role |= CompanyRole.OWNER
+        if is_admin:
+            role |= CompanyRole.ADMIN
+        if is_member:
+            role |= CompanyRole.MEMBER
+
+        if cacheable:
+            try:
+                await self.redis.hset(self.roles_key(principal), company_id, int(role))
+                await self.redis.expire(self.roles_key(principal), self.ttl)
+            except Exception as e:
+                logging.error(f"Exception during writing company roles cache: {e}")
+        return role
+
+    async def has_role(self, principal: Principal, company_id: int, roles: CompanyRole) -> bool:
+        return bool(await self.get_role(principal, company_id) & roles)
+
+
+def get_company_role_index(async_session: AsyncSession = Depends(get_session),
+                           redis_client=Depends(get_redis)) -> CompanyRoleIndex:
+    return CompanyRoleIndex(redis_client, UserRepository(async_session, UserFromModels),
+                            ttl=settings.PRINCIPAL_CACHE_TTL)
@@ -0,0 +1,63 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from libs.cache import cache_stats
+from utils.service_config import settings
+
+
+class VerifiedTokenCache:
+    """In-process LRU of verified bearer tokens.
+
+    Entries are keyed by the SHA-256 digest of the raw token, so the cache never holds
+    usable credentials, and live until the token's `exp` (capped at `max_ttl` seconds).
+    Only successfully verified payloads are stored.
+    """
+
+    def __init__(self, maxsize: int, max_ttl: int):
+        self.maxsize = maxsize
+        self.max_ttl = max_ttl
+        self.stats = cache_stats["verified_token"]
+        self._entries: OrderedDict[bytes, Tuple[Dict, str, float]] = OrderedDict()
+
+    @staticmethod
+    def digest(credentials: str) -> bytes:
+        return hashlib.sha256(credentials.encode()).digest()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, credentials: str) -> Optional[Tuple[Dict, str]]:
+        key = self.digest(credentials)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        payload, token_mark, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return payload, token_mark
+
+    def set(self, credentials: str, payload: Dict, token_mark: str) -> None:
+        if self.maxsize <= 0 or "exp" not in payload:
+            return
+        expires_at = min(float(payload["exp"]), time.time() + self.max_ttl)
+        key = self.digest(credentials)
+        self._entries[key] = (payload, token_mark, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+verified_tokens = VerifiedTokenCache(maxsize=settings.TOKEN_CACHE_SIZE, max_ttl=settings.TOKEN_CACHE_TTL)
@@ -1,9 +1,10 @@
 import jwt as pyjwt
-from typing import Dict, Union
+from typing import Dict, Optional, Type, Union
 from jose import JWTError, jwt as jose_jwt
 from abc import ABC,abstractmethod
 
 from utils.service_config import settings
+from .jwks import JWKSError, JWKSKeyStore, jwks_store
 
 
 class IToken(ABC):
@@ -13,13 +14,13 @@ class IToken(ABC):
         self.config = settings
 
     @abstractmethod
-    def verify(self):
+    async def verify(self):
         pass
 
 
 class VerifyCustomToken(IToken):
 
-    def verify(self) -> Dict[str, Union[str, dict]]:
+    async def verify(self) -> Dict[str, Union[str, dict]]:
         try:
             payload = jose_jwt.decode(self.token.credentials, self.config.SECRET_KEY, algorithms=[self.config.ALGORITHM])
             return {"payload": payload, "mark": "custom_token_mark"}
@@ -30,18 +31,16 @@ class VerifyCustomToken(IToken):
 
 class VerifyAuth0Token(IToken):
 
-    def __init__(self, token):
+    def __init__(self, token, key_store: JWKSKeyStore = jwks_store):
         super().__init__(token)
-        jwks_url = f'https://{settings.DOMAIN}/.well-known/jwks.json'
-        self.jwks_client = pyjwt.PyJWKClient(jwks_url)
+        self.key_store = key_store
 
-    def verify(self) -> dict:
+    async def verify(self) -> dict:
         try:
-            self.signing_key = self.jwks_client.get_signing_key_from_jwt(
-                self.token.credentials
-            ).key
+            kid = pyjwt.get_unverified_header(self.token.credentials).get("kid")
+            self.signing_key = await self.key_store.get_signing_key(kid)
 
-        except pyjwt.exceptions.PyJWKClientError as error:
+        except JWKSError as error:
             return {"status": "error", "msg": error.__str__()}
         except pyjwt.exceptions.DecodeError as error:
             return {"status": "error", "msg": error.__str__()}
@@ -57,4 +56,24 @@ class VerifyAuth0Token(IToken):
         except Exception as e:
             return {"status": "error", "message": str(e)}
 
-        return {"payload": payload, "mark": "auth0_mark"}
\ No newline at end of file
+        return {"payload": payload, "mark": "auth0_mark"}
+
+
+def select_verifier(token) -> Optional[Type[IToken]]:
+    """Pick the verifier from the unverified header and issuer instead of trial decoding.
+
+    Custom tokens are signed with settings.ALGORITHM and carry no key id; Auth0 tokens
+    use one of settings.ALGORITHMS, name their signing key and are issued by settings.ISSUER.
+    """
+    try:
+        header = pyjwt.get_unverified_header(token.credentials)
+        if header.get("alg") == settings.ALGORITHM and "kid" not in header:
+            return VerifyCustomToken
+
+        if header.get("alg") in settings.ALGORITHMS and header.get("kid"):
+            issuer = pyjwt.decode(token.credentials, options={"verify_signature": False}).get("iss")
+            if issuer == settings.ISSUER:
+                return VerifyAuth0Token
+    except pyjwt.exceptions.PyJWTError:
+        pass
+    return None
@@ -1,12 +1,23 @@
 import logging
+import time
+import uuid
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
-from core.log_config import LoggingConfig
-from routers import users, auth, companies, invites, join_requests, user_action, quizzes, questions, answers
-from db.connect import init_postgres_db, init_redis_db
+from core.log_config import LoggingConfig, request_id_var
+from routers import users, auth, companies, invites, join_requests, user_action, quizzes, questions, answers, search, \
+    attempts, leaderboards, attempt_stats
+from db.connect import init_postgres_db, init_redis_db, close_postgres_db, engine
+from db.pool import get_pool_metrics
+from libs.answer_key import local_answer_keys
+from libs.attempt_writer import attempt_writer
+from libs.cache import cache_stats
+from libs.metrics import RequestStats, metrics_registry, request_stats_var
+from libs.token_cache import verified_tokens
 from utils.service_config import settings
+from utils.service_pagination import InvalidCursorError, invalid_cursor_handler
 
 app = FastAPI()
 
@@ -24,6 +35,39 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_exception_handler(InvalidCursorError, invalid_cursor_handler)
+
+
+@app.middleware("http")
+async def bind_request_id(request: Request, call_next):
+    request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+    token = request_id_var.set(request_id)
+    try:
+        response = await call_next(request)
+    finally:
+        request_id_var.reset(token)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    request_stats = RequestStats()
+    token = request_stats_var.set(request_stats)
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        request_stats_var.reset(token)
+    latency = time.perf_counter() - start
+
+    # label by route template, e.g. /companies/{company_id}/members, never by raw path
+    route = request.scope.get("route")
+    metrics_registry.observe(request.method, getattr(route, "path", "unmatched"), latency, request_stats)
+    response.headers["Server-Timing"] = request_stats.server_timing(latency)
+    return response
+
+
 app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(companies.router)
@@ -33,12 +77,25 @@ app.include_router(user_action.router)
 app.include_router(quizzes.router)
 app.include_router(questions.router)
 app.include_router(answers.router)
+app.include_router(attempts.router)
+app.include_router(leaderboards.router)
+app.include_router(attempt_stats.router)
+app.include_router(search.router)
 
 
 @app.on_event("startup")
 async def on_startup():
     await init_postgres_db()
     await init_redis_db()
+    if settings.ATTEMPTS_WRITE_BEHIND:
+        attempt_writer.start()
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    await attempt_writer.stop()
+    await close_postgres_db()
+    LoggingConfig.shutdown()
 
 
 @app.get("/", tags=["healthcheck"])
@@ -51,6 +108,37 @@ async def health_check():
     }
 
 
+@app.get("/pool-metrics", tags=["healthcheck"])
+async def pool_metrics():
+    return {
+        "status_code": 200,
+        "detail": "ok",
+        "result": get_pool_metrics(engine)
+    }
+
+
+@app.get("/cache-metrics", tags=["healthcheck"])
+async def cache_metrics():
+    result = {
+        namespace: {"hits": stats.hits, "misses": stats.misses, "evictions": stats.evictions,
+                    "hit_rate": round(stats.hit_rate, 4)}
+        for namespace, stats in cache_stats.items()
+    }
+    result.setdefault("verified_token", {})["size"] = len(verified_tokens)
+    result.setdefault("answer_key", {})["size"] = len(local_answer_keys)
+    return {
+        "status_code": 200,
+        "detail": "ok",
+        "result": result
+    }
+
+
+@app.get("/metrics", tags=["healthcheck"], response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(metrics_registry.render() + attempt_writer.render(),
+                             media_type="text/plain; version=0.0.4")
+
+
 if __name__ == "__main__":
     config = uvicorn.Config("main:app", host=settings.APP_HOST, port=settings.APP_PORT, reload=True)
     server = uvicorn.Server(config)
@@ -1,3 +1,8 @@
+from typing import Tuple
+
+from sqlalchemy import select
+
+from db.models import Answer as AnswerFromModel, Question as QuestionFromModel, Quiz as QuizFromModel
 from .base import BaseEntitiesRepository, BaseEntityRepository
 
 
@@ -6,5 +11,11 @@ class AnswersRepository(BaseEntitiesRepository):
 
 
 class AnswerRepository(BaseEntityRepository):
-    pass
+
+    async def get_owner(self, answer_id: int) -> Tuple[int, int, int]:
+        """(question_id, quiz_id, company_id) the answer belongs to."""
+        stmt = select(QuestionFromModel.id, QuizFromModel.id, QuizFromModel.company_id). \
+            join(AnswerFromModel.question).join(QuestionFromModel.quiz).where(AnswerFromModel.id == answer_id)
+        res = await self.async_session.execute(stmt)
+        return tuple(res.one())
 
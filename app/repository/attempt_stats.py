@@ -0,0 +1,162 @@
+import asyncio
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Float, and_, case, cast, delete, func, not_, or_, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+
+from constants import QUIZ_PASS_SCORE
+from db.connect import async_session_factory
+from db.models import QuizAttempt as QuizAttemptFromModels, QuizAttemptStats as QuizAttemptStatsFromModels
+from utils.service_pagination import decode_id_cursor, encode_id_cursor
+from .base import BaseEntityRepository
+
+ALL = 0
+StatsKey = Tuple[int, int, int]
+
+
+def rollup_keys(user_id: int, company_id: int, quiz_id: int) -> Tuple[StatsKey, ...]:
+    return ((user_id, company_id, quiz_id), (user_id, ALL, ALL), (user_id, company_id, ALL),
+            (ALL, company_id, quiz_id), (ALL, company_id, ALL))
+
+
+class AttemptStatsRepository(BaseEntityRepository):
+    next_cursor: Optional[str] = None
+
+    @staticmethod
+    def build_increments(attempts: Iterable) -> List[dict]:
+        """Sum stored attempts per stats row, in key order so concurrent upserts lock rows alike."""
+        increments: Dict[StatsKey, list] = {}
+        for attempt in attempts:
+            score = attempt.correct / attempt.total if attempt.total else 0.0
+            for key in rollup_keys(attempt.user_id, attempt.company_id, attempt.quiz_id):
+                increment = increments.get(key)
+                if increment is None:
+                    increment = increments[key] = [0, 0.0, 0.0, 0, attempt.created]
+                increment[0] += 1
+                increment[1] += score
+                increment[2] += score * score
+                increment[3] += score >= QUIZ_PASS_SCORE
+                increment[4] = max(increment[4], attempt.created)
+        return [dict(user_id=user_id, company_id=company_id, quiz_id=quiz_id, attempts=attempts,
+                     score_sum=score_sum, score_sumsq=score_sumsq, passed=passed, last_attempt=last_attempt)
+                for (user_id, company_id, quiz_id), (attempts, score_sum, score_sumsq, passed, last_attempt)
+                in sorted(increments.items())]
+
+    async def add(self, attempts: Iterable) -> None:
+        """Fold attempts into the running aggregates with one upsert; the caller commits."""
+        increments = self.build_increments(attempts)
+        if not increments:
+            return
+        stmt = insert(self.entity).values(increments)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[self.entity.user_id, self.entity.company_id, self.entity.quiz_id],
+            set_={
+                "attempts": self.entity.attempts + stmt.excluded.attempts,
+                "score_sum": self.entity.score_sum + stmt.excluded.score_sum,
+                "score_sumsq": self.entity.score_sumsq + stmt.excluded.score_sumsq,
+                "passed": self.entity.passed + stmt.excluded.passed,
+                "last_attempt": func.greatest(self.entity.last_attempt, stmt.excluded.last_attempt),
+            })
+        await self.async_session.execute(stmt)
+
+    async def get_stats(self, user_id: int = ALL, company_id: int = ALL,
+                        quiz_id: int = ALL) -> Optional[QuizAttemptStatsFromModels]:
+        stmt = select(self.entity).where(self.entity.user_id == user_id, self.entity.company_id == company_id,
+                                         self.entity.quiz_id == quiz_id)
+        res = await self.async_session.execute(stmt)
+        return res.scalars().one_or_none()
+
+    async def get_member_stats(self, company_id: int, page: int, page_size: int,
+                               cursor: Optional[str] = None) -> List[QuizAttemptStatsFromModels]:
+        """One page of per-member rows ordered by user_id; a cursor starts right after its user.
+
+        Keyset pages walk ix_quiz_attempt_stats_company_id_quiz_id_user_id from the cursor,
+        so their cost does not grow with depth. `next_cursor` is set after a full page.
+        """
+        stmt = select(self.entity).where(self.entity.company_id == company_id, self.entity.quiz_id == ALL,
+                                         self.entity.user_id != ALL). \
+            order_by(self.entity.user_id).limit(page_size)
+        if cursor:
+            stmt = stmt.where(self.entity.user_id > decode_id_cursor(cursor))
+        else:
+            stmt = stmt.offset((page - 1) * page_size)
+        res = await self.async_session.execute(stmt)
+        member_stats = res.scalars().all()
+        last = member_stats[-1] if member_stats and len(member_stats) == page_size else None
+        self.next_cursor = encode_id_cursor(last.user_id) if last is not None else None
+        return member_stats
+
+    @staticmethod
+    def recompute_query(*where):
+        attempts = QuizAttemptFromModels
+        score = func.coalesce(cast(attempts.correct, Float) / cast(func.nullif(attempts.total, 0), Float), 0.0)
+        return select(
+            func.coalesce(attempts.user_id, ALL).label("user_id"),
+            func.coalesce(attempts.company_id, ALL).label("company_id"),
+            func.coalesce(attempts.quiz_id, ALL).label("quiz_id"), func.count().label("attempts"),
+            func.sum(score).label("score_sum"), func.sum(score * score).label("score_sumsq"),
+            func.count().filter(score >= QUIZ_PASS_SCORE).label("passed"),
+            func.max(attempts.created).label("last_attempt")
+        ).where(*where).group_by(func.grouping_sets(
+            tuple_(attempts.user_id, attempts.company_id, attempts.quiz_id), tuple_(attempts.user_id),
+            tuple_(attempts.user_id, attempts.company_id), tuple_(attempts.company_id, attempts.quiz_id),
+            tuple_(attempts.company_id)
+        ))
+
+    async def subtract(self, *where) -> None:
+        """Take the attempts matching `where` out of the aggregates before they are deleted.
+
+        Runs in the transaction that deletes them, after the parent row is locked so that
+        no attempt of it is stored meanwhile; the caller commits. Rows left without
+        attempts are removed, and last_attempt is looked up again among the attempts kept.
+        """
+        stats, attempts = self.entity, QuizAttemptFromModels
+        removed = self.recompute_query(*where).subquery()
+        last_kept = select(func.max(attempts.created)).where(
+            not_(and_(*where)),
+            or_(stats.user_id == ALL, attempts.user_id == stats.user_id),
+            or_(stats.company_id == ALL, attempts.company_id == stats.company_id),
+            or_(stats.quiz_id == ALL, attempts.quiz_id == stats.quiz_id)
+        ).scalar_subquery()
+        stmt = update(stats).where(
+            stats.user_id == removed.c.user_id, stats.company_id == removed.c.company_id,
+            stats.quiz_id == removed.c.quiz_id
+        ).values(
+            attempts=stats.attempts - removed.c.attempts,
+            score_sum=stats.score_sum - removed.c.score_sum,
+            score_sumsq=stats.score_sumsq - removed.c.score_sumsq,
+            passed=stats.passed - removed.c.passed,
+            last_attempt=case((stats.attempts > removed.c.attempts, last_kept), else_=stats.last_attempt)
+        ).returning(stats.user_id, stats.company_id, stats.quiz_id, stats.attempts)
+        res = await self.async_session.execute(stmt)
+        emptied = [(user_id, company_id, quiz_id) for user_id, company_id, quiz_id, left in res.all() if left <= 0]
+        if emptied:
+            await self.async_session.execute(
+                delete(stats).where(tuple_(stats.user_id, stats.company_id, stats.quiz_id).in_(emptied)))
+
+    async def reconcile(self) -> int:
+        """Replace every aggregate with one recomputed from quiz_attempts, in one transaction.
+
+        The table lock makes concurrent upserts wait for the commit, so an attempt stored
+        meanwhile is either part of the recomputation or added on top of it, never lost
+        with the deleted rows.
+        """
+        columns = ["user_id", "company_id", "quiz_id", "attempts", "score_sum", "score_sumsq", "passed",
+                   "last_attempt"]
+        await self.async_session.execute(text(f"LOCK TABLE {self.entity.__tablename__} IN SHARE ROW EXCLUSIVE MODE"))
+        await self.async_session.execute(delete(self.entity))
+        res = await self.async_session.execute(insert(self.entity).from_select(columns, self.recompute_query()))
+        await self.async_session.commit()
+        return res.rowcount
+
+
+async def reconcile_attempt_stats() -> None:
+    async with async_session_factory() as session:
+        start = time.perf_counter()
+        rows = await AttemptStatsRepository(session, QuizAttemptStatsFromModels).reconcile()
+        print(f"Recomputed {rows} quiz attempt stats rows in {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    asyncio.run(reconcile_attempt_stats())
@@ -0,0 +1,44 @@
+from datetime import datetime
+from typing import List, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from db.models import QuizAttemptStats as QuizAttemptStatsFromModels
+from libs.answer_key import GradedAttempt
+from .attempt_stats import AttemptStatsRepository
+from .base import BaseEntityRepository
+
+
+class AttemptRepository(BaseEntityRepository):
+
+    @staticmethod
+    def build_row(attempt_key: UUID, quiz_id: int, company_id: int, user_id: int, graded: GradedAttempt,
+                  created: datetime) -> dict:
+        return dict(attempt_key=attempt_key, quiz_id=quiz_id, company_id=company_id, user_id=user_id,
+                    correct=graded.correct, total=graded.total, question_ids=graded.question_ids,
+                    results=graded.results, answer_ids=graded.answer_ids, created=created)
+
+    async def create_many(self, rows: List[dict]) -> List[UUID]:
+        """Insert attempts in one statement, skipping the ones whose attempt_key is already stored.
+
+        The running aggregates of the stored attempts are updated in the same transaction.
+        """
+        entity = self.entity
+        stmt = insert(entity).values(rows).on_conflict_do_nothing(index_elements=[entity.attempt_key]). \
+            returning(entity.attempt_key, entity.user_id, entity.company_id, entity.quiz_id, entity.correct,
+                      entity.total, entity.created)
+        res = await self.async_session.execute(stmt)
+        stored = res.all()
+        await AttemptStatsRepository(self.async_session, QuizAttemptStatsFromModels).add(stored)
+        await self.async_session.commit()
+        return [attempt.attempt_key for attempt in stored]
+
+    async def get_attempt_matrix(self, quiz_id: int) -> Tuple[Sequence[List[int]], Sequence[List[bool]],
+                                                                Sequence[List[int]]]:
+        """The question_ids, results and answer_ids columns of every attempt of a quiz, in one query."""
+        stmt = select(self.entity.question_ids, self.entity.results, self.entity.answer_ids). \
+            where(self.entity.quiz_id == quiz_id)
+        res = await self.async_session.execute(stmt)
+        return tuple(zip(*res.all())) or ((), (), ())
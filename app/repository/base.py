@@ -1,32 +1,53 @@
 from pydantic import BaseModel as BaseModelPydantic
-from typing import List, Optional
+from typing import Dict, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, tuple_, update, delete, literal, Table
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError, NoResultFound
 from sqlalchemy.orm import joinedload
 
 from db.connect import Base
-from db.models import Base as BaseFromModels, Company as CompanyFromModels, User as UserFromModels, \
-    StatusActionForResponse, Action as ActionFromModels
+from db.models import Base as BaseFromModels, User as UserFromModels, \
+    StatusActionForResponse, StatusActionWithSent, TypeAction, Action as ActionFromModels, member_company_association
 from schemas.action import ActionRequestModel
+from utils.service_pagination import decode_cursor, encode_cursor
 
 
 class Paginateable:
+    """Page (LIMIT/OFFSET) and keyset pagination over `(created, id)`.
+
+    Both modes use the same stable ordering. When a cursor is given the page starts
+    right after the row it points to, so the cost per page does not grow with depth.
+    `next_cursor` is set after every fetch_page that returned a full page.
+    """
+    next_cursor: Optional[str] = None
 
     def __init__(self, async_session: AsyncSession):
         self.async_session = async_session
 
     @staticmethod
-    def apply_pagination(stmt, page: int, page_size: int):
+    def apply_pagination(stmt, page: int, page_size: int, entity: Base, cursor: Optional[str] = None):
+        stmt = stmt.order_by(entity.created, entity.id).limit(page_size)
+        if cursor:
+            created, entity_id = decode_cursor(cursor)
+            return stmt.where(tuple_(entity.created, entity.id) > tuple_(created, entity_id))
         skip = (page - 1) * page_size
-        return stmt.limit(page_size).offset(skip)
+        return stmt.offset(skip)
 
-    async def paginate_query(self, entity: Base, page: int, page_size: int) -> List[BaseFromModels]:
-        stmt = select(entity)
-        stmt_with_pagination = self.apply_pagination(stmt, page, page_size)
+    async def fetch_page(self, stmt, entity: Base, page: int, page_size: int,
+                         cursor: Optional[str] = None) -> List[BaseFromModels]:
+        stmt_with_pagination = self.apply_pagination(stmt, page, page_size, entity, cursor)
         res = await self.async_session.execute(stmt_with_pagination)
         entities = res.scalars().all()
+        last = entities[-1] if entities and len(entities) == page_size else None
+        self.next_cursor = encode_cursor(last.created, last.id) if last is not None else None
         return entities
 
+    async def paginate_query(self, entity: Base, page: int, page_size: int,
+                             cursor: Optional[str] = None) -> List[BaseFromModels]:
+        stmt = select(entity)
+        return await self.fetch_page(stmt, entity, page, page_size, cursor)
+
 
 class BaseEntitiesRepository(Paginateable):
 
@@ -74,19 +95,33 @@ class BaseEntityRepository:
             await self.async_session.delete(entity)
             await self.async_session.commit()
 
+    async def add_membership(self, association: Table, company_id: int, user_id: int) -> None:
+        """Insert one (user, company) row; an existing row is left as is."""
+        stmt = insert(association).values(user_id=user_id, company_id=company_id).on_conflict_do_nothing()
+        try:
+            await self.async_session.execute(stmt)
+        except IntegrityError:
+            await self.async_session.rollback()
+            raise NoResultFound(f"No company with id {company_id} or user with id {user_id}")
+
+    async def remove_membership(self, association: Table, company_id: int, user_id: int) -> None:
+        stmt = delete(association).where((association.c.user_id == user_id) & (association.c.company_id == company_id))
+        res = await self.async_session.execute(stmt)
+        if res.rowcount == 0:
+            raise NoResultFound(f"User with id {user_id} has no such role in company with id {company_id}")
+
     async def add_member(self, company_id: int, action: ActionRequestModel) -> None:
-        stmt_1 = select(CompanyFromModels).where(CompanyFromModels.id == company_id)
-        res = await self.async_session.execute(stmt_1)
-        company = res.scalars().one()
+        await self.add_membership(member_company_association, company_id, action.recipient_id)
 
-        member_id = action.recipient_id
-        stmt_2 = select(UserFromModels).where(UserFromModels.id == member_id).options(
-            joinedload(UserFromModels.member_of_companies),
+    async def get_action_with_load_fields(self, action: ActionFromModels):
+        stmt = select(ActionFromModels).where(ActionFromModels.id == action.id). \
+            options(
+            joinedload(ActionFromModels.sender),
+            joinedload(ActionFromModels.company)
         )
-        res = await self.async_session.execute(stmt_2)
-        member = res.scalars().unique().one()
-
-        member.member_of_companies.append(company)
+        res = await self.async_session.execute(stmt)
+        action_with_loading_fields = res.scalars().one()
+        return action_with_loading_fields
 
     async def response(self, action_id: int, body: StatusActionForResponse, company_id: int) -> ActionFromModels:
         stmt = select(self.entity).where(self.entity.id == action_id)
@@ -101,11 +136,40 @@ class BaseEntityRepository:
             await self.async_session.refresh(action)
         return action
 
+    async def respond_many(self, action_ids: List[int], body: StatusActionForResponse, company_id: int,
+                           type_action: TypeAction) -> Dict[int, int]:
+        """Answer the pending actions of `type_action` among `action_ids` in the company.
+
+        Statuses change in one UPDATE ... RETURNING; on acceptance the recipients are added
+        by one INSERT ... SELECT that skips existing memberships. Returns
+        {action_id: recipient_id} of the actions that were answered.
+        """
+        stmt = update(ActionFromModels).where(
+            ActionFromModels.id.in_(action_ids) &
+            (ActionFromModels.company_id == company_id) &
+            (ActionFromModels.type_action == type_action) &
+            (ActionFromModels.status_action == StatusActionWithSent.SENT)
+        ).values(status_action=StatusActionWithSent(body.value)). \
+            returning(ActionFromModels.id, ActionFromModels.recipient_id). \
+            execution_options(synchronize_session=False)
+        res = await self.async_session.execute(stmt)
+        answered = dict(res.all())
+
+        if answered and body == StatusActionForResponse.ACCEPTED:
+            new_members = select(UserFromModels.id, literal(company_id)). \
+                where(UserFromModels.id.in_(set(answered.values())))
+            await self.async_session.execute(
+                insert(member_company_association).from_select(["user_id", "company_id"], new_members).
+                on_conflict_do_nothing())
+
+        await self.async_session.commit()
+        return answered
+
     async def get_entity_with_loading_field(self, entity: BaseFromModels, entity_id: int,
                                             *fields_to_load: str) -> BaseFromModels:
         stmt = select(entity).where(entity.id == entity_id)
         for field in fields_to_load:
-            stmt = stmt.options(joinedload(field))
+            stmt = stmt.options(joinedload(getattr(entity, field)))
 
         res = await self.async_session.execute(stmt)
         entity_res = res.scalars().first()
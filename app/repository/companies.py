@@ -1,19 +1,31 @@
-from typing import List
+from typing import List, Optional
 
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload, joinedload
+from sqlalchemy import delete, select, func
 
-from db.models import Company as CompanyFromModels, User as UserFromModels, Base as BaseFromModelDB
+from db.models import Company as CompanyFromModels, User as UserFromModels, Base as BaseFromModelDB, \
+    QuizAttempt as QuizAttemptFromModels, QuizAttemptStats as QuizAttemptStatsFromModels, \
+    member_company_association, admin_company_association
+from repository.attempt_stats import AttemptStatsRepository
 from repository.base import BaseEntitiesRepository, BaseEntityRepository, Paginateable
 from schemas.companies import CompanyRequestModel
 
 
 class CompaniesRepository(BaseEntitiesRepository):
 
-    async def paginate_query(self, entity: CompanyFromModels, page: int, page_size: int) -> List[CompanyFromModels]:
-        companies = await super().paginate_query(entity, page, page_size)
-        visible_companies = [company for company in companies if company.visible]
-        return visible_companies
+    @staticmethod
+    def visible_filter():
+        # matches the predicate of the partial index ix_company_visible_created_id
+        return CompanyFromModels.visible == True  # noqa: E712
+
+    async def paginate_query(self, entity: CompanyFromModels, page: int, page_size: int,
+                             cursor: Optional[str] = None) -> List[CompanyFromModels]:
+        stmt = select(entity).where(self.visible_filter())
+        return await self.fetch_page(stmt, entity, page, page_size, cursor)
+
+    async def count_visible(self) -> int:
+        stmt = select(func.count()).select_from(CompanyFromModels).where(self.visible_filter())
+        res = await self.async_session.execute(stmt)
+        return res.scalar_one()
 
 
 class CompanyRepository(BaseEntityRepository, Paginateable):
@@ -28,57 +40,48 @@ class CompanyRepository(BaseEntityRepository, Paginateable):
             owner_id=user.id
         )
 
-    async def delete_member(self, company_id: int, member_id: int) -> None:
-        stmt = select(self.entity).where(self.entity.id == company_id).options(selectinload(self.entity.members))
+    async def delete(self, entity_id: int) -> List[int]:
+        """Delete the company and return the ids of its owner, admins and members, whose roles it removed.
+
+        Memberships, actions and the quiz graph go with it through ON DELETE CASCADE, so
+        no row of the company is loaded. The company row is locked first: adding a member
+        takes a key share lock on it, so nobody joins between reading the ids and the delete,
+        and storing an attempt does too, so the attempts taken out of the stats are all there are.
+        """
+        stmt = select(CompanyFromModels.owner_id).where(CompanyFromModels.id == entity_id).with_for_update()
         res = await self.async_session.execute(stmt)
-        company = res.scalars().one()
+        owner_id = res.scalar_one()
 
-        stmt_2 = select(UserFromModels).where(UserFromModels.id == member_id)
-        res = await self.async_session.execute(stmt_2)
-        member = res.scalars().one()
+        stmt = select(member_company_association.c.user_id). \
+            where(member_company_association.c.company_id == entity_id). \
+            union(select(admin_company_association.c.user_id).
+                  where(admin_company_association.c.company_id == entity_id))
+        res = await self.async_session.execute(stmt)
+        user_ids = set(res.scalars().all())
+        if owner_id is not None:
+            user_ids.add(owner_id)
 
-        if member in company.members:
-            company.members.remove(member)
+        await AttemptStatsRepository(self.async_session, QuizAttemptStatsFromModels). \
+            subtract(QuizAttemptFromModels.company_id == entity_id)
+        await self.async_session.execute(delete(CompanyFromModels).where(CompanyFromModels.id == entity_id))
+        await self.async_session.commit()
+        return sorted(user_ids)
 
+    async def delete_member(self, company_id: int, member_id: int) -> None:
+        await self.remove_membership(member_company_association, company_id, member_id)
         await self.async_session.commit()
-        await self.async_session.refresh(company)
 
-    async def paginate_query(self, company_id: int, page: int, page_size: int, join_field: str) -> List[UserFromModels]:
+    async def paginate_query(self, company_id: int, page: int, page_size: int, join_field: str,
+                             cursor: Optional[str] = None) -> List[UserFromModels]:
         join_entity_field = self.get_join_entity_field(join_field)
         stmt = select(UserFromModels).join(UserFromModels, join_entity_field). \
             where(CompanyFromModels.id == company_id)
-        stmt_with_pagination = self.apply_pagination(stmt, page, page_size)
-        res = await self.async_session.execute(stmt_with_pagination)
-        entities = res.scalars().all()
-        return entities
+        return await self.fetch_page(stmt, UserFromModels, page, page_size, cursor)
 
     async def assign_admin(self, company_id: int, user_id: int) -> None:
-        stmt_1 = select(CompanyFromModels).where(CompanyFromModels.id == company_id)
-        res = await self.async_session.execute(stmt_1)
-        company = res.scalars().one()
-
-        stmt_2 = select(UserFromModels).where(UserFromModels.id == user_id).options(
-            joinedload(UserFromModels.admin_of_companies),
-        )
-        res = await self.async_session.execute(stmt_2)
-        admin = res.scalars().unique().one()
-
-        admin.admin_of_companies.append(company)
-
+        await self.add_membership(admin_company_association, company_id, user_id)
         await self.async_session.commit()
-        await self.async_session.refresh(admin)
 
     async def delete_admin(self, company_id: int, admin_id: int) -> None:
-        stmt = select(self.entity).where(self.entity.id == company_id).options(selectinload(self.entity.admins))
-        res = await self.async_session.execute(stmt)
-        company = res.scalars().one()
-
-        stmt_2 = select(UserFromModels).where(UserFromModels.id == admin_id)
-        res = await self.async_session.execute(stmt_2)
-        admin = res.scalars().one()
-
-        if admin in company.admins:
-            company.admins.remove(admin)
-
+        await self.remove_membership(admin_company_association, company_id, admin_id)
         await self.async_session.commit()
-        await self.async_session.refresh(company)
@@ -1,35 +1,27 @@
-from typing import List
-from sqlalchemy import select
+from typing import List, Optional
+from sqlalchemy import select, insert, exists
 from sqlalchemy.orm import joinedload
 
-from db.models import User as UserFromModels, Action as ActionFromModels, TypeAction
+from db.models import User as UserFromModels, Action as ActionFromModels, Company as CompanyFromModels, \
+    TypeAction, StatusActionWithSent, member_company_association
 from .base import BaseEntitiesRepository, BaseEntityRepository, Paginateable
-from schemas.action import ActionRequestModel
+from schemas.action import ActionRequestModel, BulkInvitationResponse, InvitationResult
 
 
 class InvitesRepository(BaseEntitiesRepository):
 
-    async def paginate_query(self, user_id: int, page: int, page_size: int) -> List[ActionFromModels]:
+    async def paginate_query(self, user_id: int, page: int, page_size: int,
+                             cursor: Optional[str] = None) -> List[ActionFromModels]:
         stmt = select(self.entity).where((self.entity.type_action == TypeAction.INVITE) &
-                                         (self.entity.recipient_id == user_id)).options(joinedload(self.entity.sender))
-        stmt_with_pagination = self.apply_pagination(stmt, page, page_size)
-        res = await self.async_session.execute(stmt_with_pagination)
-        entities = res.scalars().all()
-        return entities
+                                         (self.entity.recipient_id == user_id)).options(
+                                              joinedload(self.entity.sender),
+                                              joinedload(self.entity.company)
+                                          )
+        return await self.fetch_page(stmt, self.entity, page, page_size, cursor)
 
 
 class InviteRepository(BaseEntityRepository, Paginateable):
 
-    async def get_action_with_load_fields(self, action: ActionFromModels):
-        stmt = select(ActionFromModels).where(ActionFromModels.id == action.id). \
-            options(
-            joinedload(ActionFromModels.sender),
-            joinedload(ActionFromModels.company)
-        )
-        res = await self.async_session.execute(stmt)
-        action_with_loading_fields = res.scalars().one()
-        return action_with_loading_fields
-
     async def create(self, company_id: int, body: ActionRequestModel, user: UserFromModels) -> ActionFromModels:
         action = await super().create(
             type_action=TypeAction.INVITE,
@@ -40,10 +32,50 @@ class InviteRepository(BaseEntityRepository, Paginateable):
 
         return await self.get_action_with_load_fields(action=action)
 
-    async def paginate_query(self, company_id: int, page: int, page_size: int) -> List[UserFromModels]:
+    async def create_many(self, company_id: int, recipient_ids: List[int],
+                          user: UserFromModels) -> List[BulkInvitationResponse]:
+        """Invite every recipient that exists, is not in the company and has no pending invite.
+
+        Recipients are classified in one query and the invitations are inserted in one
+        multi-row INSERT, whatever the number of recipients.
+        """
+        recipient_ids = list(dict.fromkeys(recipient_ids))
+        is_member = exists().where((member_company_association.c.user_id == UserFromModels.id) &
+                                   (member_company_association.c.company_id == company_id)) | \
+            exists().where((CompanyFromModels.id == company_id) & (CompanyFromModels.owner_id == UserFromModels.id))
+        is_invited = exists().where((self.entity.type_action == TypeAction.INVITE) &
+                                    (self.entity.company_id == company_id) &
+                                    (self.entity.recipient_id == UserFromModels.id) &
+                                    (self.entity.status_action == StatusActionWithSent.SENT))
+        stmt = select(UserFromModels.id, is_member, is_invited).where(UserFromModels.id.in_(recipient_ids))
+        res = await self.async_session.execute(stmt)
+
+        results = {recipient_id: InvitationResult.NOT_FOUND for recipient_id in recipient_ids}
+        for recipient_id, member, invited in res.all():
+            if member:
+                results[recipient_id] = InvitationResult.ALREADY_MEMBER
+            elif invited:
+                results[recipient_id] = InvitationResult.ALREADY_INVITED
+            else:
+                results[recipient_id] = InvitationResult.INVITED
+
+        to_invite = [recipient_id for recipient_id, result in results.items() if result == InvitationResult.INVITED]
+        invitation_ids = {}
+        if to_invite:
+            stmt = insert(self.entity).values([
+                {"type_action": TypeAction.INVITE, "company_id": company_id, "sender_id": user.id,
+                 "recipient_id": recipient_id} for recipient_id in to_invite
+            ]).returning(self.entity.recipient_id, self.entity.id)
+            res = await self.async_session.execute(stmt)
+            invitation_ids = dict(res.all())
+            await self.async_session.commit()
+
+        return [BulkInvitationResponse(recipient_id=recipient_id, result=result,
+                                       invitation_id=invitation_ids.get(recipient_id))
+                for recipient_id, result in results.items()]
+
+    async def paginate_query(self, company_id: int, page: int, page_size: int,
+                             cursor: Optional[str] = None) -> List[UserFromModels]:
         stmt = select(UserFromModels).join(self.entity, UserFromModels.id == self.entity.recipient_id). \
             where((self.entity.type_action == TypeAction.INVITE) & (self.entity.company_id == company_id))
-        stmt_with_pagination = self.apply_pagination(stmt, page, page_size)
-        res = await self.async_session.execute(stmt_with_pagination)
-        entities = res.scalars().all()
-        return entities
+        return await self.fetch_page(stmt, UserFromModels, page, page_size, cursor)
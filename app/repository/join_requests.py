@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 from sqlalchemy import select
 from sqlalchemy.orm import joinedload
 
@@ -7,7 +7,8 @@ from .base import BaseEntitiesRepository, BaseEntityRepository
 
 
 class JoinRequestsRepository(BaseEntitiesRepository):
-    async def paginate_query(self, user_id: int, page: int, page_size: int) -> List[ActionFromModels]:
+    async def paginate_query(self, user_id: int, page: int, page_size: int,
+                             cursor: Optional[str] = None) -> List[ActionFromModels]:
 
         stmt = select(self.entity).where((self.entity.type_action == TypeAction.JOIN_REQUEST) &
                                          (self.entity.sender_id == user_id)).\
@@ -15,11 +16,7 @@ class JoinRequestsRepository(BaseEntitiesRepository):
                                               joinedload(ActionFromModels.sender),
                                               joinedload(ActionFromModels.company)
                                           )
-        stmt_with_pagination = self.apply_pagination(stmt, page, page_size)
-
-        res = await self.async_session.execute(stmt_with_pagination)
-        entities = res.scalars().all()
-        return entities
+        return await self.fetch_page(stmt, self.entity, page, page_size, cursor)
 
 
 class JoinRequestRepository(BaseEntityRepository):
@@ -30,10 +27,12 @@ class JoinRequestRepository(BaseEntityRepository):
         return company
 
     async def create(self, company_id: int, user: UserFromModels) -> ActionFromModels:
-        return await super().create(
+        action = await super().create(
             type_action=TypeAction.JOIN_REQUEST,
             company_id=company_id,
             sender_id=user.id,
             recipient_id=user.id
         )
 
+        return await self.get_action_with_load_fields(action=action)
+
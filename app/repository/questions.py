@@ -1,39 +1,56 @@
-from db.models import Question as QuestionFromModel, Answer as AnswerFromModel
+from typing import Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from db.models import Question as QuestionFromModel, Answer as AnswerFromModel, Quiz as QuizFromModel
 from schemas.quiz import QuestionRequestModel
-from .answers import AnswerRepository
 from .base import BaseEntitiesRepository, BaseEntityRepository
 
 
-
 class QuestionsRepository(BaseEntitiesRepository):
     pass
 
 
 class QuestionRepository(BaseEntityRepository):
 
-    async def create(self, quiz_id: int, question_body: QuestionRequestModel, answers_repo: AnswerRepository) -> QuestionFromModel:
-        new_answers = []
-        for answer in question_body.answers:
-            new_answers.append(await answers_repo.create(text=answer.text, is_correct=answer.is_correct))
-        return await super().create(
-            text=question_body.text,
-            quiz_id=quiz_id,
-            answers=new_answers
-        )
+    @staticmethod
+    def build(question_body: QuestionRequestModel, **kwargs) -> QuestionFromModel:
+        answers = [AnswerFromModel(text=answer.text, is_correct=answer.is_correct) for answer in question_body.answers]
+        return QuestionFromModel(text=question_body.text, answers=answers, **kwargs)
+
+    async def create(self, quiz_id: int, question_body: QuestionRequestModel) -> QuestionFromModel:
+        new_question = self.build(question_body, quiz_id=quiz_id)
+        self.async_session.add(new_question)
+        await self.async_session.commit()
+        return new_question
+
+    async def get_owner(self, question_id: int) -> Tuple[int, int]:
+        """(quiz_id, company_id) the question belongs to."""
+        stmt = select(QuizFromModel.id, QuizFromModel.company_id).join(QuestionFromModel.quiz). \
+            where(QuestionFromModel.id == question_id)
+        res = await self.async_session.execute(stmt)
+        return tuple(res.one())
+
+    async def get_question_with_answers(self, question_id: int) -> QuestionFromModel:
+        stmt = select(QuestionFromModel).where(QuestionFromModel.id == question_id). \
+            options(selectinload(QuestionFromModel.answers)).execution_options(populate_existing=True)
+        res = await self.async_session.execute(stmt)
+        return res.scalars().one()
 
     async def add_single_answer(self, question_id: int, answer: AnswerFromModel) -> QuestionFromModel:
-        question = await self.get_entity_with_loading_field(self.entity, question_id, "answers")
+        question = await self.get_question_with_answers(question_id)
         question.answers.append(answer)
         await self.async_session.commit()
         await self.async_session.refresh(question)
         return question
 
     async def validate_sum_correct_answ(self, question_id: int) -> bool:
-        question = await self.get_entity_with_loading_field(self.entity, question_id, "answers")
+        question = await self.get_question_with_answers(question_id)
         return sum(answer.is_correct for answer in question.answers) > 1
 
     async def validate_sum_answers(self, question_id: int) -> bool:
-        question = await self.get_entity_with_loading_field(self.entity, question_id, "answers")
+        question = await self.get_question_with_answers(question_id)
         return len(question.answers) > 2
 
 
@@ -1,54 +1,79 @@
-from typing import List
+from typing import List, Optional
 
-from sqlalchemy import select
+from sqlalchemy import delete, select, func
+from sqlalchemy.orm import selectinload
 
-from db.models import Quiz as QuizFromModels, Question as QuestionFromModel
+from db.models import Quiz as QuizFromModels, Question as QuestionFromModel, QuizAttempt as QuizAttemptFromModels, \
+    QuizAttemptStats as QuizAttemptStatsFromModels
 from schemas.quiz import QuizRequestModel
-from .answers import AnswerRepository
+from .attempt_stats import AttemptStatsRepository
 from .base import BaseEntitiesRepository, BaseEntityRepository
 from .questions import QuestionRepository
 
 
 class QuizRepository(BaseEntityRepository):
 
-    async def create(self, quiz_body: QuizRequestModel, company_id: int, answers_repo: AnswerRepository,
-                     question_repo: QuestionRepository) -> QuizFromModels:
-        new_questions = []
-        for question in quiz_body.questions:
-            new_answers = []
-            for answer in question.answers:
-                new_answers.append(await answers_repo.create(text=answer.text, is_correct=answer.is_correct))
-            new_questions.append(await question_repo.create(text=question.text, answers=new_answers))
-        return await super().create(
+    @staticmethod
+    def build(quiz_body: QuizRequestModel, company_id: int) -> QuizFromModels:
+        return QuizFromModels(
             name=quiz_body.name,
             description=quiz_body.description,
             company_id=company_id,
-            questions=new_questions
+            questions=[QuestionRepository.build(question) for question in quiz_body.questions]
         )
 
-    async def get_quiz_with_questions(self, quiz_id: int):
-        quiz_with_load_questions = await self.get_entity_with_loading_field(QuizFromModels, quiz_id, 'questions')
-        quiz_with_load_questions.questions = [
-            await self.get_entity_with_loading_field(QuestionFromModel, question.id, 'answers') for question in
-            quiz_with_load_questions.questions]
-        return quiz_with_load_questions
+    async def create(self, quiz_body: QuizRequestModel, company_id: int) -> QuizFromModels:
+        new_quiz = self.build(quiz_body, company_id)
+        self.async_session.add(new_quiz)
+        await self.async_session.commit()
+        return new_quiz
 
-    async def add_single_question(self, quiz_id: int, question: QuestionFromModel) -> QuizFromModels:
-        quiz = await self.get_quiz_with_questions(quiz_id=quiz_id)
-        quiz.questions.append(question)
+    async def create_many(self, quiz_bodies: List[QuizRequestModel], company_id: int) -> List[QuizFromModels]:
+        new_quizzes = [self.build(quiz_body, company_id) for quiz_body in quiz_bodies]
+        self.async_session.add_all(new_quizzes)
         await self.async_session.commit()
-        await self.async_session.refresh(quiz)
-        return quiz
+        return new_quizzes
+
+    @staticmethod
+    def quiz_graph_options():
+        return selectinload(QuizFromModels.questions).selectinload(QuestionFromModel.answers)
+
+    async def get_quiz_with_questions(self, quiz_id: int) -> QuizFromModels:
+        stmt = select(QuizFromModels).where(QuizFromModels.id == quiz_id).options(self.quiz_graph_options()). \
+            execution_options(populate_existing=True)
+        res = await self.async_session.execute(stmt)
+        return res.scalars().one()
+
+    async def get_quizzes_with_questions(self, quiz_ids: List[int]) -> List[QuizFromModels]:
+        stmt = select(QuizFromModels).where(QuizFromModels.id.in_(quiz_ids)).options(self.quiz_graph_options()). \
+            order_by(QuizFromModels.id).execution_options(populate_existing=True)
+        res = await self.async_session.execute(stmt)
+        return res.scalars().all()
+
+    async def delete(self, entity_id: int) -> None:
+        # the lock holds off attempts being stored for the quiz; questions, answers and attempts
+        # go by ON DELETE CASCADE once their share of the stats is taken out
+        stmt = select(QuizFromModels.id).where(QuizFromModels.id == entity_id).with_for_update()
+        res = await self.async_session.execute(stmt)
+        res.scalar_one()
+        await AttemptStatsRepository(self.async_session, QuizAttemptStatsFromModels). \
+            subtract(QuizAttemptFromModels.quiz_id == entity_id)
+        await self.async_session.execute(delete(QuizFromModels).where(QuizFromModels.id == entity_id))
+        await self.async_session.commit()
+
+    async def get_company_id(self, quiz_id: int) -> int:
+        stmt = select(QuizFromModels.company_id).where(QuizFromModels.id == quiz_id)
+        res = await self.async_session.execute(stmt)
+        return res.scalar_one()
 
     async def validate(self, quiz_id: int) -> bool:
-        quiz = await self.get_quiz_with_questions(quiz_id=quiz_id)
-        return len(quiz.questions) > 2
+        stmt = select(func.count(QuestionFromModel.id)).where(QuestionFromModel.quiz_id == quiz_id)
+        res = await self.async_session.execute(stmt)
+        return res.scalar_one() > 2
 
 
 class QuizzesRepository(BaseEntitiesRepository, QuizRepository):
-    async def paginate_query(self, page: int, page_size: int, company_id: int) -> List[QuizFromModels]:
+    async def paginate_query(self, page: int, page_size: int, company_id: int,
+                             cursor: Optional[str] = None) -> List[QuizFromModels]:
         stmt = select(self.entity).where(self.entity.company_id == company_id)
-        stmt_with_pagination = self.apply_pagination(stmt, page, page_size)
-        res = await self.async_session.execute(stmt_with_pagination)
-        entities = res.scalars().all()
-        return entities
+        return await self.fetch_page(stmt, self.entity, page, page_size, cursor)
@@ -0,0 +1,66 @@
+import re
+from typing import List, Optional
+
+from sqlalchemy import select, func, or_, case, literal
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models import Base as BaseFromModels, Company as CompanyFromModels, User as UserFromModels, \
+    Quiz as QuizFromModels
+from repository.companies import CompaniesRepository
+from .base import Paginateable
+
+
+def escape_like(query: str) -> str:
+    return query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def to_prefix_tsquery(query: str) -> Optional[str]:
+    """'ann smi' -> 'ann:* & smi:*'; only word characters reach to_tsquery."""
+    words = re.findall(r"\w+", query.lower())
+    return " & ".join(f"{word}:*" for word in words) if words else None
+
+
+class SearchRepository(Paginateable):
+    """Ranked search over the generated `search_vector` columns and the name columns.
+
+    A row matches when all query words prefix-match its tsvector (GIN index) or when
+    the raw query is a substring of one of the name columns (trigram GIN index).
+    Rows are ranked by ts_rank_cd, with a boost for names that start with the query.
+    Ranked results have no stable (created, id) order, so only page mode is supported.
+    """
+
+    def __init__(self, async_session: AsyncSession):
+        super().__init__(async_session)
+
+    async def search(self, entity: BaseFromModels, query: str, name_columns: List, page: int, page_size: int,
+                     *criteria) -> List[BaseFromModels]:
+        search_vector = entity.__table__.c.search_vector
+        escaped = escape_like(query)
+        conditions = [column.ilike(f"%{escaped}%") for column in name_columns]
+        rank = literal(0.0)
+
+        prefix_tsquery = to_prefix_tsquery(query)
+        if prefix_tsquery is not None:
+            ts_query = func.to_tsquery("simple", prefix_tsquery)
+            conditions.append(search_vector.op("@@")(ts_query))
+            rank = func.ts_rank_cd(search_vector, ts_query)
+
+        name_prefix = or_(*(column.ilike(f"{escaped}%") for column in name_columns))
+        rank = rank + case((name_prefix, 1.0), else_=0.0)
+
+        stmt = select(entity).where(or_(*conditions), *criteria).order_by(rank.desc(), entity.id). \
+            limit(page_size).offset((page - 1) * page_size)
+        res = await self.async_session.execute(stmt)
+        return res.scalars().all()
+
+    async def search_companies(self, query: str, page: int, page_size: int) -> List[CompanyFromModels]:
+        return await self.search(CompanyFromModels, query, [CompanyFromModels.company_name], page, page_size,
+                                 CompaniesRepository.visible_filter())
+
+    async def search_users(self, query: str, page: int, page_size: int) -> List[UserFromModels]:
+        return await self.search(UserFromModels, query, [UserFromModels.username, UserFromModels.email],
+                                 page, page_size)
+
+    async def search_quizzes(self, company_id: int, query: str, page: int, page_size: int) -> List[QuizFromModels]:
+        return await self.search(QuizFromModels, query, [QuizFromModels.name], page, page_size,
+                                 QuizFromModels.company_id == company_id)
@@ -3,7 +3,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from db.connect import get_session
 from db.models import Action as ActionFromModels, Company as CompanyFromModels, User as UserFromModels, \
-    Quiz as QuizFromModels, Answer as AnswerFromModels, Question as QuestionFromModels
+    Quiz as QuizFromModels, Answer as AnswerFromModels, Question as QuestionFromModels, \
+    QuizAttempt as QuizAttemptFromModels, QuizAttemptStats as QuizAttemptStatsFromModels
 from repository.quizzes import QuizRepository, QuizzesRepository
 from repository.users import UsersRepository, UserRepository
 from repository.join_requests import JoinRequestRepository, JoinRequestsRepository
@@ -11,6 +12,9 @@ from repository.invites import InviteRepository, InvitesRepository
 from repository.companies import CompaniesRepository, CompanyRepository
 from repository.questions import QuestionRepository
 from repository.answers import AnswerRepository
+from repository.attempts import AttemptRepository
+from repository.attempt_stats import AttemptStatsRepository
+from repository.search import SearchRepository
 
 
 def get_user_instance(async_session: AsyncSession = Depends(get_session)) -> UserRepository:
@@ -59,3 +63,15 @@ def get_answer_instance(async_session: AsyncSession = Depends(get_session)) -> A
 
 def get_question_instance(async_session: AsyncSession = Depends(get_session)) -> QuestionRepository:
     return QuestionRepository(async_session, QuestionFromModels)
+
+
+def get_search_instance(async_session: AsyncSession = Depends(get_session)) -> SearchRepository:
+    return SearchRepository(async_session)
+
+
+def get_attempt_instance(async_session: AsyncSession = Depends(get_session)) -> AttemptRepository:
+    return AttemptRepository(async_session, QuizAttemptFromModels)
+
+
+def get_attempt_stats_instance(async_session: AsyncSession = Depends(get_session)) -> AttemptStatsRepository:
+    return AttemptStatsRepository(async_session, QuizAttemptStatsFromModels)
@@ -1,27 +1,46 @@
-from typing import List, Union
+from typing import Dict, List, Tuple, Union
 
-from sqlalchemy import select
+from sqlalchemy import select, exists
 from sqlalchemy.orm import joinedload
 
-from db.models import User as UserFromModels
+from db.models import User as UserFromModels, Company as CompanyFromModels, member_company_association, \
+    admin_company_association, QuizAttempt as QuizAttemptFromModels, QuizAttemptStats as QuizAttemptStatsFromModels
+from repository.attempt_stats import AttemptStatsRepository
 from repository.base import BaseEntitiesRepository, BaseEntityRepository
 from libs.hash import Hash
 from schemas.users import SignUpRequestModel, UserUpdateRequestModel, UserStatus
 
 
 class UsersRepository(BaseEntitiesRepository):
-    pass
+
+    async def get_usernames(self, user_ids: List[int]) -> Dict[int, str]:
+        if not user_ids:
+            return {}
+        stmt = select(UserFromModels.id, UserFromModels.username).where(UserFromModels.id.in_(user_ids))
+        res = await self.async_session.execute(stmt)
+        return dict(res.all())
 
 
 class UserRepository(BaseEntityRepository):
 
     async def create(self, body: SignUpRequestModel) -> UserFromModels:
-        hashed_password = Hash.get_password_hash(body.password)
+        hashed_password = await Hash.get_password_hash(body.password)
         return await super().create(username=body.username, email=body.email, password=hashed_password)
 
+    async def delete(self, entity_id: int) -> None:
+        # the lock holds off attempts being stored for the user; theirs go by ON DELETE CASCADE
+        # once their share of the stats is taken out
+        stmt = select(UserFromModels.id).where(UserFromModels.id == entity_id).with_for_update()
+        res = await self.async_session.execute(stmt)
+        if res.scalar_one_or_none() is None:
+            return
+        await AttemptStatsRepository(self.async_session, QuizAttemptStatsFromModels). \
+            subtract(QuizAttemptFromModels.user_id == entity_id)
+        await super().delete(entity_id)
+
     async def update(self, user_id: int, body: UserUpdateRequestModel) -> UserFromModels:
         if body.password:
-            body.password = Hash.get_password_hash(body.password)
+            body.password = await Hash.get_password_hash(body.password)
         return await super().update(user_id, body)
 
     async def update_status(self, body: UserStatus, user_id: int) -> UserFromModels:
@@ -44,7 +63,7 @@ class UserRepository(BaseEntityRepository):
         stmt = select(UserFromModels).where(UserFromModels.id == user_id)
 
         for field in fields_to_load:
-            stmt = stmt.options(joinedload(field))
+            stmt = stmt.options(joinedload(getattr(UserFromModels, field)))
 
         res = await self.async_session.execute(stmt)
         user = res.scalars().first()
@@ -59,3 +78,12 @@ class UserRepository(BaseEntityRepository):
     async def get_user_with_admin_owner(self, user_id: int) -> UserFromModels:
         user = await self.get_user_with_loading_field(user_id, 'owner_of_companies', 'admin_of_companies')
         return user
+
+    async def get_company_role(self, user_id: int, company_id: int) -> Tuple[bool, bool, bool]:
+        is_owner = exists().where((CompanyFromModels.id == company_id) & (CompanyFromModels.owner_id == user_id))
+        is_admin = exists().where((admin_company_association.c.user_id == user_id) &
+                                  (admin_company_association.c.company_id == company_id))
+        is_member = exists().where((member_company_association.c.user_id == user_id) &
+                                   (member_company_association.c.company_id == company_id))
+        res = await self.async_session.execute(select(is_owner, is_admin, is_member))
+        return tuple(res.one())
@@ -1,22 +1,21 @@
 import logging
 from typing import List
-from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi import APIRouter, Depends, status, HTTPException, Response
 from sqlalchemy.exc import NoResultFound
 
-from core.log_config import LoggingConfig
+from libs.cache import VersionedCache, get_quiz_cache
 from repository.answers import AnswerRepository
 
 from repository.questions import QuestionRepository
 from schemas.auth import UserWithPermission
 
 from repository.service_repo_instance import get_answer_instance, get_question_instance
-from schemas.quiz import AnswerUpdateRequestModel, AnswerResponseModel, QuestionResponseModel, AnswerRequestModel
+from schemas.quiz import AnswerUpdateRequestModel, AnswerResponseModel, QuestionResponseModel, AnswerRequestModel, \
+    answer_serializer
 from utils.service_permission import user_permission_admin_owner
 
 router = APIRouter(prefix="/companies", tags=["answers"])
 
-LoggingConfig.configure_logging()
-
 
 @router.post("/{company_id}/quizzes/{quiz_id}/questions/{question_id}/answers", response_model=AnswerResponseModel,
              status_code=status.HTTP_201_CREATED)
@@ -27,12 +26,22 @@ async def create_answer(
         answer_body: AnswerRequestModel,
         current_user: UserWithPermission = Depends(user_permission_admin_owner),
         answer_instance: AnswerRepository = Depends(get_answer_instance),
-        question_instance: QuestionRepository = Depends(get_question_instance)
+        question_instance: QuestionRepository = Depends(get_question_instance),
+        quiz_cache: VersionedCache = Depends(get_quiz_cache)
 ):
+    try:
+        if await question_instance.get_owner(question_id=question_id) != (quiz_id, company_id):
+            raise NoResultFound(f"No question with id {question_id} in quiz with id {quiz_id}")
+    except NoResultFound:
+        logging.error("Tried to add an answer to non-existent question")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found question")
+
     new_answer = await answer_instance.create(text=answer_body.text, is_correct=answer_body.is_correct)
     updated_question = await question_instance.add_single_answer(question_id=question_id, answer=new_answer)
+    await quiz_cache.invalidate(quiz_id)
     logging.info(f"Created new answer with id: {new_answer.id} in question with id: {question_id}")
-    return new_answer
+    return Response(content=answer_serializer.dumps(new_answer), status_code=status.HTTP_201_CREATED,
+                    media_type="application/json")
 
 
 @router.put("/{company_id}/quizzes/{quiz_id}/questions/{question_id}/answers/{answer_id}",
@@ -45,17 +54,21 @@ async def update_answer(
         answer_update_body: AnswerUpdateRequestModel,
         current_user: UserWithPermission = Depends(user_permission_admin_owner),
         answer_instance: AnswerRepository = Depends(get_answer_instance),
-        question_instance: QuestionRepository = Depends(get_question_instance)
+        question_instance: QuestionRepository = Depends(get_question_instance),
+        quiz_cache: VersionedCache = Depends(get_quiz_cache)
 ):
     try:
+        if await answer_instance.get_owner(answer_id=answer_id) != (question_id, quiz_id, company_id):
+            raise NoResultFound(f"No answer with id {answer_id} in question with id {question_id}")
         answer = await answer_instance.get(entity_id=answer_id)
         if not answer_update_body.is_correct and answer.is_correct:
             if not await question_instance.validate_sum_correct_answ(question_id=question_id):
                 raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
                                     detail="Question should have at least 1 correct answer. Updating answer is forbidden")
         updated_answer = await answer_instance.update(entity_id=answer_id, body=answer_update_body)
+        await quiz_cache.invalidate(quiz_id)
         logging.info(f"Updated answer with id: {answer_id} in question with id: {question_id}")
-        return AnswerResponseModel.convert_answer_db_to_response(updated_answer)
+        return Response(content=answer_serializer.dumps(updated_answer), media_type="application/json")
 
 
 
@@ -74,13 +87,17 @@ async def delete_answer(
         answer_id: int,
         current_user: UserWithPermission = Depends(user_permission_admin_owner),
         answer_instance: AnswerRepository = Depends(get_answer_instance),
-        question_instance: QuestionRepository = Depends(get_question_instance)
+        question_instance: QuestionRepository = Depends(get_question_instance),
+        quiz_cache: VersionedCache = Depends(get_quiz_cache)
 ):
     try:
+        if await answer_instance.get_owner(answer_id=answer_id) != (question_id, quiz_id, company_id):
+            raise NoResultFound(f"No answer with id {answer_id} in question with id {question_id}")
         if not await question_instance.validate_sum_answers(question_id=question_id):
             raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
                                 detail="Question should have at least 2 answers. Deleting answer is forbidden")
         await answer_instance.delete(entity_id=answer_id)
+        await quiz_cache.invalidate(quiz_id)
         logging.info(f"Deleted answer with id: {answer_id}")
         return {f"Deleted answer with id: {answer_id}"}
     except NoResultFound:
@@ -0,0 +1,103 @@
+import asyncio
+import logging
+from typing import Annotated, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.exc import NoResultFound
+
+from libs.answer_key import AnswerKeyCache, get_answer_key_cache
+from libs.item_analysis import ItemAnalysisCache, analyze, get_item_analysis_cache
+from repository.attempt_stats import AttemptStatsRepository
+from repository.attempts import AttemptRepository
+from repository.quizzes import QuizRepository
+from repository.service_repo_instance import get_attempt_instance, get_attempt_stats_instance, get_quiz_instance
+from schemas.attempt_stats import AttemptStatsResponse, MemberAttemptStatsResponse
+from schemas.item_analysis import QuizAnalysisResponse
+from schemas.auth import UserWithPermission
+from utils.service_pagination import set_next_cursor
+from utils.service_permission import user_permission, user_permission_admin_owner
+
+router = APIRouter(tags=["attempt stats"])
+
+Page = Annotated[int, Query(ge=1)]
+PageSize = Annotated[int, Query(ge=1, le=100)]
+
+
+@router.get("/users/{user_id}/quiz-stats", response_model=AttemptStatsResponse)
+async def get_user_stats(
+        user_id: int,
+        current_user: UserWithPermission = Depends(user_permission),
+        stats_instance: AttemptStatsRepository = Depends(get_attempt_stats_instance)
+):
+    stats = await stats_instance.get_stats(user_id=user_id)
+    logging.info(f"Got quiz stats of user with id: {user_id} by user with id: {current_user.id}")
+    return AttemptStatsResponse.convert_to_response_model(stats)
+
+
+@router.get("/companies/{company_id}/quiz-stats", response_model=AttemptStatsResponse)
+async def get_company_stats(
+        company_id: int,
+        current_user: UserWithPermission = Depends(user_permission_admin_owner),
+        stats_instance: AttemptStatsRepository = Depends(get_attempt_stats_instance)
+):
+    stats = await stats_instance.get_stats(company_id=company_id)
+    logging.info(f"Got quiz stats of company with id: {company_id} by user with id: {current_user.id}")
+    return AttemptStatsResponse.convert_to_response_model(stats)
+
+
+@router.get("/companies/{company_id}/quiz-stats/members", response_model=List[MemberAttemptStatsResponse])
+async def get_company_member_stats(
+        company_id: int,
+        response: Response,
+        page: Page = 1,
+        page_size: PageSize = 20,
+        cursor: Optional[str] = None,
+        current_user: UserWithPermission = Depends(user_permission_admin_owner),
+        stats_instance: AttemptStatsRepository = Depends(get_attempt_stats_instance)
+):
+    member_stats = await stats_instance.get_member_stats(company_id=company_id, page=page, page_size=page_size,
+                                                         cursor=cursor)
+    set_next_cursor(response, stats_instance.next_cursor)
+    logging.info(f"Got member quiz stats of company with id: {company_id} by user with id: {current_user.id}")
+    return [MemberAttemptStatsResponse.convert_to_response_model(stats, user_id=stats.user_id)
+            for stats in member_stats]
+
+
+@router.get("/companies/{company_id}/quizzes/{quiz_id}/stats", response_model=AttemptStatsResponse)
+async def get_quiz_stats(
+        company_id: int,
+        quiz_id: int,
+        current_user: UserWithPermission = Depends(user_permission_admin_owner),
+        stats_instance: AttemptStatsRepository = Depends(get_attempt_stats_instance)
+):
+    stats = await stats_instance.get_stats(company_id=company_id, quiz_id=quiz_id)
+    logging.info(f"Got stats of quiz with id: {quiz_id} by user with id: {current_user.id}")
+    return AttemptStatsResponse.convert_to_response_model(stats)
+
+
+@router.get("/companies/{company_id}/quizzes/{quiz_id}/analytics", response_model=QuizAnalysisResponse)
+async def get_quiz_analytics(
+        company_id: int,
+        quiz_id: int,
+        current_user: UserWithPermission = Depends(user_permission_admin_owner),
+        quiz_instance: QuizRepository = Depends(get_quiz_instance),
+        attempt_instance: AttemptRepository = Depends(get_attempt_instance),
+        stats_instance: AttemptStatsRepository = Depends(get_attempt_stats_instance),
+        answer_keys: AnswerKeyCache = Depends(get_answer_key_cache),
+        analyses: ItemAnalysisCache = Depends(get_item_analysis_cache)
+):
+    try:
+        answer_key = await answer_keys.get(quiz_id, lambda: quiz_instance.get_quiz_with_questions(quiz_id=quiz_id))
+    except NoResultFound:
+        answer_key = None
+    if answer_key is None or answer_key.company_id != company_id:
+        logging.error("Tried to get analytics of non-existent quiz")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found quiz")
+
+    async def compute():
+        question_ids, results, answer_ids = await attempt_instance.get_attempt_matrix(quiz_id=quiz_id)
+        return await asyncio.to_thread(analyze, answer_key, question_ids, results, answer_ids)
+
+    stats = await stats_instance.get_stats(company_id=company_id, quiz_id=quiz_id)
+    analysis = await analyses.get(quiz_id, stats.attempts if stats else 0, compute)
+    logging.info(f"Got analytics of quiz with id: {quiz_id} by user with id: {current_user.id}")
+    return QuizAnalysisResponse(**analysis)
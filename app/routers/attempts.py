@@ -0,0 +1,66 @@
+import logging
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, status, HTTPException
+from redis.exceptions import RedisError
+from sqlalchemy.exc import NoResultFound
+
+from constants import IDEMPOTENCY_KEY_MAXLENGTH
+from libs.answer_key import AnswerKeyCache, InvalidAttemptError, get_answer_key_cache
+from libs.attempt_writer import AttemptWriter, get_attempt_writer, make_attempt_key
+from repository.attempts import AttemptRepository
+from repository.quizzes import QuizRepository
+from repository.service_repo_instance import get_quiz_instance
+from schemas.attempt import QuizAttemptRequestModel, QuizAttemptResponse
+from schemas.auth import UserWithPermission
+from utils.service_config import settings
+from utils.service_permission import user_permission_member
+
+router = APIRouter(prefix="/companies", tags=["attempts"])
+
+
+@router.post("/{company_id}/quizzes/{quiz_id}/attempts", response_model=QuizAttemptResponse,
+             status_code=status.HTTP_202_ACCEPTED)
+async def submit_attempt(
+        company_id: int,
+        quiz_id: int,
+        attempt_body: QuizAttemptRequestModel,
+        idempotency_key: Optional[str] = Header(None, max_length=IDEMPOTENCY_KEY_MAXLENGTH),
+        current_user: UserWithPermission = Depends(user_permission_member),
+        quiz_instance: QuizRepository = Depends(get_quiz_instance),
+        answer_keys: AnswerKeyCache = Depends(get_answer_key_cache),
+        attempt_writer: AttemptWriter = Depends(get_attempt_writer)
+):
+    try:
+        answer_key = await answer_keys.get(quiz_id, lambda: quiz_instance.get_quiz_with_questions(quiz_id=quiz_id))
+    except NoResultFound:
+        answer_key = None
+    if answer_key is None or answer_key.company_id != company_id:
+        logging.error("Tried to submit an attempt of non-existent quiz")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found quiz")
+
+    try:
+        graded = answer_key.grade((answer.question_id, answer.answer_ids) for answer in attempt_body.answers)
+    except InvalidAttemptError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+
+    attempt_key = make_attempt_key(current_user.id, quiz_id, idempotency_key)
+    row = AttemptRepository.build_row(attempt_key=attempt_key, quiz_id=quiz_id, company_id=company_id,
+                                      user_id=current_user.id, graded=graded, created=datetime.utcnow())
+    written_behind = False
+    if settings.ATTEMPTS_WRITE_BEHIND and not attempt_writer.lagging:
+        try:
+            await attempt_writer.append(row)
+            written_behind = True
+        except Exception as e:
+            logging.error(f"Exception during appending quiz attempt to the stream: {e}")
+    if not written_behind:
+        try:
+            await attempt_writer.store([row])
+        except RedisError as e:
+            # the attempt is committed by now, only its leaderboard update failed
+            logging.error(f"Exception during updating leaderboards, rebuild them from Postgres: {e}")
+
+    logging.info(f"User with id: {current_user.id} submitted attempt with key: {attempt_key} "
+                 f"of quiz with id: {quiz_id}")
+    return QuizAttemptResponse(**row, score=graded.score)
@@ -7,7 +7,6 @@ from sqlalchemy.exc import IntegrityError
 from libs.auth import create_access_token
 from libs.hash import Hash
 from db.connect import get_session
-from core.log_config import LoggingConfig
 from routers.users import get_user_instance
 from schemas.auth import Token
 from schemas.users import SignInRequestModel, UserDetailResponse, SignUpRequestModel
@@ -18,8 +17,6 @@ from utils.service_config import settings
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
-LoggingConfig.configure_logging()
-
 
 @router.post("/signin", response_model=Token)
 async def sign_in(
@@ -34,7 +31,7 @@ async def sign_in(
     current_user: UserFromModels = await UserFromRepository(async_session, UserFromModels).get_user_by_login(sign_in_body.email)
     if not current_user:
         raise credentials_exception
-    if not Hash.verify_password(sign_in_body.password, current_user.password):
+    if not await Hash.verify_password(sign_in_body.password, current_user.password):
         raise credentials_exception
     access_token_expires = timedelta(minutes=settings.EXPIRE_TOKEN)
     access_token = create_access_token(
@@ -1,30 +1,36 @@
 import logging
 from typing import List, Annotated
-from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi import APIRouter, Depends, status, HTTPException, Response
 from sqlalchemy.exc import IntegrityError, NoResultFound
 
-from core.log_config import LoggingConfig
 from libs.auth import get_current_user
+from libs.principal import PrincipalCache, get_principal_cache
 from repository.companies import CompaniesRepository, CompanyRepository
 from db.models import Company as CompanyFromModels, User as UserFromModels
 from schemas.companies import CompanyUpdateRequestModel, CompanyDetailResponse, CompanyRequestModel, CompanyResponseBase
 from schemas.users import PaginationParams, UserDetailResponse, UserResponseBase
 from schemas.auth import UserWithPermission
+from utils.service_pagination import set_next_cursor, set_total_count
 from utils.service_permission import user_permission_company, user_permission_member
 from repository.service_repo_instance import get_company_instance, get_companies_instance
 
 router = APIRouter(prefix="/companies", tags=["company"])
-LoggingConfig.configure_logging()
 
 
 @router.get("/", response_model=List[CompanyResponseBase])
 async def get_companies(
+        response: Response,
         current_user: Annotated[UserFromModels, Depends(get_current_user)],
         pagination: PaginationParams = Depends(),
+        with_total: bool = False,
         companies_instance: CompaniesRepository = Depends(get_companies_instance),
 ):
     all_companies = await companies_instance.paginate_query(entity=CompanyFromModels, page=pagination.page,
-                                                            page_size=pagination.page_size)
+                                                            page_size=pagination.page_size,
+                                                            cursor=pagination.cursor)
+    set_next_cursor(response, companies_instance.next_cursor)
+    if with_total:
+        set_total_count(response, await companies_instance.count_visible())
     logging.info("Got all companies")
     return all_companies
 
@@ -72,10 +78,12 @@ async def update_company(
 async def create_company(
         company_req_body: CompanyRequestModel,
         current_user: Annotated[UserFromModels, Depends(get_current_user)],
-        company_instance: CompanyRepository = Depends(get_company_instance)
+        company_instance: CompanyRepository = Depends(get_company_instance),
+        principal_cache: PrincipalCache = Depends(get_principal_cache)
 ):
     try:
         new_company = await company_instance.create(body=company_req_body, user=current_user)
+        await principal_cache.invalidate(current_user.id)
         logging.info(f"Created new company: {new_company.company_name} (id: {new_company.id})")
         return new_company
 
@@ -89,9 +97,11 @@ async def delete_company(
         company_id: int,
         current_user: UserWithPermission = Depends(user_permission_company),
         company_instance: CompanyRepository = Depends(get_company_instance),
+        principal_cache: PrincipalCache = Depends(get_principal_cache)
 ):
     try:
-        await company_instance.delete(entity_id=company_id)
+        user_ids = await company_instance.delete(entity_id=company_id)
+        await principal_cache.invalidate_many(user_ids)
         logging.info(f"Company with company_id: {company_id} was deleted by user {current_user.username}")
         return {f"Company with id:{company_id} - deleted by user {current_user.username}"}
 
@@ -106,9 +116,11 @@ async def remove_member(
         member_id: int,
         current_user: UserWithPermission = Depends(user_permission_company),
         company_instance: CompanyRepository = Depends(get_company_instance),
+        principal_cache: PrincipalCache = Depends(get_principal_cache)
 ):
     try:
         await company_instance.delete_member(company_id=company_id, member_id=member_id)
+        await principal_cache.invalidate(member_id)
         logging.info(
             f"Member with id: {member_id} was deleted by user {current_user.username} from company {company_id}")
         return {f"Member with id: {member_id} - deleted by user {current_user.username} from company {company_id}"}
@@ -123,9 +135,11 @@ async def leave_company(
         company_id: int,
         current_user: UserWithPermission = Depends(user_permission_member),
         company_instance: CompanyRepository = Depends(get_company_instance),
+        principal_cache: PrincipalCache = Depends(get_principal_cache)
 ):
     try:
         await company_instance.delete_member(company_id=company_id, member_id=current_user.id)
+        await principal_cache.invalidate(current_user.id)
         logging.info(
             f"User with id: {current_user.id} left company {company_id}")
         return {f"User with id: {current_user.id} left company {company_id}"}
@@ -138,6 +152,7 @@ async def leave_company(
 @router.get("/{company_id}/members", response_model=List[UserResponseBase])
 async def get_members(
         company_id: int,
+        response: Response,
         current_user: Annotated[UserFromModels, Depends(get_current_user)],
         pagination: PaginationParams = Depends(),
         company_instance: CompanyRepository = Depends(get_company_instance),
@@ -145,7 +160,9 @@ async def get_members(
     try:
 
         all_members = await company_instance.paginate_query(company_id=company_id, page=pagination.page,
-                                                            page_size=pagination.page_size, join_field="members")
+                                                            page_size=pagination.page_size, join_field="members",
+                                                            cursor=pagination.cursor)
+        set_next_cursor(response, company_instance.next_cursor)
         logging.info(
             f"User with id: {current_user.id} get members of {company_id}")
         return all_members
@@ -160,11 +177,13 @@ async def assign_admin(
         company_id: int,
         user_id: int,
         current_user: UserWithPermission = Depends(user_permission_company),
-        company_instance: CompanyRepository = Depends(get_company_instance)
+        company_instance: CompanyRepository = Depends(get_company_instance),
+        principal_cache: PrincipalCache = Depends(get_principal_cache)
 ):
     try:
 
         await company_instance.assign_admin(company_id=company_id, user_id=user_id)
+        await principal_cache.invalidate(user_id)
         logging.info(
             f"User with id: {user_id} assigned as admin  in company (id): {company_id}")
         return {f"User with id: {user_id} assigned as admin  in company (id): {company_id}"}
@@ -180,9 +199,11 @@ async def remove_admin(
         user_id: int,
         current_user: UserWithPermission = Depends(user_permission_company),
         company_instance: CompanyRepository = Depends(get_company_instance),
+        principal_cache: PrincipalCache = Depends(get_principal_cache)
 ):
     try:
         await company_instance.delete_admin(company_id=company_id, admin_id=user_id)
+        await principal_cache.invalidate(user_id)
         logging.info(
             f"Admin with id: {user_id} was deleted by user {current_user.username} from company {company_id}")
         return {f"Admin with id: {user_id} - deleted by user {current_user.username} from company {company_id}"}
@@ -195,6 +216,7 @@ async def remove_admin(
 @router.get("/{company_id}/admins", response_model=List[UserResponseBase])
 async def get_admins(
         company_id: int,
+        response: Response,
         current_user: Annotated[UserFromModels, Depends(get_current_user)],
         pagination: PaginationParams = Depends(),
         company_instance: CompanyRepository = Depends(get_company_instance),
@@ -202,7 +224,9 @@ async def get_admins(
     try:
 
         all_admins = await company_instance.paginate_query(company_id=company_id, page=pagination.page,
-                                                           page_size=pagination.page_size, join_field="admins")
+                                                           page_size=pagination.page_size, join_field="admins",
+                                                           cursor=pagination.cursor)
+        set_next_cursor(response, company_instance.next_cursor)
         logging.info(
             f"User with id: {current_user.id} get admins of {company_id}")
         return all_admins
@@ -1,22 +1,22 @@
 import logging
 from typing import Annotated, List
-from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi import APIRouter, Depends, status, HTTPException, Response
 from sqlalchemy.exc import NoResultFound
 
-from core.log_config import LoggingConfig
 from libs.auth import get_current_user
+from libs.principal import PrincipalCache, get_principal_cache
 from repository.invites import InviteRepository
-from db.models import User as UserFromModels, StatusActionForResponse
+from db.models import User as UserFromModels, StatusActionForResponse, TypeAction
 from schemas.auth import UserWithPermission
-from schemas.action import ActionDetailResponse, ActionRequestModel
+from schemas.action import ActionDetailResponse, ActionRequestModel, BulkInvitationRequestModel, \
+    BulkInvitationResponse, BulkActionResponseRequestModel, BulkActionResponse
 from routers.companies import user_permission_company
 from repository.service_repo_instance import get_invite_instance
 from schemas.users import PaginationParams, UserDetailResponse, UserResponseBase
+from utils.service_pagination import set_next_cursor
 
 router = APIRouter(prefix="/companies", tags=["invites"])
 
-LoggingConfig.configure_logging()
-
 
 @router.post("/{company_id}/invitations", response_model=ActionDetailResponse,
              status_code=status.HTTP_201_CREATED)
@@ -32,6 +32,21 @@ async def send_invitation(
     return invite_response_model
 
 
+@router.post("/{company_id}/invitations/bulk", response_model=List[BulkInvitationResponse])
+async def send_invitations(
+        company_id: int,
+        invite_req_body: BulkInvitationRequestModel,
+        current_user: UserWithPermission = Depends(user_permission_company),
+        invite_instance: InviteRepository = Depends(get_invite_instance)
+):
+    results = await invite_instance.create_many(company_id=company_id, recipient_ids=invite_req_body.recipient_ids,
+                                                user=current_user)
+    logging.info(f"User with id: {current_user.id} sent "
+                 f"{sum(result.invitation_id is not None for result in results)} invitations "
+                 f"in company with id: {company_id}")
+    return results
+
+
 @router.delete("/{company_id}/invitations/{invitation_id}", status_code=status.HTTP_202_ACCEPTED)
 async def cancel_invitation(
         company_id: int,
@@ -56,10 +71,12 @@ async def response_invitation(
         response_type: StatusActionForResponse,
         invitation_id: int,
         current_user: UserWithPermission = Depends(user_permission_company),
-        invite_instance: InviteRepository = Depends(get_invite_instance)
+        invite_instance: InviteRepository = Depends(get_invite_instance),
+        principal_cache: PrincipalCache = Depends(get_principal_cache)
 ):
     try:
-        await invite_instance.response(action_id=invitation_id, body=response_type, company_id=company_id)
+        invitation = await invite_instance.response(action_id=invitation_id, body=response_type, company_id=company_id)
+        await principal_cache.invalidate(invitation.recipient_id)
         logging.info(
             f"Invite with invite_id: {invitation_id} was {response_type.value} by member {current_user.username}")
         return {f"Invite with invite_id: {invitation_id} - {response_type.value} by member {current_user.username}"}
@@ -68,14 +85,35 @@ async def response_invitation(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found invite")
 
 
+@router.patch("/{company_id}/invitations/bulk-response", response_model=List[BulkActionResponse])
+async def response_invitations(
+        company_id: int,
+        response_body: BulkActionResponseRequestModel,
+        current_user: UserWithPermission = Depends(user_permission_company),
+        invite_instance: InviteRepository = Depends(get_invite_instance),
+        principal_cache: PrincipalCache = Depends(get_principal_cache)
+):
+    answered = await invite_instance.respond_many(action_ids=response_body.action_ids,
+                                                  body=response_body.response_type, company_id=company_id,
+                                                  type_action=TypeAction.INVITE)
+    if response_body.response_type == StatusActionForResponse.ACCEPTED:
+        await principal_cache.invalidate_many(set(answered.values()))
+    logging.info(f"{len(answered)} invites were {response_body.response_type.value} "
+                 f"by member {current_user.username} in company {company_id}")
+    return BulkActionResponse.build_results(response_body.action_ids, answered, response_body.response_type)
+
+
 @router.get("/{company_id}/invited-users", response_model=List[UserResponseBase],
             status_code=status.HTTP_201_CREATED)
 async def get_invited_users(
         company_id: int,
+        response: Response,
         current_user: UserWithPermission = Depends(user_permission_company),
         pagination: PaginationParams = Depends(),
         invite_instance: InviteRepository = Depends(get_invite_instance)
 ):
-    all_invited_users = await invite_instance.paginate_query(company_id=company_id, page=pagination.page, page_size=pagination.page_size)
+    all_invited_users = await invite_instance.paginate_query(company_id=company_id, page=pagination.page,
+                                                             page_size=pagination.page_size, cursor=pagination.cursor)
+    set_next_cursor(response, invite_instance.next_cursor)
     logging.info(f"Got all all_invited_users by user: {current_user.id})")
     return all_invited_users
@@ -1,21 +1,19 @@
 import logging
-from typing import Annotated
+from typing import Annotated, List
 from fastapi import APIRouter, Depends, status, HTTPException
 from sqlalchemy.exc import NoResultFound
 
-from core.log_config import LoggingConfig
 from libs.auth import get_current_user
+from libs.principal import PrincipalCache, get_principal_cache
 from repository.join_requests import JoinRequestRepository
-from db.models import User as UserFromModels, StatusActionForResponse
-from schemas.action import ActionDetailResponse
+from db.models import User as UserFromModels, StatusActionForResponse, TypeAction
+from schemas.action import ActionDetailResponse, BulkActionResponseRequestModel, BulkActionResponse
 from schemas.auth import UserWithPermission
 from routers.companies import user_permission_company
 from repository.service_repo_instance import get_join_request_instance
 
 router = APIRouter(prefix="/companies", tags=["join-requests"])
 
-LoggingConfig.configure_logging()
-
 
 @router.post("/{company_id}/join-requests", response_model=ActionDetailResponse,
              status_code=status.HTTP_201_CREATED)
@@ -54,13 +52,34 @@ async def response_request(
         response_type: StatusActionForResponse,
         join_requests_id: int,
         current_user: UserWithPermission = Depends(user_permission_company),
-        join_request_instance: JoinRequestRepository = Depends(get_join_request_instance)
+        join_request_instance: JoinRequestRepository = Depends(get_join_request_instance),
+        principal_cache: PrincipalCache = Depends(get_principal_cache)
 ):
     try:
-        await join_request_instance.response(action_id=join_requests_id, body=response_type, company_id=company_id)
+        join_request = await join_request_instance.response(action_id=join_requests_id, body=response_type,
+                                                            company_id=company_id)
+        await principal_cache.invalidate(join_request.recipient_id)
         logging.info(
             f"Join request with id: {join_requests_id} was {response_type.value} by member {current_user.username}")
         return {f"Join request with id: {join_requests_id} - {response_type.value} by member {current_user.username}"}
     except NoResultFound:
         logging.error("Tried to get non-existent join request")
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found invite")
+
+
+@router.post("/{company_id}/join-requests/bulk-response", response_model=List[BulkActionResponse])
+async def response_requests(
+        company_id: int,
+        response_body: BulkActionResponseRequestModel,
+        current_user: UserWithPermission = Depends(user_permission_company),
+        join_request_instance: JoinRequestRepository = Depends(get_join_request_instance),
+        principal_cache: PrincipalCache = Depends(get_principal_cache)
+):
+    answered = await join_request_instance.respond_many(action_ids=response_body.action_ids,
+                                                        body=response_body.response_type, company_id=company_id,
+                                                        type_action=TypeAction.JOIN_REQUEST)
+    if response_body.response_type == StatusActionForResponse.ACCEPTED:
+        await principal_cache.invalidate_many(set(answered.values()))
+    logging.info(f"{len(answered)} join requests were {response_body.response_type.value} "
+                 f"by member {current_user.username} in company {company_id}")
+    return BulkActionResponse.build_results(response_body.action_ids, answered, response_body.response_type)
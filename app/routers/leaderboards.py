@@ -0,0 +1,89 @@
+import logging
+from typing import Annotated, List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from libs.leaderboard import LeaderboardRow, Leaderboards, get_leaderboards
+from repository.service_repo_instance import get_users_instance
+from repository.users import UsersRepository
+from schemas.auth import UserWithPermission
+from schemas.leaderboard import LeaderboardEntry
+from utils.service_permission import user_permission_member_admin_owner
+
+router = APIRouter(prefix="/companies", tags=["leaderboards"])
+
+Offset = Annotated[int, Query(ge=0)]
+Limit = Annotated[int, Query(ge=1, le=100)]
+Radius = Annotated[int, Query(ge=0, le=50)]
+
+
+async def with_usernames(rows: List[LeaderboardRow], users_instance: UsersRepository) -> List[LeaderboardEntry]:
+    usernames = await users_instance.get_usernames([user_id for user_id, _, _ in rows])
+    return [LeaderboardEntry(user_id=user_id, username=usernames.get(user_id), rank=rank, score=score)
+            for user_id, rank, score in rows]
+
+
+async def around_me(key: str, current_user: UserWithPermission, radius: int, leaderboards: Leaderboards,
+                    users_instance: UsersRepository) -> List[LeaderboardEntry]:
+    rows = await leaderboards.around(key, current_user.id, radius)
+    if rows is None:
+        logging.error(f"User with id: {current_user.id} is not ranked on leaderboard: {key}")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not ranked yet")
+    return await with_usernames(rows, users_instance)
+
+
+@router.get("/{company_id}/leaderboard", response_model=List[LeaderboardEntry])
+async def get_company_leaderboard(
+        company_id: int,
+        offset: Offset = 0,
+        limit: Limit = 10,
+        current_user: UserWithPermission = Depends(user_permission_member_admin_owner),
+        leaderboards: Leaderboards = Depends(get_leaderboards),
+        users_instance: UsersRepository = Depends(get_users_instance)
+):
+    rows = await leaderboards.top(Leaderboards.company_key(company_id), offset, limit)
+    logging.info(f"Got leaderboard of company with id: {company_id} by user with id: {current_user.id}")
+    return await with_usernames(rows, users_instance)
+
+
+@router.get("/{company_id}/leaderboard/me", response_model=List[LeaderboardEntry])
+async def get_company_leaderboard_around_me(
+        company_id: int,
+        radius: Radius = 5,
+        current_user: UserWithPermission = Depends(user_permission_member_admin_owner),
+        leaderboards: Leaderboards = Depends(get_leaderboards),
+        users_instance: UsersRepository = Depends(get_users_instance)
+):
+    entries = await around_me(Leaderboards.company_key(company_id), current_user, radius, leaderboards,
+                              users_instance)
+    logging.info(f"Got leaderboard of company with id: {company_id} around user with id: {current_user.id}")
+    return entries
+
+
+@router.get("/{company_id}/quizzes/{quiz_id}/leaderboard", response_model=List[LeaderboardEntry])
+async def get_quiz_leaderboard(
+        company_id: int,
+        quiz_id: int,
+        offset: Offset = 0,
+        limit: Limit = 10,
+        current_user: UserWithPermission = Depends(user_permission_member_admin_owner),
+        leaderboards: Leaderboards = Depends(get_leaderboards),
+        users_instance: UsersRepository = Depends(get_users_instance)
+):
+    rows = await leaderboards.top(Leaderboards.quiz_key(company_id, quiz_id), offset, limit)
+    logging.info(f"Got leaderboard of quiz with id: {quiz_id} by user with id: {current_user.id}")
+    return await with_usernames(rows, users_instance)
+
+
+@router.get("/{company_id}/quizzes/{quiz_id}/leaderboard/me", response_model=List[LeaderboardEntry])
+async def get_quiz_leaderboard_around_me(
+        company_id: int,
+        quiz_id: int,
+        radius: Radius = 5,
+        current_user: UserWithPermission = Depends(user_permission_member_admin_owner),
+        leaderboards: Leaderboards = Depends(get_leaderboards),
+        users_instance: UsersRepository = Depends(get_users_instance)
+):
+    entries = await around_me(Leaderboards.quiz_key(company_id, quiz_id), current_user, radius, leaderboards,
+                              users_instance)
+    logging.info(f"Got leaderboard of quiz with id: {quiz_id} around user with id: {current_user.id}")
+    return entries
@@ -1,24 +1,19 @@
 import logging
-from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi import APIRouter, Depends, status, HTTPException, Response
 from sqlalchemy.exc import NoResultFound
 
-from core.log_config import LoggingConfig
-from repository.answers import AnswerRepository
-
+from libs.cache import VersionedCache, get_quiz_cache
 from repository.questions import QuestionRepository
 from repository.quizzes import QuizRepository
 from schemas.auth import UserWithPermission
 
-from repository.service_repo_instance import get_quiz_instance, get_answer_instance, get_question_instance
-from schemas.quiz import QuestionUpdateRequestModel, QuestionResponseModel, QuestionRequestModel
+from repository.service_repo_instance import get_quiz_instance, get_question_instance
+from schemas.quiz import QuestionUpdateRequestModel, QuestionResponseModel, QuestionRequestModel, question_serializer
 
 from utils.service_permission import user_permission_admin_owner
-from db.models import Question as QuestionFormModels
 
 router = APIRouter(prefix="/companies", tags=["questions"])
 
-LoggingConfig.configure_logging()
-
 
 @router.post("/{company_id}/quizzes/{quiz_id}/questions", response_model=QuestionResponseModel,
              status_code=status.HTTP_201_CREATED)
@@ -27,19 +22,24 @@ async def create_question(
         quiz_id: int,
         question_body: QuestionRequestModel,
         current_user: UserWithPermission = Depends(user_permission_admin_owner),
-        answer_instance: AnswerRepository = Depends(get_answer_instance),
         question_instance: QuestionRepository = Depends(get_question_instance),
-        quiz_instance: QuizRepository = Depends(get_quiz_instance)
+        quiz_instance: QuizRepository = Depends(get_quiz_instance),
+        quiz_cache: VersionedCache = Depends(get_quiz_cache)
 ):
+    try:
+        quiz_company_id = await quiz_instance.get_company_id(quiz_id=quiz_id)
+    except NoResultFound:
+        quiz_company_id = None
+    if quiz_company_id != company_id:
+        logging.error("Tried to add a question to non-existent quiz")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found quiz")
 
-    new_question = await question_instance.create(quiz_id=quiz_id, question_body=question_body, answers_repo=answer_instance)
-
-    updated_quiz = await quiz_instance.add_single_question(quiz_id=quiz_id, question=new_question)
+    new_question = await question_instance.create(quiz_id=quiz_id, question_body=question_body)
+    await quiz_cache.invalidate(quiz_id)
     logging.info(f"Created new question with id: {new_question.id} in quiz with id: {quiz_id}")
-    load_question = await question_instance.get_entity_with_loading_field(QuestionFormModels, new_question.id,
-                                                                          "answers")
-    question_response = QuestionResponseModel.convert_question_db_to_response(question_db_model=load_question)
-    return question_response
+    load_question = await question_instance.get_question_with_answers(question_id=new_question.id)
+    return Response(content=question_serializer.dumps(load_question), status_code=status.HTTP_201_CREATED,
+                    media_type="application/json")
 
 
 @router.put("/{company_id}/quizzes/{quiz_id}/questions/{question_id}", response_model=QuestionResponseModel)
@@ -49,16 +49,18 @@ async def update_question(
         question_id: int,
         question_update_body: QuestionUpdateRequestModel,
         current_user: UserWithPermission = Depends(user_permission_admin_owner),
-        question_instance: QuestionRepository = Depends(get_question_instance)
+        question_instance: QuestionRepository = Depends(get_question_instance),
+        quiz_cache: VersionedCache = Depends(get_quiz_cache)
 ):
     try:
+        if await question_instance.get_owner(question_id=question_id) != (quiz_id, company_id):
+            raise NoResultFound(f"No question with id {question_id} in quiz with id {quiz_id}")
         updated_question = await question_instance.update(entity_id=question_id, body=question_update_body)
+        await quiz_cache.invalidate(quiz_id)
 
         logging.info(f"Updated question with id: {question_id} in quiz with id: {quiz_id}")
-        load_question = await question_instance.get_entity_with_loading_field(QuestionFormModels, updated_question.id,
-                                                                              "answers")
-        question_response = QuestionResponseModel.convert_question_db_to_response(question_db_model=load_question)
-        return question_response
+        load_question = await question_instance.get_question_with_answers(question_id=updated_question.id)
+        return Response(content=question_serializer.dumps(load_question), media_type="application/json")
 
     except NoResultFound:
         logging.error("Tried to get non-existent question")
@@ -72,11 +74,15 @@ async def delete_question(
         question_id: int,
         current_user: UserWithPermission = Depends(user_permission_admin_owner),
         question_instance: QuestionRepository = Depends(get_question_instance),
-        quiz_instance: QuizRepository = Depends(get_quiz_instance)
+        quiz_instance: QuizRepository = Depends(get_quiz_instance),
+        quiz_cache: VersionedCache = Depends(get_quiz_cache)
 ):
     try:
+        if await question_instance.get_owner(question_id=question_id) != (quiz_id, company_id):
+            raise NoResultFound(f"No question with id {question_id} in quiz with id {quiz_id}")
         if await quiz_instance.validate(quiz_id=quiz_id):
             await question_instance.delete(entity_id=question_id)
+            await quiz_cache.invalidate(quiz_id)
             logging.info(f"Deleted question with id: {question_id}")
             return {f"Deleted question with id: {question_id}"}
         else:
@@ -0,0 +1,60 @@
+import logging
+from typing import List, Annotated
+from fastapi import APIRouter, Depends, Query
+
+from constants import SEARCH_QUERY_MAXLENGTH
+from db.models import User as UserFromModels
+from libs.auth import get_current_user
+from repository.search import SearchRepository
+from repository.service_repo_instance import get_search_instance
+from schemas.auth import UserWithPermission
+from schemas.companies import CompanyResponseBase
+from schemas.quiz import QuizBaseResponse
+from schemas.users import UserResponseBase
+from utils.service_permission import user_permission_admin_owner
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+SearchQuery = Annotated[str, Query(min_length=1, max_length=SEARCH_QUERY_MAXLENGTH)]
+Page = Annotated[int, Query(ge=1)]
+PageSize = Annotated[int, Query(ge=1, le=100)]
+
+
+@router.get("/companies", response_model=List[CompanyResponseBase])
+async def search_companies(
+        current_user: Annotated[UserFromModels, Depends(get_current_user)],
+        q: SearchQuery,
+        page: Page = 1,
+        page_size: PageSize = 5,
+        search_instance: SearchRepository = Depends(get_search_instance),
+):
+    companies = await search_instance.search_companies(query=q, page=page, page_size=page_size)
+    logging.info(f"User with id: {current_user.id} searched companies")
+    return companies
+
+
+@router.get("/users", response_model=List[UserResponseBase])
+async def search_users(
+        current_user: Annotated[UserFromModels, Depends(get_current_user)],
+        q: SearchQuery,
+        page: Page = 1,
+        page_size: PageSize = 5,
+        search_instance: SearchRepository = Depends(get_search_instance),
+):
+    users = await search_instance.search_users(query=q, page=page, page_size=page_size)
+    logging.info(f"User with id: {current_user.id} searched users")
+    return users
+
+
+@router.get("/companies/{company_id}/quizzes", response_model=List[QuizBaseResponse])
+async def search_quizzes(
+        company_id: int,
+        q: SearchQuery,
+        current_user: UserWithPermission = Depends(user_permission_admin_owner),
+        page: Page = 1,
+        page_size: PageSize = 5,
+        search_instance: SearchRepository = Depends(get_search_instance),
+):
+    quizzes = await search_instance.search_quizzes(company_id=company_id, query=q, page=page, page_size=page_size)
+    logging.info(f"User with id: {current_user.id} searched quizzes in company with id: {company_id}")
+    return quizzes
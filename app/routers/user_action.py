@@ -1,12 +1,13 @@
 import logging
 from typing import List
-from fastapi import Depends
+from fastapi import Depends, Response
 
 from repository.invites import InvitesRepository
 from repository.join_requests import JoinRequestsRepository
 from schemas.action import ActionDetailResponse
 from schemas.users import PaginationParams
 from schemas.auth import UserWithPermission
+from utils.service_pagination import set_next_cursor
 from utils.service_permission import user_permission
 from repository.service_repo_instance import get_join_requests_instance, get_invites_instance
 
@@ -18,13 +19,16 @@ router = APIRouter(prefix="/user-action", tags=["user-action"])
 @router.get("/user_id/me/join-requests", response_model=List[ActionDetailResponse])
 async def list_requests(
         user_id: int,
+        response: Response,
         current_user: UserWithPermission = Depends(user_permission),
         pagination: PaginationParams = Depends(),
         join_requests_instance: JoinRequestsRepository = Depends(get_join_requests_instance)
 ):
     all_requests_response = []
     all_requests = await join_requests_instance.paginate_query(user_id=user_id, page=pagination.page,
-                                                               page_size=pagination.page_size)
+                                                               page_size=pagination.page_size,
+                                                               cursor=pagination.cursor)
+    set_next_cursor(response, join_requests_instance.next_cursor)
     for request in all_requests:
         action_response = ActionDetailResponse.convert_to_response_model(request)
         all_requests_response.append(action_response)
@@ -36,13 +40,16 @@ async def list_requests(
 @router.get("/user_id/me/invitations", response_model=List[ActionDetailResponse])
 async def list_invites(
         user_id: int,
+        response: Response,
         current_user: UserWithPermission = Depends(user_permission),
         pagination: PaginationParams = Depends(),
         invites_instance: InvitesRepository = Depends(get_invites_instance)
 ):
     all_invites_response = []
     all_invites = await invites_instance.paginate_query(user_id=user_id, page=pagination.page,
-                                                        page_size=pagination.page_size)
+                                                        page_size=pagination.page_size,
+                                                        cursor=pagination.cursor)
+    set_next_cursor(response, invites_instance.next_cursor)
     for invite in all_invites:
         all_invites_response.append(ActionDetailResponse.convert_to_response_model(invite))
 
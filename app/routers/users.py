@@ -1,31 +1,34 @@
 import logging
 from typing import List, Annotated
-from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi import APIRouter, Depends, status, HTTPException, Response
 from sqlalchemy.exc import IntegrityError, NoResultFound
 
-from core.log_config import LoggingConfig
 from db.models import User as UserFromModels
 from repository.users import UsersRepository, UserRepository
 from libs.auth import get_current_user
+from libs.principal import PrincipalCache, get_principal_cache
 from schemas.users import UserUpdateRequestModel, UserStatus, UserDetailResponse, PaginationParams, UserBase, \
     UserResponseBase
 from schemas.auth import UserWithPermission
 from repository.service_repo_instance import get_user_instance, get_users_instance
+from utils.service_pagination import set_next_cursor
 from utils.service_permission import user_permission
 
 router = APIRouter(prefix="/users", tags=["user"])
-LoggingConfig.configure_logging()
 
 
 @router.get("/", response_model=List[UserResponseBase])
 async def get_users(
+        response: Response,
         current_user: Annotated[UserFromModels, Depends(get_current_user)],
         pagination: PaginationParams = Depends(),
         users_instance: UsersRepository = Depends(get_users_instance),
 
 ):
     all_users = await users_instance.paginate_query(entity=UserFromModels, page=pagination.page,
-                                                    page_size=pagination.page_size)
+                                                    page_size=pagination.page_size,
+                                                    cursor=pagination.cursor)
+    set_next_cursor(response, users_instance.next_cursor)
     logging.info("Got all users")
     return all_users
 
@@ -51,10 +54,12 @@ async def update_user(
         user_id: int,
         user_req_body: UserUpdateRequestModel,
         current_user: UserWithPermission = Depends(user_permission),
-        user_instance: UserRepository = Depends(get_user_instance)
+        user_instance: UserRepository = Depends(get_user_instance),
+        principal_cache: PrincipalCache = Depends(get_principal_cache)
 ):
     try:
         user = await user_instance.update(body=user_req_body, user_id=user_id)
+        await principal_cache.invalidate(user_id)
         logging.info(f"Updated user: {user.username} (id: {user.id})")
         return user
 
@@ -72,10 +77,12 @@ async def update_status_user(
         user_id: int,
         user_req_body: UserStatus,
         current_user: UserWithPermission = Depends(user_permission),
-        user_instance: UserRepository = Depends(get_user_instance)
+        user_instance: UserRepository = Depends(get_user_instance),
+        principal_cache: PrincipalCache = Depends(get_principal_cache)
 ):
     try:
         user = await user_instance.update_status(body=user_req_body, user_id=user_id)
+        await principal_cache.invalidate(user_id)
         logging.info(f"Updated status of user: {user.username} (id: {user.id})")
         return user
 
@@ -89,9 +96,11 @@ async def delete_user(
         user_id: int,
         current_user: UserWithPermission = Depends(user_permission),
         user_instance: UserRepository = Depends(get_user_instance),
+        principal_cache: PrincipalCache = Depends(get_principal_cache)
 ):
     try:
         await user_instance.delete(entity_id=user_id)
+        await principal_cache.invalidate(user_id)
         logging.info(f"User with user_id: {user_id} was deleted")
         return {f"User with id:{user_id} - deleted"}
 
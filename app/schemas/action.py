@@ -1,7 +1,10 @@
 from datetime import datetime
-from pydantic import BaseModel
+from enum import Enum as PyEnum
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
 
-from db.models import StatusActionWithSent, TypeAction, Action as ActionFromModels
+from constants import BULK_INVITATIONS_MAXITEMS, BULK_RESPONSES_MAXITEMS
+from db.models import StatusActionWithSent, StatusActionForResponse, TypeAction, Action as ActionFromModels
 
 
 class ActionBase(BaseModel):
@@ -35,3 +38,43 @@ class ActionDetailResponse(ActionBase):
 class ActionRequestModel(BaseModel):
     recipient_id: int
 
+
+
+class BulkInvitationRequestModel(BaseModel):
+    recipient_ids: List[int] = Field(min_items=1, max_items=BULK_INVITATIONS_MAXITEMS)
+
+
+class InvitationResult(str, PyEnum):
+    INVITED = "invited"
+    ALREADY_INVITED = "already_invited"
+    ALREADY_MEMBER = "already_member"
+    NOT_FOUND = "not_found"
+
+
+class BulkInvitationResponse(BaseModel):
+    recipient_id: int
+    result: InvitationResult
+    invitation_id: Optional[int] = None
+
+
+class BulkActionResponseRequestModel(BaseModel):
+    action_ids: List[int] = Field(min_items=1, max_items=BULK_RESPONSES_MAXITEMS)
+    response_type: StatusActionForResponse
+
+
+class ActionResponseResult(str, PyEnum):
+    ACCEPTED = "accepted"
+    REJECTED = "rejected"
+    NOT_PENDING = "not_pending"
+
+
+class BulkActionResponse(BaseModel):
+    action_id: int
+    result: ActionResponseResult
+
+    @classmethod
+    def build_results(cls, action_ids: List[int], answered: Dict[int, int],
+                      response_type: StatusActionForResponse) -> List["BulkActionResponse"]:
+        return [cls(action_id=action_id,
+                    result=response_type.value if action_id in answered else ActionResponseResult.NOT_PENDING)
+                for action_id in dict.fromkeys(action_ids)]
@@ -0,0 +1,26 @@
+from datetime import datetime
+from typing import List
+from uuid import UUID
+from pydantic import BaseModel, Field
+
+from constants import QUIZ_ATTEMPT_ANSWERS_MAXITEMS
+
+
+class AttemptAnswerModel(BaseModel):
+    question_id: int
+    answer_ids: List[int] = Field(min_items=1)
+
+
+class QuizAttemptRequestModel(BaseModel):
+    answers: List[AttemptAnswerModel] = Field(min_items=1, max_items=QUIZ_ATTEMPT_ANSWERS_MAXITEMS)
+
+
+class QuizAttemptResponse(BaseModel):
+    attempt_key: UUID
+    quiz_id: int
+    company_id: int
+    user_id: int
+    correct: int
+    total: int
+    score: float
+    created: datetime
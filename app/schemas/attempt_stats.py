@@ -0,0 +1,27 @@
+import math
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel
+
+from db.models import QuizAttemptStats as QuizAttemptStatsFromModels
+
+
+class AttemptStatsResponse(BaseModel):
+    attempts: int = 0
+    average_score: float = 0.0
+    score_stddev: float = 0.0
+    pass_rate: float = 0.0
+    last_attempt: Optional[datetime] = None
+
+    @classmethod
+    def convert_to_response_model(cls, db_model: Optional[QuizAttemptStatsFromModels], **fields):
+        if db_model is None or not db_model.attempts:
+            return cls(**fields)
+        average = db_model.score_sum / db_model.attempts
+        variance = max(db_model.score_sumsq / db_model.attempts - average * average, 0.0)
+        return cls(attempts=db_model.attempts, average_score=average, score_stddev=math.sqrt(variance),
+                   pass_rate=db_model.passed / db_model.attempts, last_attempt=db_model.last_attempt, **fields)
+
+
+class MemberAttemptStatsResponse(AttemptStatsResponse):
+    user_id: int
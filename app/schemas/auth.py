@@ -1,4 +1,6 @@
+from datetime import datetime
 from pydantic import BaseModel
+from typing import List, Optional
 
 
 class Token(BaseModel):
@@ -8,3 +10,19 @@ class Token(BaseModel):
 
 class UserWithPermission(BaseModel):
     permission: bool
+
+
+class Principal(BaseModel):
+    id: int
+    username: str
+    email: str
+    phones: List[str] = []
+    status: Optional[str] = None
+    is_active: bool = False
+    is_superuser: bool = False
+    created: datetime
+    updated: datetime
+    version: int = 0
+
+    class Config:
+        orm_mode = True
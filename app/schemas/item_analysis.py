@@ -0,0 +1,22 @@
+from typing import List, Optional
+from pydantic import BaseModel
+
+
+class AnswerAnalysis(BaseModel):
+    answer_id: int
+    is_correct: bool
+    selection_rate: float
+
+
+class QuestionAnalysis(BaseModel):
+    question_id: int
+    difficulty: float
+    discrimination: Optional[float] = None
+    answers: List[AnswerAnalysis]
+
+
+class QuizAnalysisResponse(BaseModel):
+    quiz_id: int
+    attempts: int
+    cronbach_alpha: Optional[float] = None
+    questions: List[QuestionAnalysis]
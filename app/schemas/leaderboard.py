@@ -0,0 +1,9 @@
+from typing import Optional
+from pydantic import BaseModel
+
+
+class LeaderboardEntry(BaseModel):
+    user_id: int
+    username: Optional[str]
+    rank: int
+    score: float
@@ -1,24 +1,10 @@
 from datetime import datetime
 from pydantic import BaseModel, Field, root_validator
-from typing import List, Optional, Dict
-
-from sqlalchemy import inspect
+from typing import List, Optional
 
 from constants import ANSWER_TEXT_MAXLENGTH, QUESTION_TEXT_MAXLENGTH, QUIZ_NAME_MAXLENGTH, QUIZ_DESCRIPTION_MAXLENGTH
-from db.models import Quiz as QuizFromModels, Base as BaseFromModels, Question as QuestionFromModel, \
-    Answer as AnswerFromModel
-
-
-class ResponseConverter:
-    @staticmethod
-    def get_attrs_sqlalchemy(sqlalchemy_obj: BaseFromModels) -> Dict:
-        sqlalchemy_attrs = {c.key: getattr(sqlalchemy_obj, c.key) for c in inspect(sqlalchemy_obj).mapper.column_attrs}
-        return sqlalchemy_attrs
-
-    @classmethod
-    def convert(cls, sqlalchemy_attrs: Dict) -> BaseModel:
-        instance = cls(**sqlalchemy_attrs)
-        return instance
+from db.models import Quiz as QuizFromModels, Question as QuestionFromModel, Answer as AnswerFromModel
+from utils.service_serializer import ResponseSerializer
 
 
 class AnswerRequestModel(BaseModel):
@@ -53,7 +39,11 @@ class QuizRequestModel(BaseModel):
         return values
 
 
-class AnswerResponseModel(BaseModel, ResponseConverter):
+class QuizImportRequestModel(BaseModel):
+    quizzes: List[QuizRequestModel] = Field(min_items=1)
+
+
+class AnswerResponseModel(BaseModel):
     id: int
     text: str
     is_correct: bool
@@ -63,13 +53,8 @@ class AnswerResponseModel(BaseModel, ResponseConverter):
     class Config:
         orm_mode = True
 
-    @classmethod
-    def convert_answer_db_to_response(cls, answer_db_model: AnswerFromModel):
-        attrs_answers_db = cls.get_attrs_sqlalchemy(sqlalchemy_obj=answer_db_model)
-        return AnswerResponseModel.convert(sqlalchemy_attrs=attrs_answers_db)
 
-
-class QuestionResponseModel(BaseModel, ResponseConverter):
+class QuestionResponseModel(BaseModel):
     id: int
     text: str
     created: datetime
@@ -79,17 +64,6 @@ class QuestionResponseModel(BaseModel, ResponseConverter):
     class Config:
         orm_mode = True
 
-    @classmethod
-    def convert_question_db_to_response(cls, question_db_model: QuestionFromModel):
-        answers_pydantic = []
-        for answer in question_db_model.answers:
-            attrs_answers_db = cls.get_attrs_sqlalchemy(sqlalchemy_obj=answer)
-            answers_pydantic.append(AnswerResponseModel.convert(sqlalchemy_attrs=attrs_answers_db))
-        attrs_question_db = cls.get_attrs_sqlalchemy(sqlalchemy_obj=question_db_model)
-        attrs_question_db["answers"] = answers_pydantic
-        question_response = QuestionResponseModel.convert(sqlalchemy_attrs=attrs_question_db)
-        return question_response
-
 
 class QuizBaseResponse(BaseModel):
     id: int
@@ -102,28 +76,11 @@ class QuizBaseResponse(BaseModel):
         orm_mode = True
 
 
-class QuizResponseModel(QuizBaseResponse, ResponseConverter):
+class QuizResponseModel(QuizBaseResponse):
     description: str
     updated: datetime
     questions: List[QuestionResponseModel]
 
-    @classmethod
-    def convert_quiz_db_to_response(cls, quiz_db_model: QuizFromModels):
-        questions_pydantic = []
-        for question in quiz_db_model.questions:
-            answers_pydantic = []
-            for answer in question.answers:
-                answers_pydantic.append(AnswerResponseModel.convert_answer_db_to_response(answer_db_model=answer))
-            attrs_question_db = cls.get_attrs_sqlalchemy(sqlalchemy_obj=question)
-            attrs_question_db["answers"] = answers_pydantic
-            question_response = QuestionResponseModel.convert(sqlalchemy_attrs=attrs_question_db)
-            questions_pydantic.append(question_response)
-        attrs_quiz_db = cls.get_attrs_sqlalchemy(sqlalchemy_obj=quiz_db_model)
-        attrs_quiz_db["questions"] = questions_pydantic
-        quiz_response = cls.convert(attrs_quiz_db)
-        quiz_response.questions = questions_pydantic
-        return quiz_response
-
 
 class QuizUpdateRequestModel(BaseModel):
     name: Optional[str] = Field(None, max_length=QUIZ_NAME_MAXLENGTH)
@@ -137,3 +94,8 @@ class QuestionUpdateRequestModel(BaseModel):
 class AnswerUpdateRequestModel(BaseModel):
     text: Optional[str] = Field(None, max_length=QUESTION_TEXT_MAXLENGTH)
     is_correct: Optional[bool] = None
+
+
+answer_serializer = ResponseSerializer(AnswerFromModel, AnswerResponseModel)
+question_serializer = ResponseSerializer(QuestionFromModel, QuestionResponseModel, answers=answer_serializer)
+quiz_serializer = ResponseSerializer(QuizFromModels, QuizResponseModel, questions=question_serializer)
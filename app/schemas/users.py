@@ -8,6 +8,7 @@ from constants import USERNAME_MAXLENGTH, PASSWORD_MINLENGTH, USERSTATUS_MAXLENG
 class PaginationParams(BaseModel):
     page: int = 1
     page_size: int = 5
+    cursor: Optional[str] = None
 
 
 class UserBase(BaseModel):
@@ -9,6 +9,13 @@ class Settings:
     APP_HOST = os.getenv("APP_HOST")
     APP_PORT = int(os.getenv("APP_PORT"))
     BASE_URL = f"http://{APP_HOST}:{APP_PORT}"
+    DEBUG = os.getenv("DEBUG", "false").lower() == "true"
+
+    LOG_FILE_PATH = os.getenv("LOG_FILE_PATH", "myapp.log")
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+    LOG_LEVELS = os.getenv("LOG_LEVELS", "sqlalchemy.engine=WARNING,httpx=WARNING")
+    LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", 10 * 1024 * 1024))
+    LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", 5))
 
     POSTGRES_USER: str = os.getenv("POSTGRES_USER")
     POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD")
@@ -17,17 +24,43 @@ class Settings:
     POSTGRES_DB: str = os.getenv("POSTGRES_DB", "tdd")
     POSTGRES_URL = f"postgresql+asyncpg://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_SERVER}:{POSTGRES_PORT}/{POSTGRES_DB}"
 
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 20))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
     REDIS_PORT = int(os.getenv("REDIS_PORT"))
     REDIS_HOST = os.getenv("REDIS_HOST")
+    REDIS_FAKE = os.getenv("REDIS_FAKE", "false").lower() == "true"
+
+    QUIZ_CACHE_TTL = int(os.getenv("QUIZ_CACHE_TTL", 300))
+    PRINCIPAL_CACHE_TTL = int(os.getenv("PRINCIPAL_CACHE_TTL", 60))
+    ANSWER_KEY_CACHE_SIZE = int(os.getenv("ANSWER_KEY_CACHE_SIZE", 1000))
+    ANSWER_KEY_CACHE_TTL = int(os.getenv("ANSWER_KEY_CACHE_TTL", 3600))
+    ITEM_ANALYSIS_CACHE_TTL = int(os.getenv("ITEM_ANALYSIS_CACHE_TTL", 86400))
+
+    ATTEMPTS_WRITE_BEHIND = os.getenv("ATTEMPTS_WRITE_BEHIND", "true").lower() == "true"
+    ATTEMPT_FLUSH_BATCH_SIZE = int(os.getenv("ATTEMPT_FLUSH_BATCH_SIZE", 1000))
+    ATTEMPT_FLUSH_INTERVAL_MS = int(os.getenv("ATTEMPT_FLUSH_INTERVAL_MS", 200))
+    ATTEMPT_CLAIM_IDLE_MS = int(os.getenv("ATTEMPT_CLAIM_IDLE_MS", 30000))
+    ATTEMPT_STREAM_MAX_LAG = int(os.getenv("ATTEMPT_STREAM_MAX_LAG", 100000))
 
     SECRET_KEY = os.getenv("SECRET_KEY")
+    BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+    HASH_WORKERS = int(os.getenv("HASH_WORKERS", 4))
     ALGORITHM = os.getenv("ALGORITHM")
     EXPIRE_TOKEN = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES"))
 
     DOMAIN = os.getenv("DOMAIN")
     API_AUDIENCE = os.getenv("API_AUDIENCE")
     ISSUER = os.getenv("ISSUER")
-    ALGORITHMS = os.getenv("ALGORITHMS"),
+    ALGORITHMS = (os.getenv("ALGORITHMS") or "RS256").split(",")
+    JWKS_URL = os.getenv("JWKS_URL") or f"https://{DOMAIN}/.well-known/jwks.json"
+    JWKS_TTL = int(os.getenv("JWKS_TTL", 3600))
+    JWKS_MISS_TTL = int(os.getenv("JWKS_MISS_TTL", 60))
+    TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", 10000))
+    TOKEN_CACHE_TTL = int(os.getenv("TOKEN_CACHE_TTL", 300))
 
 
 
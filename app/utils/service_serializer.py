@@ -0,0 +1,59 @@
+import json
+from datetime import datetime
+from operator import attrgetter, itemgetter
+from typing import Any, Dict, Iterable, Optional, Type
+
+from pydantic import BaseModel
+from sqlalchemy import DateTime, inspect
+
+
+class ResponseSerializer:
+    """JSON of `response_model` built straight from ORM objects of `entity`.
+
+    The attributes to read, and which of them are datetimes, are resolved from the
+    mapper once. Loaded values are read from the instance __dict__ (falling back to
+    attribute access for expired ones) and no intermediate Pydantic models are built.
+    `children` serialize relationship collections.
+    """
+
+    def __init__(self, entity, response_model: Type[BaseModel], **children: "ResponseSerializer"):
+        columns = inspect(entity).mapper.columns
+        self.children = children
+        self.fields = tuple(name for name in response_model.__fields__ if name not in children)
+        self.datetime_fields = tuple(name for name in self.fields if isinstance(columns[name].type, DateTime))
+        self.item_getter = self.as_tuple(itemgetter(*self.fields))
+        self.attr_getter = self.as_tuple(attrgetter(*self.fields))
+
+    def as_tuple(self, getter):
+        return getter if len(self.fields) > 1 else lambda obj: (getter(obj),)
+
+    def to_dict(self, obj, isoformats: Optional[Dict[datetime, str]] = None) -> Dict[str, Any]:
+        """`isoformats` memoizes formatted datetimes; rows written together share timestamps."""
+        if isoformats is None:
+            isoformats = {}
+        try:
+            values = self.item_getter(obj.__dict__)
+        except KeyError:
+            values = self.attr_getter(obj)
+        item = dict(zip(self.fields, values))
+        for name in self.datetime_fields:
+            value = item[name]
+            if value is not None:
+                formatted = isoformats.get(value)
+                if formatted is None:
+                    formatted = isoformats[value] = value.isoformat()
+                item[name] = formatted
+        for name, child in self.children.items():
+            item[name] = [child.to_dict(child_obj, isoformats) for child_obj in getattr(obj, name)]
+        return item
+
+    @staticmethod
+    def encode(content: Any) -> bytes:
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+    def dumps(self, obj) -> bytes:
+        return self.encode(self.to_dict(obj))
+
+    def dumps_many(self, objs: Iterable) -> bytes:
+        isoformats = {}
+        return self.encode([self.to_dict(obj, isoformats) for obj in objs])
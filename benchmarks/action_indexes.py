@@ -0,0 +1,138 @@
+"""Plans and latency of the Action and membership access paths on seeded data.
+
+Seeds USERS users, COMPANIES companies, ACTIONS invitations/join requests and
+MEMBERSHIPS members and admins, then runs every repository query that filters
+these tables. Each statement the repository executed is re-run under EXPLAIN with
+its original parameters; the script exits with status 1 if a plan falls back to a
+sequential scan on actions, user_company or admin_company.
+"""
+import asyncio
+import sys
+import uuid
+from typing import List, Tuple
+
+from sqlalchemy import delete, event, insert, text
+
+from common import engine, measure, new_session, print_table
+
+from db.models import Action, Company, User, member_company_association, admin_company_association
+from repository.companies import CompanyRepository
+from repository.invites import InviteRepository, InvitesRepository
+from repository.join_requests import JoinRequestsRepository
+from repository.users import UserRepository
+
+USERS = 20_000
+COMPANIES = 2_000
+ACTIONS = 400_000
+MEMBERSHIPS = 100_000
+PAGE_SIZE = 20
+WATCHED_TABLES = ("actions", "user_company", "admin_company")
+
+
+async def seed(session) -> Tuple[List[int], List[int]]:
+    prefix = uuid.uuid4()
+    res = await session.execute(insert(User).returning(User.id), [
+        {"username": f"bench-{prefix}-{i}", "email": f"bench-{prefix}-{i}@example.com", "password": "-"}
+        for i in range(USERS)
+    ])
+    user_ids = res.scalars().all()
+    res = await session.execute(insert(Company).returning(Company.id), [
+        {"company_name": f"bench-{prefix}-{i}", "description": "benchmark"} for i in range(COMPANIES)
+    ])
+    company_ids = res.scalars().all()
+    ids = {"users": user_ids, "companies": company_ids}
+
+    await session.execute(text(
+        "INSERT INTO actions (type_action, company_id, sender_id, recipient_id, status_action, created, updated) "
+        "SELECT (CASE WHEN n % 2 = 0 THEN 'INVITE' ELSE 'JOIN_REQUEST' END)::typeaction, "
+        "CAST(:companies AS INTEGER[])[1 + n % cardinality(CAST(:companies AS INTEGER[]))], "
+        "CAST(:users AS INTEGER[])[1 + (n * 7) % cardinality(CAST(:users AS INTEGER[]))], "
+        "CAST(:users AS INTEGER[])[1 + (n * 13) % cardinality(CAST(:users AS INTEGER[]))], "
+        "'SENT'::statusactionwithsent, now() - n * interval '1 second', now() "
+        "FROM generate_series(1, :rows) AS n"
+    ), {**ids, "rows": ACTIONS})
+    for table, rows in (("user_company", MEMBERSHIPS), ("admin_company", MEMBERSHIPS // 10)):
+        # consecutive runs of USERS rows share a company, so every pair is distinct
+        await session.execute(text(
+            f"INSERT INTO {table} (user_id, company_id) "
+            "SELECT CAST(:users AS INTEGER[])[1 + n % cardinality(CAST(:users AS INTEGER[]))], "
+            "CAST(:companies AS INTEGER[])[1 + n / cardinality(CAST(:users AS INTEGER[]))] "
+            "FROM generate_series(0, :rows - 1) AS n"
+        ), {**ids, "rows": rows})
+    await session.commit()
+    for table in ("users", "company") + WATCHED_TABLES:
+        await session.execute(text(f"ANALYZE {table}"))
+    return user_ids, company_ids
+
+
+async def drop(session, user_ids: List[int], company_ids: List[int]) -> None:
+    await session.execute(delete(Action).where(Action.company_id.in_(company_ids)))
+    for association in (member_company_association, admin_company_association):
+        await session.execute(delete(association).where(association.c.company_id.in_(company_ids)))
+    await session.execute(delete(Company).where(Company.id.in_(company_ids)))
+    await session.execute(delete(User).where(User.id.in_(user_ids)))
+    await session.commit()
+
+
+async def executed_statements(func) -> List[Tuple[str, tuple]]:
+    executed = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        executed.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        await func()
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+    return executed
+
+
+async def sequential_scans(session, func) -> List[str]:
+    scans = []
+    connection = await session.connection()
+    for statement, parameters in await executed_statements(func):
+        plan = (await connection.exec_driver_sql(f"EXPLAIN {statement}", parameters)).scalars().all()
+        scans += [line.strip() for line in plan
+                  if "Seq Scan on " in line and line.split("Seq Scan on ")[1].split()[0] in WATCHED_TABLES]
+    return scans
+
+
+async def main():
+    rows, failures = [], []
+    async with new_session() as session:
+        user_ids, company_ids = await seed(session)
+        user_id, company_id = user_ids[len(user_ids) // 2], company_ids[0]
+        company_repo = CompanyRepository(session, Company)
+        access_paths = (
+            ("received invitations", lambda: InvitesRepository(session, Action).paginate_query(
+                user_id=user_id, page=1, page_size=PAGE_SIZE)),
+            ("sent join requests", lambda: JoinRequestsRepository(session, Action).paginate_query(
+                user_id=user_id, page=1, page_size=PAGE_SIZE)),
+            ("invited users of company", lambda: InviteRepository(session, Action).paginate_query(
+                company_id=company_id, page=1, page_size=PAGE_SIZE)),
+            ("company members", lambda: company_repo.paginate_query(
+                company_id=company_id, page=1, page_size=PAGE_SIZE, join_field="members")),
+            ("company admins", lambda: company_repo.paginate_query(
+                company_id=company_id, page=1, page_size=PAGE_SIZE, join_field="admins")),
+            ("company role", lambda: UserRepository(session, User).get_company_role(
+                user_id=user_id, company_id=company_id)),
+        )
+        try:
+            for name, func in access_paths:
+                scans = await sequential_scans(session, func)
+                timing = await measure(func)
+                rows.append([name, timing["median_ms"], "; ".join(scans) or "none"])
+                failures += [f"{name}: {scan}" for scan in scans]
+        finally:
+            await drop(session, user_ids, company_ids)
+
+    print(f"{ACTIONS} actions, {MEMBERSHIPS} memberships, page size {PAGE_SIZE}")
+    print_table(["access path", "median ms", "sequential scans"], rows)
+    if failures:
+        print("Sequential scans on indexed tables:\n" + "\n".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
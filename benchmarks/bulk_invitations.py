@@ -0,0 +1,66 @@
+"""Inviting a team of RECIPIENTS users into a company.
+
+Compares the single-invite path (InviteRepository.create per recipient, as
+POST /companies/{company_id}/invitations does) with InviteRepository.create_many,
+and a repeated bulk call where every recipient is already invited.
+"""
+import asyncio
+import uuid
+
+from sqlalchemy import delete, insert
+
+from common import create_company, drop_company, measure, new_session, print_table
+
+from db.models import Action, User
+from repository.invites import InviteRepository
+from schemas.action import ActionRequestModel
+
+RECIPIENTS = 500
+
+
+async def seed_users(session, count: int):
+    prefix = uuid.uuid4()
+    res = await session.execute(insert(User).returning(User.id), [
+        {"username": f"bench-{prefix}-{i}", "email": f"bench-{prefix}-{i}@example.com", "password": "-"}
+        for i in range(count)
+    ])
+    user_ids = res.scalars().all()
+    await session.commit()
+    return user_ids
+
+
+async def main():
+    rows = []
+    async with new_session() as session:
+        owner_id, *recipient_ids = await seed_users(session, RECIPIENTS + 1)
+        owner = await session.get(User, owner_id)
+        company = await create_company(session, owner_id=owner_id)
+        repo = InviteRepository(session, Action)
+        try:
+            async def single_invites():
+                for recipient_id in recipient_ids:
+                    await repo.create(company_id=company.id, body=ActionRequestModel(recipient_id=recipient_id),
+                                      user=owner)
+
+            single = await measure(single_invites, repeat=1)
+            rows.append(["single invite loop", single["queries"], single["commits"], single["median_ms"]])
+            await session.execute(delete(Action).where(Action.company_id == company.id))
+            await session.commit()
+
+            bulk = await measure(lambda: repo.create_many(company.id, recipient_ids, owner), repeat=1)
+            rows.append(["bulk", bulk["queries"], bulk["commits"], bulk["median_ms"]])
+            repeated = await measure(lambda: repo.create_many(company.id, recipient_ids, owner))
+            rows.append(["bulk, all already invited", repeated["queries"], repeated["commits"],
+                         repeated["median_ms"]])
+        finally:
+            await session.execute(delete(Action).where(Action.company_id == company.id))
+            await drop_company(session, company.id)
+            await session.execute(delete(User).where(User.id.in_([owner_id, *recipient_ids])))
+            await session.commit()
+
+    print(f"{RECIPIENTS} recipients")
+    print_table(["path", "queries", "commits", "ms"], rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
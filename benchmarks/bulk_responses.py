@@ -0,0 +1,86 @@
+"""Accepting PENDING join requests into one company.
+
+Compares answering them one by one with JoinRequestRepository.response (status
+update plus add_member, which loads the company and the member's companies) on
+a LEGACY_SAMPLE of the requests, with JoinRequestRepository.respond_many over all
+of them in BATCH_SIZE chunks (BULK_RESPONSES_MAXITEMS is the API limit per call).
+"""
+import asyncio
+import time
+import uuid
+
+from sqlalchemy import delete, insert, update
+
+from common import count_queries, create_company, drop_company, new_session, print_table
+
+from db.models import Action, StatusActionForResponse, StatusActionWithSent, TypeAction, User, \
+    member_company_association
+from repository.join_requests import JoinRequestRepository
+
+PENDING = 10_000
+LEGACY_SAMPLE = 500
+BATCH_SIZE = 10_000
+
+
+async def seed(session, company_id: int):
+    prefix = uuid.uuid4()
+    res = await session.execute(insert(User).returning(User.id), [
+        {"username": f"bench-{prefix}-{i}", "email": f"bench-{prefix}-{i}@example.com", "password": "-"}
+        for i in range(PENDING)
+    ])
+    user_ids = res.scalars().all()
+    res = await session.execute(insert(Action).returning(Action.id), [
+        {"type_action": TypeAction.JOIN_REQUEST, "company_id": company_id, "sender_id": user_id,
+         "recipient_id": user_id, "status_action": StatusActionWithSent.SENT} for user_id in user_ids
+    ])
+    action_ids = res.scalars().all()
+    await session.commit()
+    return user_ids, action_ids
+
+
+async def reset(session, company_id: int):
+    await session.execute(update(Action).where(Action.company_id == company_id).
+                          values(status_action=StatusActionWithSent.SENT))
+    await session.execute(delete(member_company_association).
+                          where(member_company_association.c.company_id == company_id))
+    await session.commit()
+
+
+async def main():
+    rows = []
+    async with new_session() as session:
+        company = await create_company(session)
+        user_ids, action_ids = await seed(session, company.id)
+        repo = JoinRequestRepository(session, Action)
+        try:
+            with count_queries() as counter:
+                start = time.perf_counter()
+                for action_id in action_ids[:LEGACY_SAMPLE]:
+                    await repo.response(action_id=action_id, body=StatusActionForResponse.ACCEPTED,
+                                        company_id=company.id)
+                elapsed = time.perf_counter() - start
+            rows.append(["one by one", LEGACY_SAMPLE, counter.count, elapsed * 1000, LEGACY_SAMPLE / elapsed])
+            await reset(session, company.id)
+
+            with count_queries() as counter:
+                start = time.perf_counter()
+                answered = 0
+                for offset in range(0, PENDING, BATCH_SIZE):
+                    answered += len(await repo.respond_many(action_ids[offset:offset + BATCH_SIZE],
+                                                            StatusActionForResponse.ACCEPTED, company.id,
+                                                            TypeAction.JOIN_REQUEST))
+                elapsed = time.perf_counter() - start
+            rows.append(["respond_many", answered, counter.count, elapsed * 1000, answered / elapsed])
+        finally:
+            await reset(session, company.id)
+            await session.execute(delete(Action).where(Action.company_id == company.id))
+            await drop_company(session, company.id)
+            await session.execute(delete(User).where(User.id.in_(user_ids)))
+            await session.commit()
+
+    print(f"{PENDING} pending join requests")
+    print_table(["path", "answered", "queries", "ms", "requests/s"], rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,96 @@
+"""Shared helpers for the benchmark scripts.
+
+Benchmarks run against the database configured in .env (apply migrations with
+`alembic upgrade head` first) and print plain-text tables to stdout.
+Run them from the project root, e.g. `python benchmarks/quiz_loading.py`.
+"""
+import os
+import sys
+import time
+import uuid
+import statistics
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Dict, List
+
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app")
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+
+from sqlalchemy import delete, event, select  # noqa: E402
+from sqlmodel.ext.asyncio.session import AsyncSession  # noqa: E402
+
+from db.connect import engine, async_session_factory  # noqa: E402
+from db.models import Answer, Company, Question, Quiz  # noqa: E402
+
+
+class QueryCounter:
+
+    def __init__(self):
+        self.statements: List[str] = []
+        self.commits = 0
+
+    def on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def on_commit(self, conn):
+        self.commits += 1
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+@contextmanager
+def count_queries():
+    counter = QueryCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter.on_execute)
+    event.listen(engine.sync_engine, "commit", counter.on_commit)
+    try:
+        yield counter
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", counter.on_execute)
+        event.remove(engine.sync_engine, "commit", counter.on_commit)
+
+
+def new_session() -> AsyncSession:
+    return async_session_factory()
+
+
+async def create_company(session: AsyncSession, **kwargs) -> Company:
+    company = Company(company_name=f"bench-{uuid.uuid4()}", description="benchmark", **kwargs)
+    session.add(company)
+    await session.commit()
+    return company
+
+
+async def drop_company(session: AsyncSession, company_id: int) -> None:
+    quiz_ids = select(Quiz.id).where(Quiz.company_id == company_id)
+    question_ids = select(Question.id).where(Question.quiz_id.in_(quiz_ids))
+    await session.execute(delete(Answer).where(Answer.question_id.in_(question_ids)))
+    await session.execute(delete(Question).where(Question.quiz_id.in_(quiz_ids)))
+    await session.execute(delete(Quiz).where(Quiz.company_id == company_id))
+    await session.execute(delete(Company).where(Company.id == company_id))
+    await session.commit()
+
+
+async def measure(func: Callable[[], Awaitable], repeat: int = 5) -> Dict[str, float]:
+    timings = []
+    queries = commits = 0
+    for _ in range(repeat):
+        with count_queries() as counter:
+            start = time.perf_counter()
+            await func()
+            timings.append((time.perf_counter() - start) * 1000)
+        queries, commits = counter.count, counter.commits
+    return {"median_ms": statistics.median(timings), "queries": queries, "commits": commits}
+
+
+def print_table(headers: List[str], rows: List[List]) -> None:
+    widths = [max(len(str(h)), *(len(_fmt(row[i])) for row in rows)) for i, h in enumerate(headers)]
+    print("  ".join(str(h).rjust(w) for h, w in zip(headers, widths)))
+    for row in rows:
+        print("  ".join(_fmt(v).rjust(w) for v, w in zip(row, widths)))
+
+
+def _fmt(value) -> str:
+    return f"{value:.2f}" if isinstance(value, float) else str(value)
@@ -0,0 +1,85 @@
+"""Cost of a company permission check as the number of a user's memberships grows.
+
+Compares loading the user's owner/admin/member collections and scanning them
+(the previous user_permission_* implementation) with CompanyRoleIndex, both on
+a cold cache (one existence query) and a warm one (Redis hash lookup).
+"""
+import asyncio
+import uuid
+
+from sqlalchemy import delete, insert
+
+from common import measure, new_session, print_table
+
+from db.connect import redis_client
+from db.models import Company, User, member_company_association, admin_company_association
+from libs.roles import CompanyRole, CompanyRoleIndex
+from repository.users import UserRepository
+from schemas.auth import Principal
+
+MEMBERSHIP_COUNTS = (10, 1000, 10000)
+
+
+async def seed(session, memberships: int):
+    user = User(username="bench", email=f"bench-{uuid.uuid4()}@example.com", password="-")
+    session.add(user)
+    await session.commit()
+    await session.refresh(user)
+    prefix = uuid.uuid4()
+    res = await session.execute(insert(Company).returning(Company.id), [
+        {"company_name": f"bench-{prefix}-{i}", "description": "benchmark"} for i in range(memberships)
+    ])
+    company_ids = res.scalars().all()
+    await session.execute(insert(member_company_association),
+                          [{"user_id": user.id, "company_id": company_id} for company_id in company_ids])
+    await session.execute(insert(admin_company_association),
+                          [{"user_id": user.id, "company_id": company_id} for company_id in company_ids[::2]])
+    await session.commit()
+    return user, company_ids
+
+
+async def drop(session, user: User, company_ids):
+    await session.execute(delete(member_company_association).where(member_company_association.c.user_id == user.id))
+    await session.execute(delete(admin_company_association).where(admin_company_association.c.user_id == user.id))
+    await session.execute(delete(Company).where(Company.id.in_(company_ids)))
+    await session.execute(delete(User).where(User.id == user.id))
+    await session.commit()
+
+
+async def legacy_check(user_repo: UserRepository, user_id: int, company_id: int) -> bool:
+    user = await user_repo.get_user_with_admin_owner(user_id=user_id)
+    is_admin_owner = company_id in [comp.id for comp in user.owner_of_companies] or \
+        company_id in [comp.id for comp in user.admin_of_companies]
+    user = await user_repo.get_user_with_member_of_companies(user_id=user_id)
+    return is_admin_owner and company_id in [comp.id for comp in user.member_of_companies]
+
+
+async def main():
+    rows = []
+    async with new_session() as session:
+        user_repo = UserRepository(session, User)
+        for memberships in MEMBERSHIP_COUNTS:
+            user, company_ids = await seed(session, memberships)
+            company_id = company_ids[-1]
+            principal = Principal.from_orm(user)
+            role_index = CompanyRoleIndex(redis_client, user_repo, ttl=60)
+            try:
+                legacy = await measure(lambda: legacy_check(user_repo, user.id, company_id))
+
+                async def cold_check():
+                    principal.version += 1
+                    await role_index.has_role(principal, company_id, CompanyRole.ADMIN | CompanyRole.MEMBER)
+
+                cold = await measure(cold_check)
+                warm = await measure(lambda: role_index.has_role(principal, company_id, CompanyRole.MEMBER))
+            finally:
+                await drop(session, user, company_ids)
+            rows.append([memberships, legacy["queries"], legacy["median_ms"], cold["queries"], cold["median_ms"],
+                         warm["queries"], warm["median_ms"]])
+
+    print_table(["memberships", "legacy queries", "legacy ms", "index queries", "index ms",
+                 "cached queries", "cached ms"], rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,74 @@
+"""GET /companies with most companies hidden: page sizes and latency.
+
+Seeds ROWS companies of which only every VISIBLE_EVERY-th one is visible. The legacy
+flow pages over all companies and drops hidden ones in Python (short or empty
+pages); CompaniesRepository filters in SQL over the partial index and pages by
+cursor. Also times the optional total count.
+"""
+import asyncio
+import uuid
+
+from sqlalchemy import delete, select, text
+
+from common import measure, new_session, print_table
+
+from db.models import Company
+from repository.base import Paginateable
+from repository.companies import CompaniesRepository
+
+ROWS = 1_000_000
+VISIBLE_EVERY = 10
+PAGE_SIZE = 20
+PAGES = (1, 100, 2_500, 4_999)
+
+
+async def seed(session, prefix: str) -> None:
+    await session.execute(text(
+        "INSERT INTO company (company_name, description, visible, created, updated) "
+        "SELECT :prefix || n, 'benchmark', n % :every = 0, now() + n * interval '1 millisecond', now() "
+        "FROM generate_series(1, :rows) AS n"
+    ), {"prefix": prefix, "every": VISIBLE_EVERY, "rows": ROWS})
+    await session.commit()
+    await session.execute(text("ANALYZE company"))
+
+
+async def legacy_page(session, page: int):
+    companies = await Paginateable(session).paginate_query(Company, page, PAGE_SIZE)
+    return [company for company in companies if company.visible]
+
+
+async def cursor_for_page(repo: CompaniesRepository, page: int):
+    # walk to the page like a client following X-Next-Cursor, in big steps
+    if page == 1:
+        return None
+    stmt = select(Company).where(repo.visible_filter())
+    await repo.fetch_page(stmt, Company, page - 1, PAGE_SIZE)
+    return repo.next_cursor
+
+
+async def main():
+    prefix = f"bench-{uuid.uuid4()}-"
+    rows = []
+    async with new_session() as session:
+        await seed(session, prefix)
+        repo = CompaniesRepository(session, Company)
+        try:
+            for page in PAGES:
+                legacy_size = len(await legacy_page(session, page))
+                legacy = await measure(lambda: legacy_page(session, page))
+                cursor = await cursor_for_page(repo, page)
+                size = len(await repo.paginate_query(Company, page, PAGE_SIZE, cursor))
+                in_sql = await measure(lambda: repo.paginate_query(Company, page, PAGE_SIZE, cursor))
+                rows.append([page, legacy_size, legacy["median_ms"], size, in_sql["median_ms"]])
+            total = await measure(repo.count_visible)
+        finally:
+            await session.execute(delete(Company).where(Company.company_name.startswith(prefix)))
+            await session.commit()
+
+    print(f"{ROWS} companies, 1 in {VISIBLE_EVERY} visible, page size {PAGE_SIZE}")
+    print_table(["page", "legacy rows", "legacy ms", "sql filter rows", "sql filter + cursor ms"], rows)
+    print(f"with_total count: {total['median_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
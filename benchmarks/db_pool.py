@@ -0,0 +1,66 @@
+"""Throughput of request-shaped DB work (open session, run a query, close) under concurrency.
+
+Compares the previous engine setup (SQL echo on, default 5 + 10 pool) with the
+engine configured from Settings, at 50-500 concurrent requests.
+"""
+import asyncio
+import statistics
+import time
+
+from common import print_table
+
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from db.connect import build_engine
+from db.models import Company
+from db.pool import get_pool_metrics
+from utils.service_config import settings
+
+CONCURRENCY = (50, 100, 250, 500)
+REQUESTS_PER_WORKER = 10
+
+
+async def run(engine, concurrency: int):
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    latencies = []
+
+    async def worker():
+        for _ in range(REQUESTS_PER_WORKER):
+            start = time.perf_counter()
+            async with session_factory() as session:
+                await session.execute(select(Company.id).limit(1))
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "max_wait_ms": get_pool_metrics(engine).get("max_wait_ms", 0.0),
+    }
+
+
+async def main():
+    setups = {
+        "legacy": dict(echo=True, pool_size=5, max_overflow=10, pool_pre_ping=False, pool_recycle=-1),
+        "configured": dict(),
+    }
+    rows = []
+    for name, overrides in setups.items():
+        for concurrency in CONCURRENCY:
+            engine = build_engine(**overrides)
+            result = await run(engine, concurrency)
+            await engine.dispose()
+            rows.append([name, concurrency, result["rps"], result["p50_ms"], result["p99_ms"], result["max_wait_ms"]])
+
+    print(f"pool_size={settings.DB_POOL_SIZE} max_overflow={settings.DB_MAX_OVERFLOW}")
+    print_table(["setup", "concurrency", "req/s", "p50 ms", "p99 ms", "max pool wait ms"], rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
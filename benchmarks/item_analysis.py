@@ -0,0 +1,152 @@
+"""Quiz item analytics over ATTEMPTS stored attempts.
+
+Seeds a QUESTIONS-question quiz with ATTEMPTS attempts drawn from a one-parameter
+logistic model (so difficulty and discrimination vary between questions), then
+times the GET /companies/{company_id}/quizzes/{quiz_id}/analytics miss path:
+AttemptRepository.get_attempt_matrix (one query) and the vectorized
+libs.item_analysis.analyze, against the same statistics computed with Python
+loops on LOOP_ATTEMPTS attempts. The hit path is one Redis GET through
+ItemAnalysisCache.
+"""
+import asyncio
+import math
+import time
+import uuid
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import delete, insert
+
+from common import create_company, drop_company, new_session, print_table
+
+from db.connect import redis_client
+from db.models import Answer, Question, Quiz, QuizAttempt, User
+from libs.answer_key import CompiledAnswerKey
+from libs.cache import VersionedCache
+from libs.item_analysis import ItemAnalysisCache, analyze
+from repository.attempts import AttemptRepository
+
+QUESTIONS = 20
+ANSWERS_PER_QUESTION = 4
+ATTEMPTS = 1000000
+LOOP_ATTEMPTS = 100000
+CHUNK_SIZE = 10000
+
+
+def simulate(answer_key: CompiledAnswerKey, attempts: int, rng: np.random.Generator):
+    question_ids = sorted(answer_key.questions)
+    answers = np.array([sorted(answer_key.questions[question_id][0]) for question_id in question_ids])
+    ability = rng.normal(size=(attempts, 1))
+    difficulty = np.linspace(-2, 2, len(question_ids))
+    results = rng.random((attempts, len(question_ids))) < 1 / (1 + np.exp(difficulty - ability))
+    # the first answer of every question is the correct one, wrong attempts pick a distractor
+    picks = np.where(results, 0, rng.integers(1, ANSWERS_PER_QUESTION, size=results.shape))
+    selected = answers[np.arange(len(question_ids)), picks]
+    return [question_ids] * attempts, results.tolist(), selected.tolist()
+
+
+def loop_analyze(answer_key: CompiledAnswerKey, question_ids, results, answer_ids) -> dict:
+    """The same statistics, one attempt and one question at a time."""
+    questions = sorted(answer_key.questions)
+    attempts = len(results)
+    totals = [sum(row) for row in results]
+    total_mean = sum(totals) / attempts
+    total_variance = sum((total - total_mean) ** 2 for total in totals) / attempts
+    item_variance, discrimination = [], []
+    for question_id in questions:
+        scores = [dict(zip(ids, row)).get(question_id, False) for ids, row in zip(question_ids, results)]
+        p = sum(scores) / attempts
+        rest = [total - score for total, score in zip(totals, scores)]
+        rest_mean = sum(rest) / attempts
+        covariance = sum((score - p) * (value - rest_mean) for score, value in zip(scores, rest)) / attempts
+        rest_variance = sum((value - rest_mean) ** 2 for value in rest) / attempts
+        item_variance.append(p * (1 - p))
+        discrimination.append(covariance / math.sqrt(p * (1 - p) * rest_variance))
+    selections = {}
+    for ids in answer_ids:
+        for answer_id in ids:
+            selections[answer_id] = selections.get(answer_id, 0) + 1
+    alpha = len(questions) / (len(questions) - 1) * (1 - sum(item_variance) / total_variance)
+    return {"discrimination": discrimination, "cronbach_alpha": alpha, "selections": selections}
+
+
+async def seed(session, rng: np.random.Generator):
+    prefix = uuid.uuid4()
+    res = await session.execute(insert(User).returning(User.id), [
+        {"username": f"bench-{prefix}", "email": f"bench-{prefix}@example.com", "password": "-"}
+    ])
+    user_id = res.scalar_one()
+    company = await create_company(session, owner_id=user_id)
+    quiz = Quiz(name="bench analytics", description="benchmark", company_id=company.id, questions=[
+        Question(text=f"question {i}", answers=[Answer(text=f"answer {j}", is_correct=j == 0)
+                                                for j in range(ANSWERS_PER_QUESTION)])
+        for i in range(QUESTIONS)
+    ])
+    session.add(quiz)
+    await session.flush()
+    answer_key = CompiledAnswerKey.compile(quiz)
+    await session.commit()
+
+    question_ids, results, answer_ids = simulate(answer_key, ATTEMPTS, rng)
+    created = datetime.utcnow()
+    for offset in range(0, ATTEMPTS, CHUNK_SIZE):
+        await session.execute(insert(QuizAttempt), [
+            {"attempt_key": uuid.uuid4(), "user_id": user_id, "company_id": company.id, "quiz_id": quiz.id,
+             "correct": sum(row), "total": QUESTIONS, "question_ids": ids, "results": row, "answer_ids": selected,
+             "created": created}
+            for ids, row, selected in zip(question_ids[offset:offset + CHUNK_SIZE],
+                                          results[offset:offset + CHUNK_SIZE],
+                                          answer_ids[offset:offset + CHUNK_SIZE])
+        ])
+        await session.commit()
+    return user_id, company.id, answer_key
+
+
+async def main():
+    rng = np.random.default_rng(0)
+    async with new_session() as session:
+        start = time.perf_counter()
+        user_id, company_id, answer_key = await seed(session, rng)
+        seed_s = time.perf_counter() - start
+    quiz_id = answer_key.quiz_id
+    rows = []
+    try:
+        async with new_session() as session:
+            start = time.perf_counter()
+            matrix = await AttemptRepository(session, QuizAttempt).get_attempt_matrix(quiz_id=quiz_id)
+            rows.append(["load attempt matrix (1 query)", ATTEMPTS, (time.perf_counter() - start) * 1000])
+
+        start = time.perf_counter()
+        analysis = analyze(answer_key, *matrix)
+        rows.append(["analyze, NumPy", ATTEMPTS, (time.perf_counter() - start) * 1000])
+
+        start = time.perf_counter()
+        loop_analyze(answer_key, *(column[:LOOP_ATTEMPTS] for column in matrix))
+        loop_ms = (time.perf_counter() - start) * 1000
+        rows.append(["analyze, Python loops", LOOP_ATTEMPTS, loop_ms])
+        rows.append(["analyze, Python loops (extrapolated)", ATTEMPTS, loop_ms * ATTEMPTS / LOOP_ATTEMPTS])
+
+        cache = ItemAnalysisCache(redis_client, VersionedCache(redis_client, namespace="quiz", ttl=60), ttl=60)
+
+        async def cached():
+            return analysis
+
+        await cache.get(quiz_id, ATTEMPTS, cached)
+        start = time.perf_counter()
+        await cache.get(quiz_id, ATTEMPTS, cached)
+        rows.append(["cached analysis (Redis GET)", ATTEMPTS, (time.perf_counter() - start) * 1000])
+        await redis_client.delete(ItemAnalysisCache.payload_key(quiz_id, 0, ATTEMPTS))
+    finally:
+        async with new_session() as session:
+            await session.execute(delete(QuizAttempt).where(QuizAttempt.quiz_id == quiz_id))
+            await drop_company(session, company_id)
+            await session.execute(delete(User).where(User.id == user_id))
+            await session.commit()
+
+    print(f"{QUESTIONS} questions x {ANSWERS_PER_QUESTION} answers, {ATTEMPTS} attempts seeded in {seed_s:.1f} s, "
+          f"cronbach alpha {analysis['cronbach_alpha']:.3f}")
+    print_table(["path", "attempts", "ms"], rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,71 @@
+"""Leaderboard reads on a MEMBERS-member sorted set.
+
+Fills a temporary company leaderboard through Leaderboards.replace (the rebuild
+path), then times SAMPLES rank lookups (ZREVRANK), top-N pages and around-me
+windows for random members. Needs a real Redis from .env: with REDIS_FAKE=true
+the in-process stand-in sorts on every call and the numbers are meaningless.
+"""
+import asyncio
+import random
+import statistics
+import time
+import uuid
+
+from common import print_table
+
+from db.connect import redis_client
+from libs.leaderboard import Leaderboards
+from utils.service_config import settings
+
+MEMBERS = 1000000
+SAMPLES = 2000
+PAGE_SIZE = 10
+RADIUS = 5
+TARGET_MS = 1.0
+
+
+async def timed(func, samples: int):
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        await func()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.99) - 1]
+
+
+async def main():
+    if settings.REDIS_FAKE:
+        print("REDIS_FAKE=true: run this benchmark against a real Redis")
+    leaderboards = Leaderboards(redis_client)
+    key = f"bench-leaderboard-{uuid.uuid4().hex}"
+
+    start = time.perf_counter()
+    await leaderboards.replace(key, ((user_id, random.randint(0, 100000)) for user_id in range(1, MEMBERS + 1)))
+    fill_s = time.perf_counter() - start
+
+    try:
+        paths = (
+            ("ZREVRANK of a random member", lambda: redis_client.zrevrank(key, random.randint(1, MEMBERS))),
+            (f"top {PAGE_SIZE}", lambda: leaderboards.top(key, 0, PAGE_SIZE)),
+            (f"page of {PAGE_SIZE} at a random offset",
+             lambda: leaderboards.top(key, random.randint(0, MEMBERS - PAGE_SIZE), PAGE_SIZE)),
+            (f"around me, radius {RADIUS}", lambda: leaderboards.around(key, random.randint(1, MEMBERS), RADIUS)),
+            ("record one attempt", lambda: leaderboards.record([{
+                "user_id": random.randint(1, MEMBERS), "company_id": 0, "quiz_id": 0, "correct": 3, "total": 4}])),
+        )
+        rows = []
+        for name, func in paths:
+            median_ms, p99_ms = await timed(func, SAMPLES)
+            rows.append([name, median_ms, p99_ms])
+    finally:
+        await redis_client.delete(key, Leaderboards.company_key(0), Leaderboards.quiz_key(0, 0))
+
+    print(f"{MEMBERS} members filled in {fill_s:.1f} s, {SAMPLES} samples per row")
+    print_table(["read", "median ms", "p99 ms"], rows)
+    verdict = "met" if all(median_ms < TARGET_MS for _, median_ms, _ in rows) else "MISSED"
+    print(f"target median < {TARGET_MS} ms: {verdict}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,80 @@
+"""Request throughput of GET / with logging off, with the legacy synchronous file
+handler and with the QueueHandler/QueueListener pipeline.
+
+Every request logs one INFO line. Requests go through the ASGI app in-process,
+CONCURRENCY at a time; log files are written to a temporary directory. Each mode
+also runs with SLOW_WRITE_MS added to every write, standing in for a slow or
+contended disk: the legacy handler pays it on the event loop, the queue pipeline
+in its writer thread.
+"""
+import asyncio
+import logging
+import os
+import tempfile
+import time
+
+from common import print_table
+
+LOG_DIR = tempfile.mkdtemp(prefix="bench-logs-")
+os.environ["LOG_FILE_PATH"] = os.path.join(LOG_DIR, "queue.log")
+
+from httpx import AsyncClient  # noqa: E402
+
+from core.log_config import LoggingConfig  # noqa: E402
+from main import app  # noqa: E402
+
+REQUESTS = 3000
+CONCURRENCY = 50
+LEGACY_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+SLOW_WRITE_MS = 2
+
+
+def slow_down(handler: logging.Handler) -> None:
+    emit = handler.emit
+
+    def slow_emit(record):
+        time.sleep(SLOW_WRITE_MS / 1000)
+        emit(record)
+
+    handler.emit = slow_emit
+
+
+async def requests_per_second() -> float:
+    async with AsyncClient(app=app, base_url="http://bench") as client:
+        await client.get("/")
+        start = time.perf_counter()
+        for _ in range(REQUESTS // CONCURRENCY):
+            await asyncio.gather(*(client.get("/") for _ in range(CONCURRENCY)))
+        return REQUESTS / (time.perf_counter() - start)
+
+
+async def main():
+    root = logging.getLogger()
+    rows = []
+
+    logging.disable(logging.CRITICAL)
+    logging_off = await requests_per_second()
+    rows.append(["off", logging_off, logging_off])
+    logging.disable(logging.NOTSET)
+
+    queue_fast = await requests_per_second()
+    for handler in LoggingConfig.listener.handlers:
+        slow_down(handler)
+    rows.append(["queue + JSON", queue_fast, await requests_per_second()])
+    LoggingConfig.shutdown()
+
+    legacy_handler = logging.FileHandler(os.path.join(LOG_DIR, "legacy.log"))
+    legacy_handler.setFormatter(logging.Formatter(LEGACY_FORMAT))
+    root.addHandler(legacy_handler)
+    legacy_fast = await requests_per_second()
+    slow_down(legacy_handler)
+    rows.append(["sync file (legacy)", legacy_fast, await requests_per_second()])
+    root.removeHandler(legacy_handler)
+    legacy_handler.close()
+
+    print(f"{REQUESTS} requests, {CONCURRENCY} concurrent, logs in {LOG_DIR}")
+    print_table(["logging", "requests/s", f"requests/s, +{SLOW_WRITE_MS}ms per write"], rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,122 @@
+"""Removing one member and one admin from a company with many members.
+
+Compares the previous CompanyRepository implementation (load the company with its
+whole members/admins collection, remove the user from the list, commit and
+refresh) with the association-table DELETE, and assigning an admin by appending
+to the user's loaded admin_of_companies with the idempotent INSERT. Peak Python
+memory of each call is taken with tracemalloc.
+"""
+import asyncio
+import statistics
+import time
+import tracemalloc
+import uuid
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import joinedload, selectinload
+
+from common import count_queries, create_company, drop_company, new_session, print_table
+
+from db.models import Company, User, member_company_association, admin_company_association
+from repository.companies import CompanyRepository
+
+MEMBER_COUNTS = (1_000, 100_000)
+REPEAT = 5
+
+
+async def seed(session, company_id: int, members: int):
+    prefix = uuid.uuid4()
+    res = await session.execute(insert(User).returning(User.id), [
+        {"username": f"bench-{prefix}-{i}", "email": f"bench-{prefix}-{i}@example.com", "password": "-"}
+        for i in range(members)
+    ])
+    user_ids = res.scalars().all()
+    for association in (member_company_association, admin_company_association):
+        await session.execute(insert(association),
+                              [{"user_id": user_id, "company_id": company_id} for user_id in user_ids])
+    await session.commit()
+    return user_ids
+
+
+async def legacy_remove(session, company_id: int, user_id: int, collection: str):
+    stmt = select(Company).where(Company.id == company_id).options(selectinload(getattr(Company, collection)))
+    company = (await session.execute(stmt)).scalars().one()
+    user = (await session.execute(select(User).where(User.id == user_id))).scalars().one()
+    users = getattr(company, collection)
+    if user in users:
+        users.remove(user)
+    await session.commit()
+    await session.refresh(company)
+
+
+async def legacy_assign_admin(session, company_id: int, user_id: int):
+    company = (await session.execute(select(Company).where(Company.id == company_id))).scalars().one()
+    stmt = select(User).where(User.id == user_id).options(joinedload(User.admin_of_companies))
+    user = (await session.execute(stmt)).scalars().unique().one()
+    user.admin_of_companies.append(company)
+    await session.commit()
+    await session.refresh(user)
+
+
+async def run(session, operation, restore):
+    timings, peaks = [], []
+    for _ in range(REPEAT):
+        await restore()
+        session.expunge_all()
+        tracemalloc.start()
+        with count_queries() as counter:
+            start = time.perf_counter()
+            await operation()
+            timings.append((time.perf_counter() - start) * 1000)
+        peaks.append(tracemalloc.get_traced_memory()[1] / 1024)
+        tracemalloc.stop()
+    return counter.count, statistics.median(timings), max(peaks)
+
+
+async def main():
+    rows = []
+    async with new_session() as session:
+        repo = CompanyRepository(session, Company)
+        for members in MEMBER_COUNTS:
+            company = await create_company(session)
+            user_ids = await seed(session, company.id, members)
+            user_id = user_ids[members // 2]
+
+            async def restore(association):
+                await session.execute(delete(association).where((association.c.company_id == company.id) &
+                                                                (association.c.user_id == user_id)))
+                await session.execute(insert(association).values(user_id=user_id, company_id=company.id))
+                await session.commit()
+
+            async def unassign():
+                await session.execute(delete(admin_company_association).where(
+                    (admin_company_association.c.company_id == company.id) &
+                    (admin_company_association.c.user_id == user_id)))
+                await session.commit()
+
+            cases = (
+                ("remove member", lambda: legacy_remove(session, company.id, user_id, "members"),
+                 lambda: repo.delete_member(company.id, user_id), lambda: restore(member_company_association)),
+                ("remove admin", lambda: legacy_remove(session, company.id, user_id, "admins"),
+                 lambda: repo.delete_admin(company.id, user_id), lambda: restore(admin_company_association)),
+                ("assign admin", lambda: legacy_assign_admin(session, company.id, user_id),
+                 lambda: repo.assign_admin(company.id, user_id), unassign),
+            )
+            try:
+                for name, legacy, direct, reset in cases:
+                    legacy_queries, legacy_ms, legacy_kb = await run(session, legacy, reset)
+                    queries, ms, kb = await run(session, direct, reset)
+                    rows.append([members, name, legacy_queries, legacy_ms, legacy_kb, queries, ms, kb])
+            finally:
+                for association in (member_company_association, admin_company_association):
+                    await session.execute(delete(association).where(association.c.company_id == company.id))
+                await drop_company(session, company.id)
+                await session.execute(delete(User).where(User.id.in_(user_ids)))
+                await session.commit()
+
+    print_table(["members", "operation", "legacy queries", "legacy ms", "legacy peak KiB",
+                 "direct queries", "direct ms", "direct peak KiB"], rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,63 @@
+"""Per-page latency of GET /companies at increasing depth, page mode vs cursor mode.
+
+Seeds ROWS companies (INSERT ... SELECT generate_series), then reads one page at
+several depths. Page mode uses LIMIT/OFFSET, cursor mode starts from the cursor of
+the row just before the page, as a client following X-Next-Cursor would.
+"""
+import asyncio
+import uuid
+
+from sqlalchemy import delete, select, text
+
+from common import measure, new_session, print_table
+
+from db.models import Company
+from repository.companies import CompaniesRepository
+from utils.service_pagination import encode_cursor
+
+ROWS = 1_000_000
+PAGE_SIZE = 20
+DEPTHS = (1, 100, 10_000, 49_999)
+
+
+async def seed(session, prefix: str) -> None:
+    await session.execute(text(
+        "INSERT INTO company (company_name, description, visible, created, updated) "
+        "SELECT :prefix || n, 'benchmark', true, now() + n * interval '1 millisecond', now() "
+        "FROM generate_series(1, :rows) AS n"
+    ), {"prefix": prefix, "rows": ROWS})
+    await session.commit()
+    await session.execute(text("ANALYZE company"))
+
+
+async def cursor_before(session, page: int) -> str:
+    if page == 1:
+        return ""
+    stmt = select(Company.created, Company.id).order_by(Company.created, Company.id) \
+        .offset((page - 1) * PAGE_SIZE - 1).limit(1)
+    created, company_id = (await session.execute(stmt)).one()
+    return encode_cursor(created, company_id)
+
+
+async def main():
+    prefix = f"bench-{uuid.uuid4()}-"
+    rows = []
+    async with new_session() as session:
+        await seed(session, prefix)
+        repo = CompaniesRepository(session, Company)
+        try:
+            for page in DEPTHS:
+                cursor = await cursor_before(session, page)
+                by_page = await measure(lambda: repo.paginate_query(Company, page, PAGE_SIZE))
+                by_cursor = await measure(lambda: repo.paginate_query(Company, page, PAGE_SIZE, cursor))
+                rows.append([page, (page - 1) * PAGE_SIZE, by_page["median_ms"], by_cursor["median_ms"]])
+        finally:
+            await session.execute(delete(Company).where(Company.company_name.startswith(prefix)))
+            await session.commit()
+
+    print(f"{ROWS} companies, page size {PAGE_SIZE}")
+    print_table(["page", "rows skipped", "offset ms", "cursor ms"], rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,70 @@
+"""Queries spent on authentication and permission checks per request.
+
+Compares the previous flow (user by login, then the user again with joined
+owner/admin companies) with get_current_user backed by PrincipalCache, on a
+cold and on a warm cache.
+"""
+import asyncio
+import uuid
+
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import delete
+
+from common import measure, new_session, print_table
+
+from db.connect import redis_client
+from db.models import User
+from libs.auth import create_access_token, get_current_user
+from libs.principal import PrincipalCache
+from libs.roles import CompanyRoleIndex
+from repository.users import UserRepository
+from utils.service_config import settings
+from utils.service_permission import user_permission_admin_owner
+
+COMPANY_ID = 1
+
+
+async def legacy_request(session, login: str):
+    user_repo = UserRepository(session, User)
+    user = await user_repo.get_user_by_login(login=login)
+    await user_repo.get_user_with_admin_owner(user_id=user.id)
+
+
+async def cached_request(session, token: HTTPAuthorizationCredentials, principal_cache: PrincipalCache):
+    principal = await get_current_user(token=token, async_session=session, principal_cache=principal_cache)
+    role_index = CompanyRoleIndex(redis_client, UserRepository(session, User), ttl=settings.PRINCIPAL_CACHE_TTL)
+    try:
+        await user_permission_admin_owner(current_user=principal, company_id=COMPANY_ID, role_index=role_index)
+    except Exception:
+        pass
+
+
+async def main():
+    principal_cache = PrincipalCache(redis_client, ttl=settings.PRINCIPAL_CACHE_TTL)
+    async with new_session() as session:
+        user = User(username="bench", email=f"bench-{uuid.uuid4()}@example.com", password="-")
+        session.add(user)
+        await session.commit()
+        token = HTTPAuthorizationCredentials(scheme="Bearer", credentials=create_access_token({"sub": user.email}))
+        try:
+            legacy = await measure(lambda: legacy_request(session, user.email))
+
+            async def cold_request():
+                await principal_cache.invalidate(user.id)
+                await cached_request(session, token, principal_cache)
+
+            cold = await measure(cold_request)
+            warm = await measure(lambda: cached_request(session, token, principal_cache))
+        finally:
+            await session.execute(delete(User).where(User.id == user.id))
+            await session.commit()
+
+    print_table(["flow", "queries/request", "queries saved", "median ms"], [
+        ["legacy", legacy["queries"], 0, legacy["median_ms"]],
+        ["cache cold", cold["queries"], legacy["queries"] - cold["queries"], cold["median_ms"]],
+        ["cache warm", warm["queries"], legacy["queries"] - warm["queries"], warm["median_ms"]],
+    ])
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,153 @@
+"""Quiz attempt throughput against the 10k submissions/minute target.
+
+Seeds a company with a QUESTIONS-question quiz and MEMBERS users, then submits
+SUBMISSIONS random attempts, CONCURRENCY sessions at a time, the way
+POST /companies/{company_id}/quizzes/{quiz_id}/attempts does: answer key from
+AnswerKeyCache, CompiledAnswerKey.grade, then either one INSERT per attempt or an
+XADD to the write-behind stream, which AttemptWriter then drains in batches of
+ATTEMPT_FLUSH_BATCH_SIZE. For comparison, LEGACY_SUBMISSIONS attempts are graded
+with one query per answered question. Redis is the one configured in .env
+(REDIS_FAKE=true works too).
+"""
+import asyncio
+import random
+import time
+import uuid
+from datetime import datetime
+
+from sqlalchemy import delete, insert, select
+
+from common import create_company, drop_company, new_session, print_table
+
+from db.connect import redis_client
+from db.models import Answer, Question, Quiz, QuizAttempt, User
+from libs.answer_key import AnswerKeyCache, CompiledAnswerKey, LocalAnswerKeys
+from libs.attempt_writer import AttemptWriter, make_attempt_key
+from libs.cache import VersionedCache
+from repository.attempts import AttemptRepository
+from repository.quizzes import QuizRepository
+from utils.service_config import settings
+
+QUESTIONS = 20
+ANSWERS_PER_QUESTION = 4
+MEMBERS = 100
+SUBMISSIONS = 10000
+LEGACY_SUBMISSIONS = 200
+CONCURRENCY = 10
+TARGET_PER_MINUTE = 10000
+
+
+async def seed(session):
+    prefix = uuid.uuid4()
+    res = await session.execute(insert(User).returning(User.id), [
+        {"username": f"bench-{prefix}-{i}", "email": f"bench-{prefix}-{i}@example.com", "password": "-"}
+        for i in range(MEMBERS)
+    ])
+    user_ids = res.scalars().all()
+    company = await create_company(session, owner_id=user_ids[0])
+    quiz = Quiz(name="bench attempts", description="benchmark", company_id=company.id, questions=[
+        Question(text=f"question {i}", answers=[Answer(text=f"answer {j}", is_correct=j == 0)
+                                                for j in range(ANSWERS_PER_QUESTION)])
+        for i in range(QUESTIONS)
+    ])
+    session.add(quiz)
+    await session.commit()
+    return user_ids, company.id, quiz.id
+
+
+def random_submission(answer_key: CompiledAnswerKey):
+    return [(question_id, [random.choice(list(answer_bits))])
+            for question_id, (answer_bits, _) in answer_key.questions.items()]
+
+
+async def legacy_grade(session, submission) -> int:
+    correct = 0
+    for question_id, selected in submission:
+        res = await session.execute(select(Answer.id).where(Answer.question_id == question_id, Answer.is_correct))
+        correct += set(res.scalars().all()) == set(selected)
+    return correct
+
+
+async def main():
+    quiz_cache = VersionedCache(redis_client, namespace="quiz", ttl=60)
+    answer_keys = AnswerKeyCache(redis_client, quiz_cache, LocalAnswerKeys(maxsize=10), ttl=60)
+    rows = []
+
+    async with new_session() as session:
+        user_ids, company_id, quiz_id = await seed(session)
+    try:
+        async with new_session() as session:
+            quiz_repo = QuizRepository(session, Quiz)
+            start = time.perf_counter()
+            answer_key = await answer_keys.get(quiz_id, lambda: quiz_repo.get_quiz_with_questions(quiz_id=quiz_id))
+            compile_ms = (time.perf_counter() - start) * 1000
+        submissions = [random_submission(answer_key) for _ in range(SUBMISSIONS)]
+
+        start = time.perf_counter()
+        for submission in submissions:
+            answer_key.grade(submission)
+        elapsed = time.perf_counter() - start
+        rows.append(["grade only (in process)", SUBMISSIONS / elapsed * 60, elapsed / SUBMISSIONS * 1e6])
+
+        async with new_session() as session:
+            start = time.perf_counter()
+            for submission in submissions[:LEGACY_SUBMISSIONS]:
+                await legacy_grade(session, submission)
+            elapsed = time.perf_counter() - start
+        rows.append(["grade, query per question", LEGACY_SUBMISSIONS / elapsed * 60,
+                     elapsed / LEGACY_SUBMISSIONS * 1e6])
+
+        writer = AttemptWriter(redis_client, new_session, batch_size=settings.ATTEMPT_FLUSH_BATCH_SIZE,
+                               flush_interval_ms=0, claim_idle_ms=settings.ATTEMPT_CLAIM_IDLE_MS,
+                               max_lag=SUBMISSIONS, stream=f"bench-attempts-{uuid.uuid4()}", group="bench")
+        await writer.ensure_group()
+
+        async def submit(chunk, write):
+            async with new_session() as session:
+                quiz_repo = QuizRepository(session, Quiz)
+                attempt_repo = AttemptRepository(session, QuizAttempt)
+                for submission in chunk:
+                    key = await answer_keys.get(quiz_id,
+                                                lambda: quiz_repo.get_quiz_with_questions(quiz_id=quiz_id))
+                    user_id = random.choice(user_ids)
+                    row = AttemptRepository.build_row(make_attempt_key(user_id, quiz_id), quiz_id, company_id,
+                                                      user_id, key.grade(submission), datetime.utcnow())
+                    await write(attempt_repo, row)
+
+        async def insert_directly(attempt_repo, row):
+            await attempt_repo.create_many([row])
+
+        async def append_to_stream(attempt_repo, row):
+            await writer.append(row)
+
+        for name, write in ((f"grade + INSERT, {CONCURRENCY} sessions", insert_directly),
+                            (f"grade + XADD (write-behind), {CONCURRENCY} sessions", append_to_stream)):
+            start = time.perf_counter()
+            await asyncio.gather(*(submit(submissions[n::CONCURRENCY], write) for n in range(CONCURRENCY)))
+            elapsed = time.perf_counter() - start
+            rows.append([name, SUBMISSIONS / elapsed * 60, elapsed / SUBMISSIONS * 1e6])
+        submitted_per_minute = rows[-1][1]
+
+        start = time.perf_counter()
+        while await writer.flush_once():
+            pass
+        elapsed = time.perf_counter() - start
+        rows.append([f"AttemptWriter flush, batches of {writer.batch_size}", writer.flushed / elapsed * 60,
+                     elapsed / max(writer.flushed, 1) * 1e6])
+        await redis_client.delete(writer.stream)
+    finally:
+        async with new_session() as session:
+            await session.execute(delete(QuizAttempt).where(QuizAttempt.quiz_id == quiz_id))
+            await drop_company(session, company_id)
+            await session.execute(delete(User).where(User.id.in_(user_ids)))
+            await session.commit()
+
+    print(f"{QUESTIONS} questions x {ANSWERS_PER_QUESTION} answers, {SUBMISSIONS} submissions, "
+          f"cold answer key compiled in {compile_ms:.2f} ms")
+    print_table(["path", "submissions/min", "us/submission"], rows)
+    verdict = "met" if submitted_per_minute >= TARGET_PER_MINUTE else "MISSED"
+    print(f"target {TARGET_PER_MINUTE} submissions/min: {verdict}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
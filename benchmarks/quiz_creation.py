@@ -0,0 +1,70 @@
+"""Commit count and wall time of creating quizzes.
+
+Compares row-by-row creation (commit and refresh per answer/question, as
+QuizRepository.create used to do) with the single-transaction bulk path of
+QuizRepository.create / create_many.
+"""
+import asyncio
+
+from common import create_company, drop_company, measure, new_session, print_table
+
+from db.models import Quiz, Question, Answer
+from repository.base import BaseEntityRepository
+from repository.quizzes import QuizRepository
+from schemas.quiz import QuizRequestModel
+
+SHAPES = ((5, 4), (20, 4), (100, 4))
+IMPORT_SIZE = 10
+
+
+def make_quiz_body(questions_count: int, answers_count: int) -> QuizRequestModel:
+    return QuizRequestModel(name="bench quiz", description="benchmark", questions=[
+        {"text": f"question {i}", "answers": [
+            {"text": f"answer {j}", "is_correct": j == 0} for j in range(answers_count)
+        ]} for i in range(questions_count)
+    ])
+
+
+async def create_row_by_row(session, quiz_body: QuizRequestModel, company_id: int) -> Quiz:
+    answer_repo = BaseEntityRepository(session, Answer)
+    question_repo = BaseEntityRepository(session, Question)
+    new_questions = []
+    for question in quiz_body.questions:
+        new_answers = [await answer_repo.create(text=answer.text, is_correct=answer.is_correct)
+                       for answer in question.answers]
+        new_questions.append(await question_repo.create(text=question.text, answers=new_answers))
+    return await BaseEntityRepository(session, Quiz).create(name=quiz_body.name, description=quiz_body.description,
+                                                            company_id=company_id, questions=new_questions)
+
+
+async def main():
+    rows = []
+    async with new_session() as session:
+        company = await create_company(session)
+        repo = QuizRepository(session, Quiz)
+        try:
+            for questions_count, answers_count in SHAPES:
+                quiz_body = make_quiz_body(questions_count, answers_count)
+                legacy = await measure(lambda: create_row_by_row(session, quiz_body, company.id))
+                bulk = await measure(lambda: repo.create(quiz_body=quiz_body, company_id=company.id))
+                rows.append([f"1 x {questions_count}x{answers_count}", legacy["commits"], legacy["median_ms"],
+                             bulk["commits"], bulk["median_ms"]])
+
+            quiz_bodies = [make_quiz_body(20, 4)] * IMPORT_SIZE
+            legacy = await measure(lambda: _create_all_row_by_row(session, quiz_bodies, company.id), repeat=1)
+            bulk = await measure(lambda: repo.create_many(quiz_bodies=quiz_bodies, company_id=company.id), repeat=1)
+            rows.append([f"{IMPORT_SIZE} x 20x4", legacy["commits"], legacy["median_ms"],
+                         bulk["commits"], bulk["median_ms"]])
+        finally:
+            await drop_company(session, company.id)
+
+    print_table(["quizzes", "row-by-row commits", "row-by-row ms", "bulk commits", "bulk ms"], rows)
+
+
+async def _create_all_row_by_row(session, quiz_bodies, company_id: int):
+    for quiz_body in quiz_bodies:
+        await create_row_by_row(session, quiz_body, company_id)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,50 @@
+"""Query count and latency of loading a quiz graph (quiz -> questions -> answers).
+
+Compares the old per-question loader with QuizRepository.get_quiz_with_questions
+for a growing number of questions.
+"""
+import asyncio
+
+from common import create_company, drop_company, measure, new_session, print_table
+
+from db.models import Quiz, Question, Answer
+from repository.quizzes import QuizRepository
+
+QUESTION_COUNTS = (5, 50, 200)
+ANSWERS_PER_QUESTION = 4
+
+
+async def seed_quiz(session, questions_count: int) -> Quiz:
+    company = await create_company(session)
+    quiz = Quiz(name="bench quiz", description="benchmark", company_id=company.id, questions=[
+        Question(text=f"question {i}", answers=[
+            Answer(text=f"answer {j}", is_correct=j == 0) for j in range(ANSWERS_PER_QUESTION)
+        ]) for i in range(questions_count)
+    ])
+    session.add(quiz)
+    await session.commit()
+    return quiz
+
+
+async def load_per_question(repo: QuizRepository, quiz_id: int):
+    quiz = await repo.get_entity_with_loading_field(Quiz, quiz_id, "questions")
+    return [await repo.get_entity_with_loading_field(Question, question.id, "answers") for question in quiz.questions]
+
+
+async def main():
+    rows = []
+    async with new_session() as session:
+        repo = QuizRepository(session, Quiz)
+        for questions_count in QUESTION_COUNTS:
+            quiz = await seed_quiz(session, questions_count)
+            session.expunge_all()
+            legacy = await measure(lambda: load_per_question(repo, quiz.id))
+            graph = await measure(lambda: repo.get_quiz_with_questions(quiz_id=quiz.id))
+            rows.append([questions_count, legacy["queries"], legacy["median_ms"], graph["queries"], graph["median_ms"]])
+            await drop_company(session, quiz.company_id)
+
+    print_table(["questions", "per-question queries", "per-question ms", "graph queries", "graph ms"], rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,71 @@
+"""CPU cost of turning a loaded quiz graph into response JSON.
+
+Builds a QUESTIONS-question quiz in memory (no database) and compares the
+previous conversion (mapper inspection and a Pydantic model per object, then
+.json()) with ResponseSerializer writing JSON bytes directly. All rows share
+their timestamps, as rows created in one transaction do.
+"""
+import statistics
+import time
+from datetime import datetime
+
+from sqlalchemy import inspect
+
+from common import print_table
+
+from db.models import Answer, Question, Quiz
+from schemas.quiz import AnswerResponseModel, QuestionResponseModel, QuizResponseModel, quiz_serializer
+
+QUESTIONS = 200
+ANSWERS_PER_QUESTION = 4
+REPEAT = 50
+
+
+def build_quiz() -> Quiz:
+    now = datetime.utcnow()
+    return Quiz(id=1, name="bench quiz", description="benchmark", frequency=0, company_id=1, created=now, updated=now,
+                questions=[Question(id=i, text=f"question {i}", created=now, updated=now, answers=[
+                    Answer(id=i * ANSWERS_PER_QUESTION + j, text=f"answer {j}", is_correct=j == 0, created=now,
+                           updated=now) for j in range(ANSWERS_PER_QUESTION)
+                ]) for i in range(QUESTIONS)])
+
+
+def column_attrs(obj) -> dict:
+    return {c.key: getattr(obj, c.key) for c in inspect(obj).mapper.column_attrs}
+
+
+def legacy_convert(quiz: Quiz) -> bytes:
+    questions = []
+    for question in quiz.questions:
+        answers = [AnswerResponseModel(**column_attrs(answer)) for answer in question.answers]
+        questions.append(QuestionResponseModel(**{**column_attrs(question), "answers": answers}))
+    return QuizResponseModel(**{**column_attrs(quiz), "questions": questions}).json().encode()
+
+
+def timed(func, quiz: Quiz) -> float:
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func(quiz)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    quiz = build_quiz()
+    paths = (
+        ("mapper inspection + models (legacy)", legacy_convert),
+        ("ResponseSerializer", quiz_serializer.dumps),
+    )
+    baseline = timed(paths[0][1], quiz)
+    rows = []
+    for name, func in paths:
+        median_ms = baseline if func is paths[0][1] else timed(func, quiz)
+        rows.append([name, median_ms, baseline / median_ms, len(func(quiz))])
+
+    print(f"{QUESTIONS} questions x {ANSWERS_PER_QUESTION} answers, median of {REPEAT}")
+    print_table(["path", "median ms", "speedup", "bytes"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Latency of ranked company search on a million-row table.
+
+Seeds ROWS visible companies with generated names, then times
+SearchRepository.search_companies for a full word, a word prefix and a name
+substring, against a sequential ILIKE scan over the unindexed description column.
+The index used by each search is read from EXPLAIN.
+"""
+import asyncio
+import uuid
+
+from sqlalchemy import delete, select, text
+
+from common import measure, new_session, print_table
+
+from db.models import Company
+from repository.search import SearchRepository
+
+ROWS = 1_000_000
+PAGE_SIZE = 20
+WORDS = ("atlas", "beacon", "cobalt", "delta", "ember", "falcon", "granite", "harbor", "ion", "juniper")
+
+
+async def seed(session, prefix: str) -> None:
+    await session.execute(text(
+        "INSERT INTO company (company_name, description, visible, created, updated) "
+        "SELECT :prefix || n || ' ' || (:words)[1 + n % 10] || ' ' || substr(md5(n::text), 1, 8), "
+        "'benchmark ' || md5(n::text), true, now(), now() "
+        "FROM generate_series(1, :rows) AS n"
+    ), {"prefix": prefix, "words": list(WORDS), "rows": ROWS})
+    await session.commit()
+    await session.execute(text("ANALYZE company"))
+
+
+async def plan_indexes(session, stmt) -> str:
+    plan = (await session.execute(text(f"EXPLAIN {stmt.compile(compile_kwargs={'literal_binds': True})}"))) \
+        .scalars().all()
+    indexes = sorted({line.split(" on ")[1].split()[0] for line in plan if "Index Scan on " in line})
+    return ", ".join(indexes) or "seq scan"
+
+
+async def main():
+    prefix = f"bench{uuid.uuid4().hex[:8]}-"
+    rows = []
+    async with new_session() as session:
+        await seed(session, prefix)
+        repo = SearchRepository(session)
+        try:
+            sample = (await session.execute(select(Company.company_name)
+                                            .where(Company.company_name.startswith(prefix)).limit(1))).scalar_one()
+            token = sample.split()[-1]
+            for label, query in (("word", "falcon"), ("word prefix", "grani"), ("token prefix", token[:6]),
+                                 ("name substring", " ".join(sample.split()[1:])[:10])):
+                found = len(await repo.search_companies(query, 1, PAGE_SIZE))
+                timing = await measure(lambda: repo.search_companies(query, 1, PAGE_SIZE))
+                rows.append([label, query, found, timing["median_ms"]])
+
+            naive = select(Company).where(Company.description.ilike(f"%{token}%")).limit(PAGE_SIZE)
+            timing = await measure(lambda: session.execute(naive))
+            rows.append(["unindexed ILIKE", token, len((await session.execute(naive)).all()), timing["median_ms"]])
+
+            search_vector = Company.__table__.c.search_vector
+            stmt = select(Company).where(search_vector.op("@@")(text("to_tsquery('simple', 'falcon:*')")))
+            print("tsvector plan uses:", await plan_indexes(session, stmt))
+            stmt = select(Company).where(Company.company_name.ilike(f"%{token[:6]}%"))
+            print("substring plan uses:", await plan_indexes(session, stmt))
+        finally:
+            await session.execute(delete(Company).where(Company.company_name.startswith(prefix)))
+            await session.commit()
+
+    print(f"{ROWS} companies, page size {PAGE_SIZE}")
+    print_table(["search", "query", "rows", "median ms"], rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,76 @@
+"""Latency of an unrelated endpoint during a storm of password verifications.
+
+Runs a stream of GET / requests against the app while sign-in style bcrypt
+verifications arrive every SIGN_IN_INTERVAL seconds, executed either inline on
+the event loop (previous behaviour) or through Hash.verify_password (thread
+pool). Reports the latency distribution of GET /.
+"""
+import asyncio
+import statistics
+import time
+
+from common import print_table
+
+from httpx import AsyncClient
+
+from libs.hash import Hash, pwd_context
+from main import app
+
+STORM_SIZE = 64
+SIGN_IN_INTERVAL = 0.02
+PROBE_INTERVAL = 0.01
+
+
+async def no_verify(plain_password: str, hashed_password: str) -> bool:
+    return True
+
+
+async def verify_inline(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+async def run(verify, hashed_password: str):
+    latencies = []
+    storm_done = asyncio.Event()
+
+    async def probe(client: AsyncClient, scheduled: float):
+        await client.get("/")
+        latencies.append((time.perf_counter() - scheduled) * 1000)
+
+    async def probes(client: AsyncClient):
+        # open loop: each probe is timed from its scheduled start, so event loop stalls count
+        started = time.perf_counter()
+        tasks = []
+        while not storm_done.is_set():
+            scheduled = started + len(tasks) * PROBE_INTERVAL
+            await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+            tasks.append(asyncio.create_task(probe(client, scheduled)))
+        await asyncio.gather(*tasks)
+
+    async def sign_in(delay: float):
+        await asyncio.sleep(delay)
+        await verify("password123", hashed_password)
+
+    async def storm():
+        await asyncio.gather(*(sign_in(i * SIGN_IN_INTERVAL) for i in range(STORM_SIZE)))
+        storm_done.set()
+
+    async with AsyncClient(app=app, base_url="http://bench") as client:
+        await asyncio.gather(probes(client), storm())
+
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(len(latencies) * 0.99) - 1], latencies[-1], len(latencies)
+
+
+async def main():
+    hashed_password = await Hash.get_password_hash("password123")
+    rows = []
+    for name, verify in (("none", no_verify), ("inline", verify_inline), ("executor", Hash.verify_password)):
+        rows.append([name, *await run(verify, hashed_password)])
+
+    print(f"{STORM_SIZE} verifications per run")
+    print_table(["hashing", "GET / p50 ms", "GET / p99 ms", "GET / max ms", "probes"], rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+"""Token verification cost per request, with and without the verified-token cache.
+
+Verifies the same bearer token REQUESTS times, the way a client reuses its token,
+for a custom HS256 token and an Auth0-style RS256 token (keys served from a local
+JWKS file). "before" runs the verifier on every request, "after" consults
+VerifiedTokenCache first, as get_current_user does.
+"""
+import asyncio
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import jwt as pyjwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi.security import HTTPAuthorizationCredentials
+
+from common import print_table
+
+from libs.auth import create_access_token
+from libs.jwks import JWKSKeyStore
+from libs.token_cache import VerifiedTokenCache
+from libs.tokens import VerifyAuth0Token, VerifyCustomToken
+from utils.service_config import settings
+
+REQUESTS = 5000
+
+
+def auth0_setup(directory: str):
+    settings.ISSUER, settings.API_AUDIENCE = "https://bench.example.com/", "bench"
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(pyjwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update({"kid": "bench", "use": "sig"})
+    path = os.path.join(directory, "jwks.json")
+    with open(path, "w") as jwks_file:
+        json.dump({"keys": [jwk]}, jwks_file)
+
+    claims = {"email": "bench@example.com", "iss": settings.ISSUER, "aud": settings.API_AUDIENCE,
+              "exp": datetime.utcnow() + timedelta(minutes=30)}
+    credentials = pyjwt.encode(claims, private_key, algorithm="RS256", headers={"kid": "bench"})
+    store = JWKSKeyStore(f"file://{path}", ttl=3600, miss_ttl=60)
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=credentials), \
+        lambda token: VerifyAuth0Token(token, key_store=store)
+
+
+async def per_request_us(token, make_verifier, cache: VerifiedTokenCache = None) -> float:
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        if cache is not None and cache.get(token.credentials) is not None:
+            continue
+        result = await make_verifier(token).verify()
+        assert "payload" in result, result
+        if cache is not None:
+            cache.set(token.credentials, result["payload"], result["mark"])
+    return (time.perf_counter() - start) / REQUESTS * 1_000_000
+
+
+async def main():
+    custom_token = HTTPAuthorizationCredentials(scheme="Bearer", credentials=create_access_token({"sub": "bench"}))
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        auth0_token, auth0_verifier = auth0_setup(directory)
+        for name, token, make_verifier in (("custom HS256", custom_token, VerifyCustomToken),
+                                           ("auth0 RS256", auth0_token, auth0_verifier)):
+            await make_verifier(token).verify()
+            before = await per_request_us(token, make_verifier)
+            cache = VerifiedTokenCache(maxsize=settings.TOKEN_CACHE_SIZE, max_ttl=settings.TOKEN_CACHE_TTL)
+            after = await per_request_us(token, make_verifier, cache)
+            rows.append([name, before, after, before / after, cache.stats.hit_rate])
+
+    print(f"{REQUESTS} requests reusing one token")
+    print_table(["token", "before us/request", "after us/request", "speedup", "hit rate"], rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
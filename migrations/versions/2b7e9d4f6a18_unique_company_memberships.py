@@ -0,0 +1,34 @@
+"""unique company memberships
+
+Revision ID: 2b7e9d4f6a18
+Revises: 5e8a1f3c9d47
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from db.connect import Base
+
+
+# revision identifiers, used by Alembic.
+revision = '2b7e9d4f6a18'
+down_revision = '5e8a1f3c9d47'
+branch_labels = None
+depends_on = None
+
+MEMBERSHIP_TABLES = ('user_company', 'admin_company')
+
+
+def upgrade() -> None:
+    for table in MEMBERSHIP_TABLES:
+        # appending to the relationship collections could store the same membership twice
+        op.execute(sa.text(
+            f"DELETE FROM {table} a USING {table} b "
+            f"WHERE a.ctid > b.ctid AND a.user_id = b.user_id AND a.company_id = b.company_id"
+        ))
+        op.create_unique_constraint(f'uq_{table}_user_id_company_id', table, ['user_id', 'company_id'])
+
+
+def downgrade() -> None:
+    for table in MEMBERSHIP_TABLES:
+        op.drop_constraint(f'uq_{table}_user_id_company_id', table, type_='unique')
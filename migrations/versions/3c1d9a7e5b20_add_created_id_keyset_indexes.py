@@ -0,0 +1,31 @@
+"""add (created, id) indexes for keyset pagination
+
+Revision ID: 3c1d9a7e5b20
+Revises: e6f7aa9ace9d
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from db.connect import Base
+
+
+# revision identifiers, used by Alembic.
+revision = '3c1d9a7e5b20'
+down_revision = 'e6f7aa9ace9d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_users_created_id', 'users', ['created', 'id'], unique=False)
+    op.create_index('ix_company_created_id', 'company', ['created', 'id'], unique=False)
+    op.create_index('ix_quizzes_created_id', 'quizzes', ['created', 'id'], unique=False)
+    op.create_index('ix_actions_created_id', 'actions', ['created', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_actions_created_id', table_name='actions')
+    op.drop_index('ix_quizzes_created_id', table_name='quizzes')
+    op.drop_index('ix_company_created_id', table_name='company')
+    op.drop_index('ix_users_created_id', table_name='users')
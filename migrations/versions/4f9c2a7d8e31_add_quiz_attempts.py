@@ -0,0 +1,46 @@
+"""add quiz attempts
+
+Revision ID: 4f9c2a7d8e31
+Revises: 7c4a2e9b1d56
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from db.connect import Base
+
+
+# revision identifiers, used by Alembic.
+revision = '4f9c2a7d8e31'
+down_revision = '7c4a2e9b1d56'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('quiz_attempts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('company_id', sa.Integer(), nullable=False),
+    sa.Column('quiz_id', sa.Integer(), nullable=False),
+    sa.Column('correct', sa.Integer(), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.Column('question_ids', sa.ARRAY(sa.Integer()), nullable=False),
+    sa.Column('results', sa.ARRAY(sa.Boolean()), nullable=False),
+    sa.Column('answer_ids', sa.ARRAY(sa.Integer()), nullable=False),
+    sa.Column('created', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['company_id'], ['company.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['quiz_id'], ['quizzes.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_quiz_attempts_quiz_id_created_id', 'quiz_attempts', ['quiz_id', 'created', 'id'],
+                    unique=False)
+    op.create_index('ix_quiz_attempts_user_id_company_id', 'quiz_attempts', ['user_id', 'company_id'],
+                    unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_quiz_attempts_user_id_company_id', table_name='quiz_attempts')
+    op.drop_index('ix_quiz_attempts_quiz_id_created_id', table_name='quiz_attempts')
+    op.drop_table('quiz_attempts')
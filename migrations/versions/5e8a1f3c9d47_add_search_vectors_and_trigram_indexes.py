@@ -0,0 +1,53 @@
+"""add search vectors and trigram indexes
+
+Revision ID: 5e8a1f3c9d47
+Revises: 8d2f4b6c1a93
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from db.connect import Base
+
+
+# revision identifiers, used by Alembic.
+revision = '5e8a1f3c9d47'
+down_revision = '8d2f4b6c1a93'
+branch_labels = None
+depends_on = None
+
+SEARCH_VECTORS = {
+    'users': ('username', 'email'),
+    'company': ('company_name', 'description'),
+    'quizzes': ('name', 'description'),
+}
+TRIGRAM_INDEXES = {
+    'ix_users_username_trgm': ('users', 'username'),
+    'ix_users_email_trgm': ('users', 'email'),
+    'ix_company_company_name_trgm': ('company', 'company_name'),
+    'ix_quizzes_name_trgm': ('quizzes', 'name'),
+}
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for table, (primary, secondary) in SEARCH_VECTORS.items():
+        op.add_column(table, sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(
+            f"setweight(to_tsvector('simple', coalesce({primary}, '')), 'A') || "
+            f"setweight(to_tsvector('simple', coalesce({secondary}, '')), 'B')",
+            persisted=True
+        )))
+        op.create_index(f'ix_{table}_search_vector', table, ['search_vector'], unique=False,
+                        postgresql_using='gin')
+    for name, (table, column) in TRIGRAM_INDEXES.items():
+        op.create_index(name, table, [column], unique=False, postgresql_using='gin',
+                        postgresql_ops={column: 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    for name, (table, column) in TRIGRAM_INDEXES.items():
+        op.drop_index(name, table_name=table)
+    for table in SEARCH_VECTORS:
+        op.drop_index(f'ix_{table}_search_vector', table_name=table)
+        op.drop_column(table, 'search_vector')
@@ -0,0 +1,31 @@
+"""add quiz attempt keys
+
+Revision ID: 6a3e8c1f7b24
+Revises: 4f9c2a7d8e31
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from db.connect import Base
+
+
+# revision identifiers, used by Alembic.
+revision = '6a3e8c1f7b24'
+down_revision = '4f9c2a7d8e31'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # existing attempts get random keys; new ones are keyed by the application
+    op.add_column('quiz_attempts', sa.Column('attempt_key', postgresql.UUID(as_uuid=True), nullable=False,
+                                             server_default=sa.text('gen_random_uuid()')))
+    op.alter_column('quiz_attempts', 'attempt_key', server_default=None)
+    op.create_unique_constraint('quiz_attempts_attempt_key_key', 'quiz_attempts', ['attempt_key'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('quiz_attempts_attempt_key_key', 'quiz_attempts', type_='unique')
+    op.drop_column('quiz_attempts', 'attempt_key')
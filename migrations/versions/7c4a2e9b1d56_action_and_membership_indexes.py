@@ -0,0 +1,36 @@
+"""action and membership indexes
+
+Revision ID: 7c4a2e9b1d56
+Revises: 2b7e9d4f6a18
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from db.connect import Base
+
+
+# revision identifiers, used by Alembic.
+revision = '7c4a2e9b1d56'
+down_revision = '2b7e9d4f6a18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_actions_recipient_id_type_action_created_id', 'actions',
+                    ['recipient_id', 'type_action', 'created', 'id'], unique=False)
+    op.create_index('ix_actions_sender_id_type_action_created_id', 'actions',
+                    ['sender_id', 'type_action', 'created', 'id'], unique=False)
+    op.create_index('ix_actions_company_id_type_action_recipient_id', 'actions',
+                    ['company_id', 'type_action', 'recipient_id'], unique=False)
+    op.create_index('ix_user_company_company_id_user_id', 'user_company', ['company_id', 'user_id'], unique=False)
+    op.create_index('ix_admin_company_company_id_user_id', 'admin_company', ['company_id', 'user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_admin_company_company_id_user_id', table_name='admin_company')
+    op.drop_index('ix_user_company_company_id_user_id', table_name='user_company')
+    op.drop_index('ix_actions_company_id_type_action_recipient_id', table_name='actions')
+    op.drop_index('ix_actions_sender_id_type_action_created_id', table_name='actions')
+    op.drop_index('ix_actions_recipient_id_type_action_created_id', table_name='actions')
@@ -0,0 +1,28 @@
+"""partial index on visible companies
+
+Revision ID: 8d2f4b6c1a93
+Revises: 3c1d9a7e5b20
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from db.connect import Base
+
+
+# revision identifiers, used by Alembic.
+revision = '8d2f4b6c1a93'
+down_revision = '3c1d9a7e5b20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_company_visible_created_id', 'company', ['created', 'id'], unique=False,
+                    postgresql_where=sa.text('visible'))
+    op.drop_index('ix_company_created_id', table_name='company')
+
+
+def downgrade() -> None:
+    op.create_index('ix_company_created_id', 'company', ['created', 'id'], unique=False)
+    op.drop_index('ix_company_visible_created_id', table_name='company')
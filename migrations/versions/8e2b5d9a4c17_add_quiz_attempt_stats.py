@@ -0,0 +1,50 @@
+"""add quiz attempt stats
+
+Revision ID: 8e2b5d9a4c17
+Revises: 6a3e8c1f7b24
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from db.connect import Base
+
+
+# revision identifiers, used by Alembic.
+revision = '8e2b5d9a4c17'
+down_revision = '6a3e8c1f7b24'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('quiz_attempt_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('company_id', sa.Integer(), nullable=False),
+    sa.Column('quiz_id', sa.Integer(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('score_sum', sa.Float(), nullable=False),
+    sa.Column('score_sumsq', sa.Float(), nullable=False),
+    sa.Column('passed', sa.Integer(), nullable=False),
+    sa.Column('last_attempt', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('user_id', 'company_id', 'quiz_id')
+    )
+    op.create_index('ix_quiz_attempt_stats_company_id_quiz_id_user_id', 'quiz_attempt_stats',
+                    ['company_id', 'quiz_id', 'user_id'], unique=False)
+    # backfill from the attempts stored so far, see AttemptStatsRepository.recompute_query
+    op.execute(sa.text("""
+        INSERT INTO quiz_attempt_stats
+            (user_id, company_id, quiz_id, attempts, score_sum, score_sumsq, passed, last_attempt)
+        SELECT coalesce(user_id, 0), coalesce(company_id, 0), coalesce(quiz_id, 0), count(*), sum(score),
+               sum(score * score), count(*) FILTER (WHERE score >= 0.5), max(created)
+        FROM (SELECT user_id, company_id, quiz_id, created,
+                     coalesce(correct::float / nullif(total, 0)::float, 0.0) AS score
+              FROM quiz_attempts) AS attempts
+        GROUP BY GROUPING SETS ((user_id, company_id, quiz_id), (user_id), (user_id, company_id),
+                                (company_id, quiz_id), (company_id))
+    """))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_quiz_attempt_stats_company_id_quiz_id_user_id', table_name='quiz_attempt_stats')
+    op.drop_table('quiz_attempt_stats')
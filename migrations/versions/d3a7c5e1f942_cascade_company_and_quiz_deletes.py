@@ -0,0 +1,48 @@
+"""cascade company and quiz deletes
+
+Revision ID: d3a7c5e1f942
+Revises: 8e2b5d9a4c17
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from db.connect import Base
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3a7c5e1f942'
+down_revision = '8e2b5d9a4c17'
+branch_labels = None
+depends_on = None
+
+# (table, column, referred table) of the foreign keys a company or quiz delete cascades over
+CASCADES = [
+    ('user_company', 'company_id', 'company'),
+    ('admin_company', 'company_id', 'company'),
+    ('actions', 'company_id', 'company'),
+    ('quizzes', 'company_id', 'company'),
+    ('questions', 'quiz_id', 'quizzes'),
+    ('answers', 'question_id', 'questions'),
+]
+
+
+def replace_foreign_keys(ondelete) -> None:
+    for table, column, referred in CASCADES:
+        name = f'{table}_{column}_fkey'
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, referred, [column], ['id'], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    replace_foreign_keys(ondelete='CASCADE')
+    op.create_index('ix_quizzes_company_id', 'quizzes', ['company_id'], unique=False)
+    op.create_index('ix_questions_quiz_id', 'questions', ['quiz_id'], unique=False)
+    op.create_index('ix_answers_question_id', 'answers', ['question_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_answers_question_id', table_name='answers')
+    op.drop_index('ix_questions_quiz_id', table_name='questions')
+    op.drop_index('ix_quizzes_company_id', table_name='quizzes')
+    replace_foreign_keys(ondelete=None)
@@ -0,0 +1,14 @@
+"""Request bodies and sign-up shared by the tests that run against Postgres."""
+
+
+def quiz_body(name: str) -> dict:
+    answers = [{"text": "yes", "is_correct": True}, {"text": "no"}, {"text": "maybe"}]
+    return {"name": name, "description": "budget",
+            "questions": [{"text": f"question {n}", "answers": answers} for n in range(3)]}
+
+
+async def sign_up(ac, name: str):
+    email = f"{name}@example.com"
+    user = (await ac.post("/auth/signup", json={"username": name, "email": email, "password": "password123"})).json()
+    token = (await ac.post("/auth/signin", json={"email": email, "password": "password123"})).json()
+    return user, {"Authorization": f"Bearer {token['access_token']}"}
@@ -1,11 +1,57 @@
+import asyncio
+import os
+
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import text
+
+os.environ.setdefault("REDIS_FAKE", "true")
 
 from app.main import app
 from app.utils.service_config import settings
+from db.connect import engine
+from libs.metrics import metrics_registry
+from tests.query_budget import QUERY_BUDGETS, QueryBudgetRecorder
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def database():
+    """Skips the test when Postgres from .env is not reachable."""
+    async def ping():
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    try:
+        await asyncio.wait_for(ping(), timeout=5)
+    except Exception as e:
+        pytest.skip(f"Postgres is not reachable: {e}")
+    yield
+    await engine.dispose()
 
 
 @pytest.fixture(scope="function")
 async def ac():
     async with AsyncClient(app=app, base_url=settings.BASE_URL) as ac:
         yield ac
+
+
+@pytest.fixture(autouse=True)
+def query_budget(monkeypatch):
+    recorder = QueryBudgetRecorder(QUERY_BUDGETS)
+    observe = metrics_registry.observe
+
+    def observe_and_check(method, route, latency, request_stats):
+        observe(method, route, latency, request_stats)
+        recorder.check(method, route, request_stats)
+
+    monkeypatch.setattr(metrics_registry, "observe", observe_and_check)
+    recorder.listen(engine)
+    yield recorder
+    recorder.remove(engine)
+    if recorder.violations:
+        pytest.fail(recorder.report(), pytrace=False)
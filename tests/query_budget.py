@@ -0,0 +1,148 @@
+"""Per-route SQL statement budgets for the test suite.
+
+Every request served during a test is checked when it finishes: the statements
+executed on `db.connect.engine` while serving it are counted against
+QUERY_BUDGETS["<METHOD> <route template>"]. Budgets assume cold principal, role
+and quiz caches; a route over its budget, or without one, fails the test and the
+report lists the statement shapes that were executed more than once.
+"""
+import re
+from collections import Counter
+from typing import Dict, List
+
+from sqlalchemy import event
+
+from libs.metrics import RequestStats, request_stats_var
+
+QUERY_BUDGETS: Dict[str, int] = {
+    "POST /auth/signin": 2,
+    "POST /auth/signup": 3,
+
+    "GET /users/": 3,
+    "GET /users/{user_id}": 3,
+    "PUT /users/{user_id}": 5,
+    "PATCH /users/{user_id}": 5,
+    # the user's attempts come out of the stats first, then the ORM loads every relationship of
+    # the user before deleting it
+    "DELETE /users/{user_id}": 13,
+    "GET /users/me/": 1,
+
+    "GET /companies/": 3,
+    "POST /companies/": 4,
+    "GET /companies/{company_id}": 3,
+    "PUT /companies/{company_id}": 6,
+    # lock the company, read its members and admins, subtract its attempts from the stats and drop
+    # emptied rows, delete; the rest goes by ON DELETE CASCADE
+    "DELETE /companies/{company_id}": 7,
+    "DELETE /companies/{company_id}/members/{member_id}": 4,
+    "DELETE /companies/{company_id}/leave": 4,
+    "GET /companies/{company_id}/members": 3,
+    "POST /companies/{company_id}/admins/{user_id}": 4,
+    "DELETE /companies/{company_id}/admins/{user_id}": 4,
+    "GET /companies/{company_id}/admins": 3,
+
+    "POST /companies/{company_id}/invitations": 5,
+    "POST /companies/{company_id}/invitations/bulk": 5,
+    "DELETE /companies/{company_id}/invitations/{invitation_id}": 5,
+    "PATCH /companies/{company_id}/invitations/{invitation_id}/response/{response_type}": 7,
+    "PATCH /companies/{company_id}/invitations/bulk-response": 5,
+    "GET /companies/{company_id}/invited-users": 4,
+    "POST /companies/{company_id}/join-requests": 4,
+    "DELETE /companies/{company_id}/join-requests/{join_requests_id}": 5,
+    "POST /companies/{company_id}/join-requests/{join_requests_id}/response": 7,
+    "POST /companies/{company_id}/join-requests/bulk-response": 5,
+    "GET /user-action/user_id/me/join-requests": 3,
+    "GET /user-action/user_id/me/invitations": 3,
+
+    "GET /companies/{company_id}/quizzes": 4,
+    "POST /companies/{company_id}/quizzes": 10,
+    "GET /companies/{company_id}/quizzes/{quiz_id}": 6,
+    "PUT /companies/{company_id}/quizzes/{quiz_id}": 9,
+    # lock the quiz, subtract its attempts from the stats and drop emptied rows, delete; questions,
+    # answers and attempts go by ON DELETE CASCADE
+    "DELETE /companies/{company_id}/quizzes/{quiz_id}": 6,
+    "POST /companies/{company_id}/quizzes/import": 10,
+    "POST /companies/{company_id}/quizzes/{quiz_id}/questions": 8,
+    # the question's quiz and company are checked against the path first
+    "PUT /companies/{company_id}/quizzes/{quiz_id}/questions/{question_id}": 8,
+    "DELETE /companies/{company_id}/quizzes/{quiz_id}/questions/{question_id}": 9,
+    # likewise the answer's question, quiz and company
+    "POST /companies/{company_id}/quizzes/{quiz_id}/questions/{question_id}/answers": 10,
+    "PUT /companies/{company_id}/quizzes/{quiz_id}/questions/{question_id}/answers/{answer_id}": 10,
+    "DELETE /companies/{company_id}/quizzes/{quiz_id}/questions/{question_id}/answers/{answer_id}": 8,
+    # a cold answer key loads the quiz graph (3); the insert and the stats upsert only run when the
+    # write-behind stream lags
+    "POST /companies/{company_id}/quizzes/{quiz_id}/attempts": 7,
+    # ranks come from Redis, usernames of the page from one query
+    "GET /companies/{company_id}/leaderboard": 3,
+    "GET /companies/{company_id}/leaderboard/me": 3,
+    "GET /companies/{company_id}/quizzes/{quiz_id}/leaderboard": 3,
+    "GET /companies/{company_id}/quizzes/{quiz_id}/leaderboard/me": 3,
+    # one summary row (or one page of them) per request
+    "GET /users/{user_id}/quiz-stats": 2,
+    "GET /companies/{company_id}/quiz-stats": 3,
+    "GET /companies/{company_id}/quiz-stats/members": 3,
+    "GET /companies/{company_id}/quizzes/{quiz_id}/stats": 3,
+    # a cold answer key loads the quiz graph (3); the attempt matrix is only loaded when new attempts arrived
+    "GET /companies/{company_id}/quizzes/{quiz_id}/analytics": 7,
+
+    "GET /search/companies": 2,
+    "GET /search/users": 2,
+    "GET /search/companies/{company_id}/quizzes": 3,
+
+    "GET /": 0,
+    "GET /pool-metrics": 0,
+    "GET /cache-metrics": 0,
+    "GET /metrics": 0,
+}
+
+_WHITESPACE = re.compile(r"\s+")
+_PARAMETER = re.compile(r"\$\d+|%\(\w+\)s|'(?:[^']|'')*'|\b\d+\b")
+_PARAMETER_LIST = re.compile(r"\(\?(?:, \?)+\)")
+SHAPE_MAXLENGTH = 200
+
+
+def statement_shape(statement: str) -> str:
+    """The statement with whitespace collapsed and parameters and literals replaced by `?`."""
+    shape = _PARAMETER.sub("?", _WHITESPACE.sub(" ", statement).strip())
+    return _PARAMETER_LIST.sub("(?, ...)", shape)
+
+
+class QueryBudgetRecorder:
+    """Collects the statements of each request and checks them against the budgets."""
+
+    def __init__(self, budgets: Dict[str, int]):
+        self.budgets = budgets
+        self.statements: Dict[int, List[str]] = {}
+        self.violations: List[str] = []
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        request_stats = request_stats_var.get()
+        if request_stats is not None:
+            self.statements.setdefault(id(request_stats), []).append(statement)
+
+    def listen(self, engine) -> None:
+        event.listen(getattr(engine, "sync_engine", engine), "before_cursor_execute", self.before_cursor_execute)
+
+    def remove(self, engine) -> None:
+        event.remove(getattr(engine, "sync_engine", engine), "before_cursor_execute", self.before_cursor_execute)
+
+    def check(self, method: str, route: str, request_stats: RequestStats) -> None:
+        statements = self.statements.pop(id(request_stats), [])
+        if route == "unmatched":
+            return
+
+        key = f"{method} {route}"
+        budget = self.budgets.get(key)
+        if budget is None:
+            self.violations.append(f"{key}: no query budget declared ({len(statements)} statements)")
+        elif len(statements) > budget:
+            lines = [f"{key}: {len(statements)} statements, budget {budget}"]
+            repeated = Counter(statement_shape(statement) for statement in statements)
+            for shape, count in repeated.most_common():
+                if count > 1:
+                    lines.append(f"    {count}x {shape[:SHAPE_MAXLENGTH]}")
+            self.violations.append("\n".join(lines))
+
+    def report(self) -> str:
+        return "Query budget exceeded:\n" + "\n".join(self.violations)
@@ -0,0 +1,62 @@
+"""An AsyncSession stand-in for repository tests that do not need Postgres."""
+from typing import Any, List
+
+from sqlalchemy.dialects import postgresql
+
+
+class ScriptedResult(list):
+    """The rows of one execute, readable the ways the repositories read results."""
+
+    def __init__(self, rows=(), rowcount: int = 1):
+        super().__init__(rows)
+        self.rowcount = rowcount
+
+    def all(self) -> list:
+        return list(self)
+
+    def scalars(self) -> "ScriptedResult":
+        return self
+
+    def scalar_one(self):
+        [row] = self
+        return row
+
+
+class RecordingSession:
+    """Records every statement and answers each execute with the next scripted result.
+
+    A scripted result is a list of rows, an exception to raise, or a callable that
+    receives the statement and returns either. Once the script runs out, `default`
+    answers every further execute.
+    """
+
+    def __init__(self, *results, default: Any = (), rowcount: int = 1):
+        self.results = list(results)
+        self.default = default
+        self.rowcount = rowcount
+        self.statements: List[Any] = []
+        self.commits = self.rollbacks = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    async def execute(self, stmt, *args):
+        self.statements.append(stmt)
+        result = self.results.pop(0) if self.results else self.default
+        if callable(result):
+            result = result(stmt)
+        if isinstance(result, Exception):
+            raise result
+        return ScriptedResult(result or (), self.rowcount)
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+    def sql(self, index: int = -1) -> str:
+        return str(self.statements[index].compile(dialect=postgresql.dialect()))
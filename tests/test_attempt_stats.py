@@ -0,0 +1,72 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from db.models import QuizAttemptStats
+from repository.attempt_stats import ALL, AttemptStatsRepository
+from schemas.attempt_stats import AttemptStatsResponse
+from utils.service_pagination import encode_id_cursor
+from tests.recording_session import RecordingSession
+
+
+def attempt(user_id: int, quiz_id: int, correct: int, hour: int):
+    return SimpleNamespace(user_id=user_id, company_id=3, quiz_id=quiz_id, correct=correct, total=4,
+                           created=datetime(2026, 10, 18, hour))
+
+
+def test_increments_cover_every_rollup():
+    increments = AttemptStatsRepository.build_increments([attempt(1, 5, 4, 10), attempt(1, 6, 1, 12),
+                                                         attempt(2, 5, 2, 11)])
+    by_key = {(row["user_id"], row["company_id"], row["quiz_id"]): row for row in increments}
+
+    assert list(by_key) == sorted(by_key)
+    assert set(by_key) == {(1, 3, 5), (1, 3, 6), (2, 3, 5), (1, ALL, ALL), (2, ALL, ALL), (1, 3, ALL),
+                           (2, 3, ALL), (ALL, 3, 5), (ALL, 3, 6), (ALL, 3, ALL)}
+    company = by_key[(ALL, 3, ALL)]
+    assert (company["attempts"], company["score_sum"], company["passed"]) == (3, 1.75, 2)
+    assert company["last_attempt"] == datetime(2026, 10, 18, 12)
+    assert by_key[(ALL, 3, 5)]["score_sumsq"] == 1.25
+    assert by_key[(1, ALL, ALL)]["attempts"] == 2
+
+
+def test_response_derives_moments_from_sums():
+    stats = SimpleNamespace(attempts=4, score_sum=2.0, score_sumsq=2.0, passed=3, last_attempt=None)
+    response = AttemptStatsResponse.convert_to_response_model(stats)
+
+    assert (response.attempts, response.average_score, response.pass_rate) == (4, 0.5, 0.75)
+    assert response.score_stddev == pytest.approx(0.5)
+    assert AttemptStatsResponse.convert_to_response_model(None).attempts == 0
+
+
+def test_recompute_groups_the_same_rollups():
+    sql = str(AttemptStatsRepository.recompute_query().compile(dialect=postgresql.dialect()))
+    assert "GROUPING SETS" in sql
+
+
+@pytest.mark.anyio
+async def test_reconcile_locks_the_table_before_replacing_rows():
+    session = RecordingSession(rowcount=7)
+    assert await AttemptStatsRepository(session, QuizAttemptStats).reconcile() == 7
+
+    assert session.sql(0) == "LOCK TABLE quiz_attempt_stats IN SHARE ROW EXCLUSIVE MODE"
+    assert session.sql(1) == "DELETE FROM quiz_attempt_stats"
+    assert session.sql(2).startswith("INSERT INTO quiz_attempt_stats")
+    assert session.commits == 1
+
+
+@pytest.mark.anyio
+async def test_member_stats_page_after_the_cursor():
+    session = RecordingSession([SimpleNamespace(user_id=user_id) for user_id in (8, 9)], [])
+    stats = AttemptStatsRepository(session, QuizAttemptStats)
+
+    await stats.get_member_stats(company_id=3, page=1, page_size=2)
+    assert stats.next_cursor == encode_id_cursor(9)
+    await stats.get_member_stats(company_id=3, page=1, page_size=2, cursor=stats.next_cursor)
+    assert stats.next_cursor is None
+
+    sql = str(session.statements[1].compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    assert "quiz_attempt_stats.user_id > 9" in sql
+    assert "ORDER BY quiz_attempt_stats.user_id" in sql
+    assert "OFFSET" not in sql
@@ -0,0 +1,143 @@
+import asyncio
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from db.fake_redis import FakeRedis
+from libs.answer_key import GradedAttempt
+from libs.attempt_writer import AttemptWriter, decode_attempt, encode_attempt, make_attempt_key
+from repository.attempts import AttemptRepository
+from tests.recording_session import RecordingSession
+
+
+class AttemptTable:
+    """Answers attempt INSERTs with the rows whose attempt_key was not stored yet."""
+
+    def __init__(self):
+        self.inserted = []
+
+    def __call__(self, stmt):
+        if stmt.table.name != "quiz_attempts":
+            return []
+        rows = {}
+        for name, value in stmt.compile(dialect=postgresql.dialect()).params.items():
+            column, _, row = name.rpartition("_m")
+            rows.setdefault(row, {})[column] = value
+        stored = [SimpleNamespace(**row) for row in rows.values() if row["attempt_key"] not in self.inserted]
+        self.inserted += [row.attempt_key for row in stored]
+        return stored
+
+
+def make_row(user_id: int = 1) -> dict:
+    graded = GradedAttempt(1, 2, [10, 11], [True, False], [100, 111])
+    return AttemptRepository.build_row(make_attempt_key(user_id, 5), quiz_id=5, company_id=3, user_id=user_id,
+                                       graded=graded, created=datetime(2026, 10, 18, 12, 0))
+
+
+def make_writer(redis_client, session, claim_idle_ms: int = 60000) -> AttemptWriter:
+    return AttemptWriter(redis_client, lambda: session, batch_size=2, flush_interval_ms=0,
+                         claim_idle_ms=claim_idle_ms, max_lag=3, stream="test-attempts", group="test-writers")
+
+
+def test_attempt_round_trip_and_keys():
+    row = make_row()
+    assert decode_attempt({b"attempt": encode_attempt(row)["attempt"]}) == row
+    assert make_attempt_key(1, 5, "retry-1") == make_attempt_key(1, 5, "retry-1")
+    assert make_attempt_key(1, 5, "retry-1") != make_attempt_key(2, 5, "retry-1")
+    assert isinstance(make_attempt_key(1, 5), uuid.UUID)
+
+
+@pytest.mark.anyio
+async def test_flush_writes_batches_and_drains_stream():
+    redis_client, table = FakeRedis(), AttemptTable()
+    session = RecordingSession(default=table)
+    writer = make_writer(redis_client, session)
+    rows = [make_row(user_id) for user_id in range(3)]
+    for row in rows:
+        await writer.append(row)
+
+    assert await writer.flush_once() == 2
+    assert writer.lag_entries == 1
+    assert await writer.flush_once() == 1
+    assert await writer.flush_once() == 0
+
+    assert table.inserted == [row["attempt_key"] for row in rows]
+    assert [stmt.table.name for stmt in session.statements].count("quiz_attempt_stats") == 2
+    assert (writer.flushed, writer.lag_entries, writer.lag_seconds) == (3, 0, 0.0)
+    assert await redis_client.xlen("test-attempts") == 0
+    assert "quiz_attempt_stream_lag_entries 0" in writer.render()
+
+
+@pytest.mark.anyio
+async def test_failed_flush_is_redelivered_once():
+    redis_client, table = FakeRedis(), AttemptTable()
+    session = RecordingSession(ConnectionError("connection reset"), default=table)
+    writer = make_writer(redis_client, session, claim_idle_ms=0)
+    row = make_row()
+    await writer.append(row)
+    await writer.append(row)
+
+    with pytest.raises(ConnectionError):
+        await writer.flush_once()
+    assert await redis_client.xlen("test-attempts") == 2
+
+    assert await writer.flush_once() == 2
+    assert table.inserted == [row["attempt_key"]]
+    assert (writer.flushed, writer.duplicates) == (1, 1)
+    assert await redis_client.zscore("leaderboard:company:3", 1) == 1.0
+    assert await redis_client.xlen("test-attempts") == 0
+
+
+@pytest.mark.anyio
+async def test_failed_leaderboard_update_is_retried_once():
+    redis_client, table = FakeRedis(), AttemptTable()
+    writer = make_writer(redis_client, RecordingSession(default=table), claim_idle_ms=0)
+    row = make_row()
+    await writer.append(row)
+
+    async def unavailable(*args, **kwargs):
+        raise ConnectionError("connection reset")
+
+    redis_client.zincrby, zincrby = unavailable, redis_client.zincrby
+    with pytest.raises(ConnectionError):
+        await writer.flush_once()
+    assert table.inserted == [row["attempt_key"]]
+    assert await redis_client.xlen("test-attempts") == 1
+
+    redis_client.zincrby = zincrby
+    assert await writer.flush_once() == 1
+    await writer.append(row)
+    assert await writer.flush_once() == 1
+    assert await redis_client.zscore("leaderboard:company:3", 1) == 1.0
+    assert await redis_client.xlen("test-attempts") == 0
+
+
+@pytest.mark.anyio
+async def test_lagging_past_max_lag():
+    writer = make_writer(FakeRedis(), RecordingSession())
+    for user_id in range(3):
+        await writer.append(make_row(user_id))
+    await writer.ensure_group()
+    await writer.update_lag()
+    assert writer.lag_entries == 3 and writer.lagging
+
+
+@pytest.mark.anyio
+async def test_lag_is_refreshed_while_flushes_fail():
+    # failed entries are claimed again right away, so every flush fails before the stream drains
+    writer = make_writer(FakeRedis(), RecordingSession(default=lambda stmt: ConnectionError("connection refused")),
+                         claim_idle_ms=0)
+    for user_id in range(3):
+        await writer.append(make_row(user_id))
+
+    writer.start()
+    for _ in range(100):
+        await asyncio.sleep(0)
+        if writer.lagging:
+            break
+    await writer.stop()
+    assert writer.lag_entries == 3 and writer.lagging
+    assert writer.flushed == 0
@@ -0,0 +1,68 @@
+from types import SimpleNamespace
+
+import pytest
+
+from db.fake_redis import FakeRedis
+from libs.answer_key import AnswerKeyCache, CompiledAnswerKey, InvalidAttemptError, LocalAnswerKeys
+from libs.cache import VersionedCache
+
+
+def make_quiz(quiz_id: int = 1, company_id: int = 7):
+    def question(question_id: int, correct):
+        answers = [SimpleNamespace(id=question_id * 10 + n, is_correct=n in correct) for n in (2, 0, 1)]
+        return SimpleNamespace(id=question_id, answers=answers)
+
+    return SimpleNamespace(id=quiz_id, company_id=company_id,
+                           questions=[question(1, {0}), question(2, {1, 2}), question(3, {2})])
+
+
+def test_grade_compares_bitmasks():
+    answer_key = CompiledAnswerKey.compile(make_quiz())
+    graded = answer_key.grade([(1, [10]), (2, [22, 21]), (3, [30])])
+
+    assert graded.correct == 2
+    assert graded.total == 3
+    assert graded.question_ids == [1, 2, 3]
+    assert graded.results == [True, True, False]
+    assert graded.answer_ids == [10, 22, 21, 30]
+    assert answer_key.grade([(2, [21])]).results == [False]
+
+
+def test_grade_rejects_foreign_answers():
+    answer_key = CompiledAnswerKey.compile(make_quiz())
+    with pytest.raises(InvalidAttemptError):
+        answer_key.grade([(4, [40])])
+    with pytest.raises(InvalidAttemptError):
+        answer_key.grade([(1, [20])])
+    with pytest.raises(InvalidAttemptError):
+        answer_key.grade([(1, [10]), (1, [11])])
+
+
+def test_dumps_round_trip():
+    answer_key = CompiledAnswerKey.compile(make_quiz())
+    loaded = CompiledAnswerKey.loads(answer_key.dumps())
+    assert (loaded.quiz_id, loaded.company_id, loaded.questions) == (1, 7, answer_key.questions)
+
+
+@pytest.mark.anyio
+async def test_answer_key_cache_follows_quiz_version():
+    redis_client = FakeRedis()
+    quiz_cache = VersionedCache(redis_client, namespace="test-attempt-quiz", ttl=60)
+    answer_keys = AnswerKeyCache(redis_client, quiz_cache, LocalAnswerKeys(maxsize=10), ttl=60)
+    loads = []
+
+    async def load():
+        loads.append(1)
+        return make_quiz()
+
+    first = await answer_keys.get(1, load)
+    assert await answer_keys.get(1, load) is first
+    assert len(loads) == 1
+
+    other_process = AnswerKeyCache(redis_client, quiz_cache, LocalAnswerKeys(maxsize=10), ttl=60)
+    assert (await other_process.get(1, load)).questions == first.questions
+    assert len(loads) == 1
+
+    await quiz_cache.invalidate(1)
+    assert await answer_keys.get(1, load) is not first
+    assert len(loads) == 2
@@ -0,0 +1,117 @@
+from datetime import datetime
+
+import pytest
+
+from db.fake_redis import FakeRedis
+from libs.cache import VersionedCache
+from libs.principal import PrincipalCache
+from libs.roles import CompanyRole, CompanyRoleIndex
+from schemas.auth import Principal
+
+
+@pytest.fixture(scope="function")
+def quiz_cache():
+    return VersionedCache(FakeRedis(), namespace="test-quiz", ttl=60)
+
+
+@pytest.mark.anyio
+async def test_read_through(quiz_cache):
+    hits, misses = quiz_cache.stats.hits, quiz_cache.stats.misses
+    version, payload = await quiz_cache.get(1)
+    assert payload is None
+
+    await quiz_cache.set(1, version, b'{"id": 1}')
+    assert await quiz_cache.get(1) == (version, b'{"id": 1}')
+    assert quiz_cache.stats.hits == hits + 1
+    assert quiz_cache.stats.misses == misses + 1
+
+
+@pytest.mark.anyio
+async def test_invalidate_bumps_version(quiz_cache):
+    version, _ = await quiz_cache.get(2)
+    await quiz_cache.invalidate(2)
+    await quiz_cache.set(2, version, b"stale")
+
+    new_version, payload = await quiz_cache.get(2)
+    assert new_version == version + 1
+    assert payload is None
+
+
+@pytest.mark.anyio
+async def test_payload_expires():
+    redis_client = FakeRedis()
+    quiz_cache = VersionedCache(redis_client, namespace="test-quiz-ttl", ttl=60)
+    await quiz_cache.set(3, 0, b"payload")
+    assert 0 < await redis_client.ttl(quiz_cache.payload_key(3, 0)) <= 60
+
+
+@pytest.mark.anyio
+async def test_principal_cache_round_trip():
+    principal_cache = PrincipalCache(FakeRedis(), ttl=60)
+    principal = Principal(id=7, username="user", email="user@example.com", created=datetime.utcnow(),
+                          updated=datetime.utcnow())
+    version, cached = await principal_cache.get(principal.email)
+    assert (version, cached) == (-1, None)
+
+    # the first load only indexes the login
+    await principal_cache.set(principal, version)
+    version, cached = await principal_cache.get(principal.email)
+    assert (version, cached) == (0, None)
+
+    await principal_cache.set(principal, version)
+    assert await principal_cache.get(principal.email) == (0, principal)
+    assert principal.version == 0
+
+    await principal_cache.invalidate(principal.id)
+    assert await principal_cache.get(principal.email) == (1, None)
+
+
+@pytest.mark.anyio
+async def test_principal_loaded_before_invalidation_is_not_cached():
+    principal_cache = PrincipalCache(FakeRedis(), ttl=60)
+    principal = Principal(id=8, username="user", email="user8@example.com", created=datetime.utcnow(),
+                          updated=datetime.utcnow())
+    await principal_cache.set(principal, -1)
+
+    version, _ = await principal_cache.get(principal.email)
+    await principal_cache.invalidate(principal.id)
+    await principal_cache.set(principal, version)
+
+    assert await principal_cache.get(principal.email) == (1, None)
+
+
+class StubUserRepository:
+
+    def __init__(self, roles):
+        self.roles = roles
+        self.queries = 0
+
+    async def get_company_role(self, user_id: int, company_id: int):
+        self.queries += 1
+        return self.roles.get(company_id, (False, False, False))
+
+
+@pytest.mark.anyio
+async def test_company_role_index_caches_per_principal_version():
+    user_repo = StubUserRepository({1: (True, False, False), 2: (False, True, True)})
+    role_index = CompanyRoleIndex(FakeRedis(), user_repo, ttl=60)
+    principal = Principal(id=7, username="user", email="user@example.com", created=datetime.utcnow(),
+                          updated=datetime.utcnow())
+
+    assert await role_index.get_role(principal, 1) == CompanyRole.OWNER
+    assert await role_index.has_role(principal, 2, CompanyRole.OWNER | CompanyRole.ADMIN)
+    assert not await role_index.has_role(principal, 3, CompanyRole.MEMBER)
+    assert await role_index.get_role(principal, 2) == CompanyRole.ADMIN | CompanyRole.MEMBER
+    assert user_repo.queries == 3
+
+    principal.version += 1
+    await role_index.get_role(principal, 1)
+    assert user_repo.queries == 4
+
+
+@pytest.mark.anyio
+async def test_invalidate_many_bumps_every_version(quiz_cache):
+    versions = [(await quiz_cache.get(entity_id))[0] for entity_id in (3, 4)]
+    await quiz_cache.invalidate_many([3, 4])
+
+    assert [await quiz_cache.version(entity_id) for entity_id in (3, 4)] == [version + 1 for version in versions]
@@ -0,0 +1,33 @@
+import uuid
+
+import pytest
+
+from db.connect import redis_client
+from libs.principal import PrincipalCache
+from tests.api_helpers import sign_up
+
+
+@pytest.mark.anyio
+async def test_delete_company_invalidates_every_member(ac, database):
+    suffix = uuid.uuid4().hex[:8]
+    owner, headers = await sign_up(ac, f"companies-{suffix}")
+    member, member_headers = await sign_up(ac, f"companies-member-{suffix}")
+    admin, admin_headers = await sign_up(ac, f"companies-admin-{suffix}")
+    company = (await ac.post("/companies/", headers=headers,
+                             json={"company_name": f"companies-{suffix}", "description": "companies"})).json()
+    company_url = f"/companies/{company['id']}"
+    for user in (member, admin):
+        invitation = (await ac.post(f"{company_url}/invitations", headers=headers,
+                                    json={"recipient_id": user["id"]})).json()
+        await ac.patch(f"{company_url}/invitations/{invitation['id']}/response/accepted", headers=headers)
+    await ac.post(f"{company_url}/admins/{admin['id']}", headers=headers)
+
+    principal_cache = PrincipalCache(redis_client, ttl=60)
+    user_ids = [owner["id"], member["id"], admin["id"]]
+    versions = [await principal_cache.cache.version(user_id) for user_id in user_ids]
+    assert (await ac.delete(company_url, headers=headers)).status_code == 202
+
+    assert [await principal_cache.cache.version(user_id) for user_id in user_ids] == \
+        [version + 1 for version in versions]
+    for user, user_headers in ((owner, headers), (member, member_headers), (admin, admin_headers)):
+        await ac.delete(f"/users/{user['id']}", headers=user_headers)
@@ -0,0 +1,28 @@
+import asyncio
+import time
+
+import pytest
+
+from libs.hash import Hash
+
+
+@pytest.mark.anyio
+async def test_hash_round_trip():
+    hashed = await Hash.get_password_hash("password123")
+    assert await Hash.verify_password("password123", hashed)
+    assert not await Hash.verify_password("wrong-password", hashed)
+
+
+@pytest.mark.anyio
+async def test_hashing_does_not_block_event_loop():
+    hashed = await Hash.get_password_hash("password123")
+    stalls = []
+
+    async def ticker():
+        for _ in range(20):
+            start = time.perf_counter()
+            await asyncio.sleep(0.005)
+            stalls.append(time.perf_counter() - start)
+
+    await asyncio.gather(ticker(), *(Hash.verify_password("password123", hashed) for _ in range(4)))
+    assert max(stalls) < 0.1
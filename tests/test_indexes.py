@@ -0,0 +1,20 @@
+from sqlalchemy import UniqueConstraint
+
+from db.models import Action, member_company_association, admin_company_association
+
+
+def leading_columns(table, width: int):
+    return {tuple(column.name for column in index.columns)[:width] for index in table.indexes}
+
+
+def test_action_filters_lead_an_index():
+    indexed = leading_columns(Action.__table__, 2)
+    assert {("recipient_id", "type_action"), ("sender_id", "type_action"), ("company_id", "type_action")} <= indexed
+
+
+def test_memberships_are_indexed_both_ways():
+    for table in (member_company_association, admin_company_association):
+        unique = {tuple(column.name for column in constraint.columns) for constraint in table.constraints
+                  if isinstance(constraint, UniqueConstraint)}
+        assert ("user_id", "company_id") in unique
+        assert ("company_id", "user_id") in leading_columns(table, 2)
@@ -0,0 +1,69 @@
+from types import SimpleNamespace
+
+import pytest
+
+from db.models import Action, StatusActionForResponse, TypeAction
+from repository.invites import InviteRepository
+from schemas.action import ActionResponseResult, BulkActionResponse, InvitationResult
+from tests.recording_session import RecordingSession
+
+
+@pytest.mark.anyio
+async def test_bulk_invitations_classify_then_insert_once():
+    classified = [(1, False, False), (2, True, False), (3, False, True), (5, False, False)]
+    session = RecordingSession(classified, [(5, 105), (1, 101)])
+    repo = InviteRepository(session, Action)
+
+    results = await repo.create_many(company_id=7, recipient_ids=[1, 2, 3, 4, 1, 5], user=SimpleNamespace(id=9))
+
+    assert [(r.recipient_id, r.result, r.invitation_id) for r in results] == [
+        (1, InvitationResult.INVITED, 101),
+        (2, InvitationResult.ALREADY_MEMBER, None),
+        (3, InvitationResult.ALREADY_INVITED, None),
+        (4, InvitationResult.NOT_FOUND, None),
+        (5, InvitationResult.INVITED, 105),
+    ]
+    assert len(session.statements) == 2 and session.commits == 1
+    insert_sql = session.sql(1)
+    assert insert_sql.startswith("INSERT INTO actions") and insert_sql.count("VALUES") == 1
+    assert "RETURNING actions.recipient_id, actions.id" in insert_sql
+
+
+@pytest.mark.anyio
+async def test_bulk_invitations_without_new_recipients_do_not_write():
+    session = RecordingSession([(2, True, False)])
+    results = await InviteRepository(session, Action).create_many(company_id=7, recipient_ids=[2],
+                                                                  user=SimpleNamespace(id=9))
+
+    assert results[0].result == InvitationResult.ALREADY_MEMBER
+    assert len(session.statements) == 1 and session.commits == 0
+
+
+@pytest.mark.anyio
+async def test_bulk_accept_updates_and_adds_members_in_two_statements():
+    session = RecordingSession([(11, 1), (12, 2), (13, 1)], [])
+    repo = InviteRepository(session, Action)
+
+    answered = await repo.respond_many(action_ids=[11, 12, 13, 14], body=StatusActionForResponse.ACCEPTED,
+                                       company_id=7, type_action=TypeAction.JOIN_REQUEST)
+
+    assert answered == {11: 1, 12: 2, 13: 1}
+    assert len(session.statements) == 2 and session.commits == 1
+    update_sql, insert_sql = session.sql(0), session.sql(1)
+    assert update_sql.startswith("UPDATE actions SET status_action=")
+    assert "actions.status_action = %(status_action_1)s RETURNING actions.id, actions.recipient_id" in update_sql
+    assert insert_sql.startswith("INSERT INTO user_company (user_id, company_id) SELECT users.id")
+    assert insert_sql.endswith("ON CONFLICT DO NOTHING")
+
+    results = BulkActionResponse.build_results([11, 14, 11], answered, StatusActionForResponse.ACCEPTED)
+    assert [(r.action_id, r.result) for r in results] == [(11, ActionResponseResult.ACCEPTED),
+                                                          (14, ActionResponseResult.NOT_PENDING)]
+
+
+@pytest.mark.anyio
+async def test_bulk_reject_does_not_touch_memberships():
+    session = RecordingSession([(11, 1)])
+    await InviteRepository(session, Action).respond_many(action_ids=[11], body=StatusActionForResponse.REJECTED,
+                                                         company_id=7, type_action=TypeAction.INVITE)
+
+    assert len(session.statements) == 1 and session.commits == 1
@@ -0,0 +1,76 @@
+import json
+import statistics
+
+import pytest
+
+from db.fake_redis import FakeRedis
+from libs.answer_key import CompiledAnswerKey
+from libs.cache import VersionedCache
+from libs.item_analysis import ItemAnalysisCache, analyze
+
+
+ANSWER_KEY = CompiledAnswerKey.build(9, 3, [(1, [10, 11], 0b01), (2, [20, 21, 22], 0b100), (3, [30, 31], 0b10)])
+
+# every attempt lists its results and the answers it selected; question 3 is left out by the last one
+ATTEMPTS = [
+    ([1, 2, 3], [True, True, True], [10, 22, 31]),
+    ([1, 2, 3], [True, False, True], [10, 20, 31]),
+    ([1, 2, 3], [False, True, False], [11, 22, 30]),
+    ([1, 2, 3], [True, False, False], [10, 21, 30]),
+    ([2, 1], [False, False], [20, 11]),
+]
+
+
+def matrix():
+    question_ids, results, answer_ids = zip(*ATTEMPTS)
+    return question_ids, results, answer_ids
+
+
+def test_analysis_matches_textbook_formulas():
+    analysis = analyze(ANSWER_KEY, *matrix())
+    items = [[int(dict(zip(question_ids, results)).get(question_id, False)) for question_id in (1, 2, 3)]
+             for question_ids, results, _ in ATTEMPTS]
+    totals = [sum(row) for row in items]
+
+    assert analysis["attempts"] == 5
+    for column, question in enumerate(analysis["questions"]):
+        scores = [row[column] for row in items]
+        rest = [total - score for total, score in zip(totals, scores)]
+        assert question["difficulty"] == pytest.approx(statistics.fmean(scores))
+        assert question["discrimination"] == pytest.approx(statistics.correlation(scores, rest))
+
+    item_variance = sum(statistics.pvariance([row[column] for row in items]) for column in range(3))
+    assert analysis["cronbach_alpha"] == pytest.approx(3 / 2 * (1 - item_variance / statistics.pvariance(totals)))
+
+    second = analysis["questions"][1]["answers"]
+    assert [(answer["answer_id"], answer["is_correct"], answer["selection_rate"]) for answer in second] == \
+        [(20, False, 0.4), (21, False, 0.2), (22, True, 0.4)]
+
+
+def test_analysis_of_quiz_without_attempts_or_changed_questions():
+    empty = analyze(ANSWER_KEY, (), (), ())
+    assert (empty["attempts"], empty["cronbach_alpha"]) == (0, None)
+    assert [question["discrimination"] for question in empty["questions"]] == [None, None, None]
+
+    deleted = analyze(CompiledAnswerKey.build(9, 3, [(1, [10, 11], 0b01)]), *matrix())
+    assert [question["question_id"] for question in deleted["questions"]] == [1]
+    assert deleted["questions"][0]["difficulty"] == 0.6
+
+
+@pytest.mark.anyio
+async def test_cache_recomputes_when_attempts_or_quiz_change():
+    redis_client = FakeRedis()
+    quiz_cache = VersionedCache(redis_client, namespace="quiz", ttl=60)
+    cache = ItemAnalysisCache(redis_client, quiz_cache, ttl=60)
+    computed = []
+
+    async def compute():
+        computed.append(1)
+        return json.loads(json.dumps(analyze(ANSWER_KEY, *matrix())))
+
+    first = await cache.get(9, 5, compute)
+    assert await cache.get(9, 5, compute) == first
+    await cache.get(9, 6, compute)
+    await quiz_cache.invalidate(9)
+    await cache.get(9, 6, compute)
+    assert len(computed) == 3
@@ -0,0 +1,57 @@
+import uuid
+
+import pytest
+
+from db.fake_redis import FakeRedis
+from libs.leaderboard import Leaderboards
+from tests.recording_session import RecordingSession
+
+
+def attempt(user_id: int, correct: int, quiz_id: int = 5, total: int = 4) -> dict:
+    return {"attempt_key": uuid.uuid4(), "user_id": user_id, "company_id": 3, "quiz_id": quiz_id,
+            "correct": correct, "total": total}
+
+
+@pytest.mark.anyio
+async def test_record_ranks_company_by_points_and_quiz_by_best_score():
+    leaderboards = Leaderboards(FakeRedis())
+    await leaderboards.record([attempt(1, 3), attempt(2, 4), attempt(1, 2), attempt(3, 1, quiz_id=6)])
+
+    assert await leaderboards.top(Leaderboards.company_key(3), 0, 10) == [(1, 1, 5.0), (2, 2, 4.0), (3, 3, 1.0)]
+    assert await leaderboards.top(Leaderboards.quiz_key(3, 5), 0, 10) == [(2, 1, 1.0), (1, 2, 0.75)]
+    assert await leaderboards.top(Leaderboards.company_key(3), 1, 1) == [(2, 2, 4.0)]
+
+
+@pytest.mark.anyio
+async def test_record_applies_each_attempt_once():
+    leaderboards = Leaderboards(FakeRedis())
+    first, second = attempt(1, 3), attempt(1, 2)
+    await leaderboards.record([first])
+    await leaderboards.record([first, second])
+
+    assert await leaderboards.top(Leaderboards.company_key(3), 0, 10) == [(1, 1, 5.0)]
+
+
+@pytest.mark.anyio
+async def test_around_me_is_clipped_at_the_top():
+    leaderboards = Leaderboards(FakeRedis())
+    await leaderboards.record([attempt(user_id, user_id) for user_id in range(1, 8)])
+    key = Leaderboards.company_key(3)
+
+    assert [rank for _, rank, _ in await leaderboards.around(key, 4, radius=2)] == [2, 3, 4, 5, 6]
+    assert [user_id for user_id, _, _ in await leaderboards.around(key, 7, radius=2)] == [7, 6, 5]
+    assert await leaderboards.around(key, 99, radius=2) is None
+
+
+@pytest.mark.anyio
+async def test_rebuild_replaces_sorted_sets():
+    redis_client = FakeRedis()
+    leaderboards = Leaderboards(redis_client)
+    await leaderboards.record([attempt(9, 4)])
+
+    session = RecordingSession([(1, 7), (2, 3)], [(5, 1, 0.5), (5, 2, 0.75)])
+    assert await leaderboards.rebuild(session, company_id=3) == 2
+
+    assert await leaderboards.top(Leaderboards.company_key(3), 0, 10) == [(1, 1, 7.0), (2, 2, 3.0)]
+    assert await leaderboards.top(Leaderboards.quiz_key(3, 5), 0, 10) == [(2, 1, 0.75), (1, 2, 0.5)]
+    assert not [key for key in redis_client._data if ":rebuild:" in key]
@@ -0,0 +1,68 @@
+import json
+import logging
+import queue
+from logging.handlers import QueueListener
+
+from core.log_config import JsonFormatter, LoggingConfig, RequestIdFilter, StructuredQueueHandler, request_id_var
+
+
+def make_record(message: str) -> logging.LogRecord:
+    return logging.LogRecord("routers.users", logging.INFO, __file__, 1, message, None, None)
+
+
+def test_json_record_carries_request_id():
+    token = request_id_var.set("req-1")
+    try:
+        record = make_record("Got all users")
+        RequestIdFilter().filter(record)
+    finally:
+        request_id_var.reset(token)
+
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "Got all users"
+    assert entry["logger"] == "routers.users"
+    assert entry["level"] == "INFO"
+    assert entry["request_id"] == "req-1"
+
+
+def test_parse_levels():
+    assert LoggingConfig.parse_levels("sqlalchemy.engine=warning, httpx=ERROR,broken") == {
+        "sqlalchemy.engine": "WARNING",
+        "httpx": "ERROR",
+    }
+
+
+class ListHandler(logging.Handler):
+
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.lines.append(self.format(record))
+
+
+def test_exception_keeps_its_traceback_through_the_queue():
+    queue_handler = StructuredQueueHandler(queue.SimpleQueue())
+    writer = ListHandler()
+    writer.setFormatter(JsonFormatter())
+    listener = QueueListener(queue_handler.queue, writer)
+    logger = logging.getLogger("tests.logging.queue")
+    logger.propagate = False
+    logger.addHandler(queue_handler)
+    listener.start()
+    try:
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            logger.exception("Failed to divide %s", "numbers")
+    finally:
+        listener.stop()
+        logger.removeHandler(queue_handler)
+        logger.propagate = True
+
+    [line] = writer.lines
+    entry = json.loads(line)
+    assert entry["message"] == "Failed to divide numbers"
+    assert entry["exc_info"].startswith("Traceback (most recent call last):")
+    assert entry["exc_info"].endswith("ZeroDivisionError: division by zero")
@@ -9,4 +9,23 @@ async def test_root(ac):
         "status_code": 200,
         "detail": "ok",
         "result": "working"
-    }
\ No newline at end of file
+    }
+
+@pytest.mark.anyio
+async def test_pool_metrics(ac):
+    response = await ac.get("/pool-metrics")
+    assert response.status_code == 200
+    metrics = response.json()["result"]
+    assert {"size", "checked_in", "checked_out", "overflow", "checkouts", "avg_wait_ms", "max_wait_ms"} <= set(metrics)
+
+@pytest.mark.anyio
+async def test_cache_metrics(ac):
+    response = await ac.get("/cache-metrics")
+    assert response.status_code == 200
+    assert {"hits", "misses", "evictions", "hit_rate", "size"} <= set(response.json()["result"]["verified_token"])
+
+@pytest.mark.anyio
+async def test_request_id_is_echoed(ac):
+    response = await ac.get("/", headers={"X-Request-ID": "req-123"})
+    assert response.headers["X-Request-ID"] == "req-123"
+    assert (await ac.get("/")).headers["X-Request-ID"]
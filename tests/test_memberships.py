@@ -0,0 +1,46 @@
+import pytest
+from sqlalchemy.exc import IntegrityError, NoResultFound
+
+from db.models import Company
+from repository.companies import CompanyRepository
+from tests.recording_session import RecordingSession
+
+
+@pytest.mark.anyio
+async def test_assign_admin_is_one_idempotent_insert():
+    session = RecordingSession()
+    await CompanyRepository(session, Company).assign_admin(company_id=7, user_id=3)
+
+    assert len(session.statements) == 1
+    sql = session.sql()
+    assert sql.startswith("INSERT INTO admin_company (user_id, company_id) VALUES")
+    assert sql.endswith("ON CONFLICT DO NOTHING")
+    assert session.commits == 1
+
+
+@pytest.mark.anyio
+async def test_assign_admin_to_missing_company_is_not_found():
+    session = RecordingSession(IntegrityError("INSERT", {}, Exception("fk")))
+    with pytest.raises(NoResultFound):
+        await CompanyRepository(session, Company).assign_admin(company_id=7, user_id=3)
+    assert session.rollbacks == 1 and session.commits == 0
+
+
+@pytest.mark.anyio
+async def test_delete_member_is_one_delete():
+    session = RecordingSession()
+    await CompanyRepository(session, Company).delete_member(company_id=7, member_id=3)
+
+    assert len(session.statements) == 1
+    sql = session.sql()
+    assert sql.startswith("DELETE FROM user_company WHERE user_company.user_id = ")
+    assert "AND user_company.company_id = " in sql
+    assert session.commits == 1
+
+
+@pytest.mark.anyio
+async def test_delete_missing_admin_is_not_found():
+    session = RecordingSession(rowcount=0)
+    with pytest.raises(NoResultFound):
+        await CompanyRepository(session, Company).delete_admin(company_id=7, admin_id=3)
+    assert session.commits == 0
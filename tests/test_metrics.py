@@ -0,0 +1,42 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from libs.metrics import MetricsRegistry, RequestStats, instrument_engine, request_stats_var
+
+
+def test_engine_statements_are_attributed_to_request():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    request_stats = RequestStats()
+    token = request_stats_var.set(request_stats)
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+    finally:
+        request_stats_var.reset(token)
+
+    assert request_stats.queries == 2
+    assert request_stats.db_time > 0
+
+
+def test_render_histograms():
+    registry = MetricsRegistry()
+    request_stats = RequestStats()
+    request_stats.queries = 3
+    registry.observe("GET", "/companies/{company_id}", 0.02, request_stats)
+
+    rendered = registry.render()
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/companies/{company_id}",le="0.025"} 1' \
+        in rendered
+    assert 'http_request_db_queries_bucket{method="GET",route="/companies/{company_id}",le="2"} 0' in rendered
+    assert 'http_request_db_queries_sum{method="GET",route="/companies/{company_id}"} 3' in rendered
+
+
+@pytest.mark.anyio
+async def test_metrics_endpoint_and_server_timing(ac):
+    response = await ac.get("/")
+    assert response.headers["Server-Timing"].startswith("app;dur=")
+
+    metrics = (await ac.get("/metrics")).text
+    assert 'http_request_duration_seconds_count{method="GET",route="/"}' in metrics
@@ -0,0 +1,49 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from db.models import Company, User
+from repository.base import Paginateable
+from repository.companies import CompaniesRepository
+from utils.service_pagination import InvalidCursorError, decode_cursor, encode_cursor
+from tests.recording_session import RecordingSession
+
+
+def compile_pg(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def test_cursor_round_trip():
+    created = datetime(2023, 9, 1, 12, 30, 15, 123456)
+    assert decode_cursor(encode_cursor(created, 42)) == (created, 42)
+
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("not-a-cursor")
+
+
+def test_page_mode_is_ordered():
+    sql = compile_pg(Paginateable.apply_pagination(select(User), page=3, page_size=5, entity=User))
+    assert "ORDER BY users.created, users.id" in sql
+    assert "LIMIT 5 OFFSET 10" in sql
+
+
+def test_cursor_mode_seeks_instead_of_offset():
+    cursor = encode_cursor(datetime(2023, 9, 1), 42)
+    sql = compile_pg(Paginateable.apply_pagination(select(User), page=3, page_size=5, entity=User, cursor=cursor))
+    assert "(users.created, users.id) > ('2023-09-01 00:00:00', 42)" in sql
+    assert "OFFSET" not in sql
+
+
+@pytest.mark.anyio
+async def test_companies_visibility_filtered_in_sql():
+    rows = [SimpleNamespace(id=i, created=datetime(2023, 9, 1), visible=True) for i in range(1, 6)]
+    session = RecordingSession(rows)
+    repo = CompaniesRepository(session, Company)
+
+    assert await repo.paginate_query(Company, page=2, page_size=5) == rows
+    sql = compile_pg(session.statements[0])
+    assert "WHERE company.visible = true ORDER BY company.created, company.id" in sql
+    assert repo.next_cursor == encode_cursor(datetime(2023, 9, 1), 5)
@@ -0,0 +1,151 @@
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.main import app
+from libs.attempt_writer import attempt_writer
+from libs.metrics import RequestStats, request_stats_var
+from tests.api_helpers import quiz_body, sign_up
+from tests.query_budget import QUERY_BUDGETS, QueryBudgetRecorder, statement_shape
+
+
+def test_statement_shape_collapses_parameters():
+    assert statement_shape("SELECT quiz.id\n  FROM quiz WHERE quiz.id IN ($1, $2, $3) AND quiz.company_id = $4") == \
+        "SELECT quiz.id FROM quiz WHERE quiz.id IN (?, ...) AND quiz.company_id = ?"
+    assert statement_shape("SELECT 1 FROM answer WHERE text = 'it''s'") == "SELECT ? FROM answer WHERE text = ?"
+
+
+def test_recorder_reports_repeated_shapes():
+    sqlite_engine = create_engine("sqlite://")
+    recorder = QueryBudgetRecorder({"GET /quizzes/{quiz_id}": 2})
+    recorder.listen(sqlite_engine)
+    request_stats = RequestStats()
+    token = request_stats_var.set(request_stats)
+    try:
+        with sqlite_engine.connect() as connection:
+            for question_id in range(3):
+                connection.execute(text(f"SELECT {question_id} WHERE 1 = :one"), {"one": 1})
+    finally:
+        request_stats_var.reset(token)
+        recorder.remove(sqlite_engine)
+
+    recorder.check("GET", "/quizzes/{quiz_id}", request_stats)
+    recorder.check("GET", "/quizzes/", RequestStats())
+    recorder.check("GET", "unmatched", RequestStats())
+
+    assert recorder.violations == [
+        "GET /quizzes/{quiz_id}: 3 statements, budget 2\n    3x SELECT ? WHERE ? = ?",
+        "GET /quizzes/: no query budget declared (0 statements)",
+    ]
+    assert recorder.statements == {}
+
+
+def test_every_route_has_budget():
+    routes = {f"{method.upper()} {path}" for path, operations in app.openapi()["paths"].items()
+              for method in operations}
+    assert routes == set(QUERY_BUDGETS)
+
+
+@pytest.mark.anyio
+async def test_routes_stay_within_budget(ac, database):
+    """Calls every route once on a real database; the query_budget fixture checks each request."""
+    suffix = uuid.uuid4().hex[:8]
+    owner, headers = await sign_up(ac, f"budget-{suffix}")
+    member, member_headers = await sign_up(ac, f"budget-member-{suffix}")
+
+    assert (await ac.get("/", headers=headers)).is_success
+    assert (await ac.get("/pool-metrics", headers=headers)).is_success
+    assert (await ac.get("/cache-metrics", headers=headers)).is_success
+    assert (await ac.get("/metrics", headers=headers)).is_success
+
+    owner_url = f"/users/{owner['id']}"
+    assert (await ac.get("/users/me/", headers=headers)).is_success
+    assert (await ac.get("/users/", headers=headers)).is_success
+    assert (await ac.get(owner_url, headers=headers)).is_success
+    assert (await ac.put(owner_url, headers=headers, json={"phones": ["+380000000000"]})).is_success
+    assert (await ac.patch(owner_url, headers=headers, json={"status": "active"})).is_success
+
+    company = (await ac.post("/companies/", headers=headers,
+                             json={"company_name": f"budget-{suffix}", "description": "budget"})).json()
+    company_url = f"/companies/{company['id']}"
+    assert (await ac.get("/companies/", headers=headers)).is_success
+    assert (await ac.get(company_url, headers=headers)).is_success
+    assert (await ac.put(company_url, headers=headers, json={"description": "budget walk"})).is_success
+
+    invitation = (await ac.post(f"{company_url}/invitations", headers=headers,
+                                json={"recipient_id": member["id"]})).json()
+    assert (await ac.get(f"{company_url}/invited-users", headers=headers)).is_success
+    assert (await ac.get("/user-action/user_id/me/invitations", params={"user_id": member["id"]},
+                          headers=member_headers)).is_success
+    assert (await ac.patch(f"{company_url}/invitations/{invitation['id']}/response/accepted",
+                           headers=headers)).is_success
+    assert (await ac.get(f"{company_url}/members", headers=headers)).is_success
+    assert (await ac.post(f"{company_url}/admins/{member['id']}", headers=headers)).is_success
+    assert (await ac.get(f"{company_url}/admins", headers=headers)).is_success
+    assert (await ac.delete(f"{company_url}/admins/{member['id']}", headers=headers)).is_success
+    assert (await ac.delete(f"{company_url}/members/{member['id']}", headers=headers)).is_success
+
+    join_request = (await ac.post(f"{company_url}/join-requests", headers=member_headers)).json()
+    assert (await ac.get("/user-action/user_id/me/join-requests", params={"user_id": member["id"]},
+                          headers=member_headers)).is_success
+    assert (await ac.post(f"{company_url}/join-requests/{join_request['id']}/response",
+                          params={"response_type": "accepted"}, headers=headers)).is_success
+    assert (await ac.delete(f"{company_url}/leave", headers=member_headers)).is_success
+    join_request = (await ac.post(f"{company_url}/join-requests", headers=member_headers)).json()
+    assert (await ac.delete(f"{company_url}/join-requests/{join_request['id']}", headers=headers)).is_success
+    [invitation] = (await ac.post(f"{company_url}/invitations/bulk", headers=headers,
+                                  json={"recipient_ids": [member["id"]]})).json()
+    assert (await ac.delete(f"{company_url}/invitations/{invitation['invitation_id']}", headers=headers)).is_success
+    [invitation] = (await ac.post(f"{company_url}/invitations/bulk", headers=headers,
+                                  json={"recipient_ids": [member["id"]]})).json()
+    assert (await ac.patch(f"{company_url}/invitations/bulk-response", headers=headers,
+                           json={"action_ids": [invitation["invitation_id"]], "response_type": "rejected"})).is_success
+    join_request = (await ac.post(f"{company_url}/join-requests", headers=member_headers)).json()
+    assert (await ac.post(f"{company_url}/join-requests/bulk-response", headers=headers,
+                          json={"action_ids": [join_request["id"]], "response_type": "rejected"})).is_success
+
+    quiz = (await ac.post(f"{company_url}/quizzes", headers=headers, json=quiz_body("single"))).json()
+    quiz_url = f"{company_url}/quizzes/{quiz['id']}"
+    assert (await ac.get(quiz_url, headers=headers)).is_success
+    assert (await ac.put(quiz_url, headers=headers, json={"description": "budget walk"})).is_success
+    assert (await ac.post(f"{company_url}/quizzes/import", headers=headers,
+                          json={"quizzes": [quiz_body(f"imported {n}") for n in range(3)]})).is_success
+    assert (await ac.get(f"{company_url}/quizzes", headers=headers)).is_success
+
+    question = (await ac.post(f"{quiz_url}/questions", headers=headers,
+                              json=quiz_body("question")["questions"][0])).json()
+    question_url = f"{quiz_url}/questions/{question['id']}"
+    assert (await ac.put(question_url, headers=headers, json={"text": "budget walk"})).is_success
+    answer = (await ac.post(f"{question_url}/answers", headers=headers, json={"text": "never"})).json()
+    answer_url = f"{question_url}/answers/{answer['id']}"
+    assert (await ac.put(answer_url, headers=headers, json={"text": "rarely"})).is_success
+    assert (await ac.delete(answer_url, headers=headers)).is_success
+    assert (await ac.delete(question_url, headers=headers)).is_success
+
+    join_request = (await ac.post(f"{company_url}/join-requests", headers=member_headers)).json()
+    assert (await ac.post(f"{company_url}/join-requests/{join_request['id']}/response",
+                          params={"response_type": "accepted"}, headers=headers)).is_success
+    answers = [{"question_id": question["id"], "answer_ids": [question["answers"][0]["id"]]}
+               for question in quiz["questions"]]
+    assert (await ac.post(f"{quiz_url}/attempts", headers=member_headers, json={"answers": answers})).is_success
+    await attempt_writer.flush_once()
+    assert (await ac.get(f"{company_url}/leaderboard", headers=headers)).is_success
+    assert (await ac.get(f"{company_url}/leaderboard/me", headers=member_headers)).is_success
+    assert (await ac.get(f"{quiz_url}/leaderboard", headers=headers)).is_success
+    assert (await ac.get(f"{quiz_url}/leaderboard/me", headers=member_headers)).is_success
+    assert (await ac.get(f"/users/{member['id']}/quiz-stats", headers=member_headers)).is_success
+    assert (await ac.get(f"{company_url}/quiz-stats", headers=headers)).is_success
+    assert (await ac.get(f"{company_url}/quiz-stats/members", headers=headers)).is_success
+    assert (await ac.get(f"{quiz_url}/stats", headers=headers)).is_success
+    assert (await ac.get(f"{quiz_url}/analytics", headers=headers)).is_success
+
+    assert (await ac.get("/search/companies", params={"q": "budget"}, headers=headers)).is_success
+    assert (await ac.get("/search/users", params={"q": "budget"}, headers=headers)).is_success
+    assert (await ac.get(f"/search{company_url}/quizzes", params={"q": "imported"},
+                         headers=headers)).is_success
+
+    assert (await ac.delete(quiz_url, headers=headers)).is_success
+    assert (await ac.delete(company_url, headers=headers)).is_success
+    assert (await ac.delete(f"/users/{member['id']}", headers=member_headers)).is_success
+    assert (await ac.delete(owner_url, headers=headers)).is_success
@@ -0,0 +1,146 @@
+import uuid
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+
+from db.connect import async_session_factory
+from db.models import Answer, Question, Quiz
+from libs.attempt_writer import attempt_writer
+from repository.quizzes import QuizRepository
+from schemas.quiz import QuizRequestModel
+from tests.api_helpers import quiz_body, sign_up
+
+
+async def count_rows(company_id: int):
+    async with async_session_factory() as session:
+        quizzes = await session.scalar(select(func.count(Quiz.id)).where(Quiz.company_id == company_id))
+        questions = await session.scalar(select(func.count(Question.id)).join(Quiz).
+                                         where(Quiz.company_id == company_id))
+        answers = await session.scalar(select(func.count(Answer.id)).join(Question).join(Quiz).
+                                       where(Quiz.company_id == company_id))
+    return quizzes, questions, answers
+
+
+@pytest.fixture
+async def company(ac, database):
+    suffix = uuid.uuid4().hex[:8]
+    user, headers = await sign_up(ac, f"quizzes-{suffix}")
+    company = (await ac.post("/companies/", headers=headers,
+                             json={"company_name": f"quizzes-{suffix}", "description": "quizzes"})).json()
+    yield f"/companies/{company['id']}", company["id"], headers
+    await ac.delete(f"/companies/{company['id']}", headers=headers)
+    await ac.delete(f"/users/{user['id']}", headers=headers)
+
+
+@pytest.mark.anyio
+async def test_import_writes_every_quiz_row(ac, company):
+    company_url, company_id, headers = company
+    response = await ac.post(f"{company_url}/quizzes/import", headers=headers,
+                             json={"quizzes": [quiz_body(f"imported {n}") for n in range(2)]})
+
+    assert response.status_code == 201
+    assert [quiz["name"] for quiz in response.json()] == ["imported 0", "imported 1"]
+    assert await count_rows(company_id) == (2, 6, 18)
+
+
+@pytest.mark.anyio
+async def test_failing_row_rolls_back_the_import(company):
+    _, company_id, _ = company
+    valid = QuizRequestModel.parse_obj(quiz_body("valid"))
+    # bypasses validation so that the NOT NULL constraint fails on the second quiz
+    invalid = QuizRequestModel.construct(name=None, description="invalid", questions=valid.questions)
+
+    async with async_session_factory() as session:
+        with pytest.raises(IntegrityError):
+            await QuizRepository(session, Quiz).create_many([valid, invalid], company_id=company_id)
+
+    assert await count_rows(company_id) == (0, 0, 0)
+
+
+@pytest.mark.anyio
+async def test_question_for_missing_quiz_is_not_found(ac, company):
+    company_url, _, headers = company
+    response = await ac.post(f"{company_url}/quizzes/0/questions", headers=headers,
+                             json=quiz_body("missing")["questions"][0])
+
+    assert response.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_question_of_another_quiz_is_not_found(ac, company):
+    company_url, _, headers = company
+    quiz, other_quiz = (await ac.post(f"{company_url}/quizzes/import", headers=headers,
+                                      json={"quizzes": [quiz_body("quiz"), quiz_body("other quiz")]})).json()
+    question_url = f"{company_url}/quizzes/{other_quiz['id']}/questions/{quiz['questions'][0]['id']}"
+
+    assert (await ac.put(question_url, headers=headers, json={"text": "moved"})).status_code == 404
+    assert (await ac.delete(question_url, headers=headers)).status_code == 404
+    response = await ac.get(f"{company_url}/quizzes/{quiz['id']}", headers=headers)
+    assert [question["text"] for question in response.json()["questions"]] == ["question 0", "question 1", "question 2"]
+
+
+@pytest.mark.anyio
+async def test_answer_of_another_question_is_not_found(ac, company):
+    company_url, _, headers = company
+    quiz, other_quiz = (await ac.post(f"{company_url}/quizzes/import", headers=headers,
+                                      json={"quizzes": [quiz_body("quiz"), quiz_body("other quiz")]})).json()
+    question, other_question = quiz["questions"][:2]
+    answer_url = f"{company_url}/quizzes/{quiz['id']}/questions/{other_question['id']}/answers/" \
+                 f"{question['answers'][1]['id']}"
+
+    assert (await ac.put(answer_url, headers=headers, json={"text": "moved"})).status_code == 404
+    assert (await ac.delete(answer_url, headers=headers)).status_code == 404
+    response = await ac.post(f"{company_url}/quizzes/{other_quiz['id']}/questions/{question['id']}/answers",
+                             headers=headers, json={"text": "moved"})
+    assert response.status_code == 404
+    response = await ac.get(f"{company_url}/quizzes/{quiz['id']}", headers=headers)
+    assert [answer["text"] for answer in response.json()["questions"][0]["answers"]] == ["yes", "no", "maybe"]
+
+
+@pytest.mark.anyio
+async def test_created_answer_is_serialized(ac, company):
+    company_url, _, headers = company
+    quiz = (await ac.post(f"{company_url}/quizzes", headers=headers, json=quiz_body("quiz"))).json()
+    question = quiz["questions"][0]
+    response = await ac.post(f"{company_url}/quizzes/{quiz['id']}/questions/{question['id']}/answers",
+                             headers=headers, json={"text": "never"})
+
+    assert response.status_code == 201
+    assert response.headers["content-type"] == "application/json"
+    answer = response.json()
+    assert (answer["text"], answer["is_correct"]) == ("never", False)
+    assert set(answer) == {"id", "text", "is_correct", "created", "updated"}
+
+
+@pytest.mark.anyio
+async def test_deleted_quiz_leaves_the_stats(ac, company):
+    company_url, _, headers = company
+    member, member_headers = await sign_up(ac, f"quiz-taker-{uuid.uuid4().hex[:8]}")
+    join_request = (await ac.post(f"{company_url}/join-requests", headers=member_headers)).json()
+    await ac.post(f"{company_url}/join-requests/{join_request['id']}/response",
+                  params={"response_type": "accepted"}, headers=headers)
+    quizzes = (await ac.post(f"{company_url}/quizzes/import", headers=headers,
+                             json={"quizzes": [quiz_body("kept"), quiz_body("deleted")]})).json()
+    for quiz in quizzes + quizzes[1:]:
+        answers = [{"question_id": question["id"], "answer_ids": [question["answers"][0]["id"]]}
+                   for question in quiz["questions"]]
+        response = await ac.post(f"{company_url}/quizzes/{quiz['id']}/attempts", headers=member_headers,
+                                 json={"answers": answers})
+        assert response.is_success
+    await attempt_writer.flush_once()
+    assert (await ac.get(f"{company_url}/quiz-stats", headers=headers)).json()["attempts"] == 3
+
+    assert (await ac.delete(f"{company_url}/quizzes/{quizzes[1]['id']}", headers=headers)).is_success
+
+    stats = (await ac.get(f"{company_url}/quiz-stats", headers=headers)).json()
+    kept = (await ac.get(f"{company_url}/quizzes/{quizzes[0]['id']}/stats", headers=headers)).json()
+    assert (stats["attempts"], stats["average_score"]) == (1, kept["average_score"])
+    assert stats["last_attempt"] == kept["last_attempt"]
+    response = await ac.get(f"{company_url}/quizzes/{quizzes[1]['id']}/stats", headers=headers)
+    assert response.json()["attempts"] == 0
+    response = await ac.get(f"/users/{member['id']}/quiz-stats", headers=member_headers)
+    assert response.json()["attempts"] == 1
+
+    assert (await ac.delete(f"/users/{member['id']}", headers=member_headers)).is_success
+    assert (await ac.get(f"{company_url}/quiz-stats", headers=headers)).json()["attempts"] == 0
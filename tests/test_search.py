@@ -0,0 +1,27 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from repository.search import SearchRepository, escape_like, to_prefix_tsquery
+from tests.recording_session import RecordingSession
+
+
+def test_query_sanitizing():
+    assert to_prefix_tsquery("Ann  smi!") == "ann:* & smi:*"
+    assert to_prefix_tsquery("%%") is None
+    assert escape_like("50%_off") == "50\\%\\_off"
+
+
+@pytest.mark.anyio
+async def test_company_search_is_ranked_and_filtered():
+    session = RecordingSession()
+    await SearchRepository(session).search_companies("acme co", page=2, page_size=10)
+
+    compiled = session.statements[0].compile(dialect=postgresql.dialect())
+    sql, params = str(compiled), compiled.params
+    assert "company.search_vector @@ to_tsquery(" in sql
+    assert "company.company_name ILIKE" in sql
+    assert "company.visible = true" in sql
+    assert "ORDER BY ts_rank_cd(company.search_vector, to_tsquery(" in sql
+    assert {"acme:* & co:*", "%acme co%", "acme co%"} <= set(params.values())
+    assert "LIMIT" in sql and "OFFSET" in sql
+    assert list(params.values()).count(10) == 2
@@ -0,0 +1,33 @@
+import json
+from datetime import datetime
+
+from db.models import Answer, Question, Quiz
+from schemas.quiz import QuizResponseModel, answer_serializer, quiz_serializer
+
+
+def build_quiz() -> Quiz:
+    created, updated = datetime(2023, 9, 1, 12, 30), datetime(2023, 9, 2, 8, 15, 1, 123456)
+    return Quiz(id=1, name="Quiz ü", description="about", frequency=3, company_id=7, created=created, updated=updated,
+                questions=[Question(id=10 + i, text=f"question {i}", created=created, updated=updated, answers=[
+                    Answer(id=100 + 10 * i + j, text=f"answer \"{j}\"", is_correct=j == 0, created=created,
+                           updated=updated) for j in range(3)
+                ]) for i in range(2)])
+
+
+def test_serializer_matches_response_model():
+    payload = quiz_serializer.dumps(build_quiz())
+    serialized = json.loads(payload)
+
+    assert json.loads(QuizResponseModel.parse_raw(payload).json()) == serialized
+    assert serialized["name"] == "Quiz ü" and serialized["updated"] == "2023-09-02T08:15:01.123456"
+    assert [answer["id"] for answer in serialized["questions"][1]["answers"]] == [110, 111, 112]
+    assert serialized["questions"][0]["answers"][0] == {"id": 100, "text": 'answer "0"', "is_correct": True,
+                                                        "created": "2023-09-01T12:30:00",
+                                                        "updated": "2023-09-02T08:15:01.123456"}
+    assert json.loads(quiz_serializer.dumps_many([build_quiz()] * 2)) == [serialized, serialized]
+
+
+def test_unloaded_attributes_fall_back_to_attribute_access():
+    answer = Answer(id=1, text="a", is_correct=False, created=datetime(2023, 9, 1))
+    assert "updated" not in answer.__dict__
+    assert json.loads(answer_serializer.dumps(answer))["updated"] is None
@@ -0,0 +1,118 @@
+import base64
+import json
+import time
+from datetime import datetime, timedelta
+
+import jwt as pyjwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi.security import HTTPAuthorizationCredentials
+
+from libs.auth import create_access_token
+from libs.jwks import JWKSError, JWKSKeyStore
+from libs.token_cache import VerifiedTokenCache
+from libs.tokens import VerifyAuth0Token, VerifyCustomToken, select_verifier
+from utils.service_config import settings
+
+
+@pytest.fixture(autouse=True)
+def auth0_settings(monkeypatch):
+    monkeypatch.setattr(settings, "ISSUER", "https://tenant.example.com/")
+    monkeypatch.setattr(settings, "API_AUDIENCE", "https://api.example.com")
+
+
+def make_jwk(kid: str):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(pyjwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update({"kid": kid, "use": "sig", "alg": "RS256"})
+    return private_key, jwk
+
+
+def auth0_token(private_key, kid: str) -> HTTPAuthorizationCredentials:
+    claims = {"email": "user@example.com", "iss": settings.ISSUER, "aud": settings.API_AUDIENCE,
+              "exp": datetime.utcnow() + timedelta(minutes=5)}
+    credentials = pyjwt.encode(claims, private_key, algorithm="RS256", headers={"kid": kid})
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=credentials)
+
+
+@pytest.fixture
+def jwks_file(tmp_path):
+    path = tmp_path / "jwks.json"
+
+    def publish(*jwks):
+        path.write_text(json.dumps({"keys": list(jwks)}))
+
+    publish.url = f"file://{path}"
+    return publish
+
+
+@pytest.mark.anyio
+async def test_auth0_token_verified_with_cached_keys(jwks_file):
+    private_key, jwk = make_jwk("key-1")
+    jwks_file(jwk)
+    store = JWKSKeyStore(jwks_file.url, ttl=60, miss_ttl=60)
+    token = auth0_token(private_key, "key-1")
+
+    assert select_verifier(token) is VerifyAuth0Token
+    for _ in range(3):
+        result = await VerifyAuth0Token(token, key_store=store).verify()
+        assert result["payload"]["email"] == "user@example.com"
+    assert store.fetches == 1
+
+
+@pytest.mark.anyio
+async def test_unknown_kid_rotates_then_is_negatively_cached(jwks_file):
+    old_key, old_jwk = make_jwk("old")
+    new_key, new_jwk = make_jwk("new")
+    jwks_file(old_jwk)
+    store = JWKSKeyStore(jwks_file.url, ttl=60, miss_ttl=0)
+    await store.get_signing_key("old")
+
+    jwks_file(old_jwk, new_jwk)
+    result = await VerifyAuth0Token(auth0_token(new_key, "new"), key_store=store).verify()
+    assert result["mark"] == "auth0_mark"
+    assert store.fetches == 2
+
+    store.miss_ttl, store.attempted_at = 60, None
+    for _ in range(3):
+        with pytest.raises(JWKSError):
+            await store.get_signing_key("missing")
+    assert store.fetches == 3
+
+
+@pytest.mark.anyio
+async def test_custom_token_dispatch():
+    token = HTTPAuthorizationCredentials(scheme="Bearer", credentials=create_access_token({"sub": "a@b.com"}))
+    assert select_verifier(token) is VerifyCustomToken
+    assert (await VerifyCustomToken(token).verify())["payload"]["sub"] == "a@b.com"
+
+    garbage = HTTPAuthorizationCredentials(scheme="Bearer", credentials="not-a-jwt")
+    assert select_verifier(garbage) is None
+
+
+def test_malformed_header_has_no_verifier():
+    def segment(value: dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(value).encode()).rstrip(b"=").decode()
+
+    credentials = f"{segment({'alg': 'RS256', 'kid': 123})}.{segment({'iss': settings.ISSUER})}.c2ln"
+    token = HTTPAuthorizationCredentials(scheme="Bearer", credentials=credentials)
+    assert select_verifier(token) is None
+
+
+def test_verified_token_cache_lru_and_expiry():
+    cache = VerifiedTokenCache(maxsize=2, max_ttl=60)
+    hits, evictions = cache.stats.hits, cache.stats.evictions
+    exp = time.time() + 300
+
+    cache.set("a", {"sub": "a", "exp": exp}, "custom_token_mark")
+    cache.set("b", {"sub": "b", "exp": exp}, "custom_token_mark")
+    assert cache.get("a") == ({"sub": "a", "exp": exp}, "custom_token_mark")
+    cache.set("c", {"sub": "c", "exp": exp}, "custom_token_mark")
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats.hits == hits + 2
+    assert cache.stats.evictions == evictions + 1
+
+    cache.set("expired", {"sub": "d", "exp": time.time() - 1}, "custom_token_mark")
+    assert cache.get("expired") is None